@@ -1,7 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
 
-from app.schemas.dataset import DatasetUploadResponse
-from app.services import dataset_service
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException, Request, Response
+
+from app.core.config import settings
+from app.schemas.dataset import (
+    DatasetProfileResponse,
+    DatasetUploadResponse,
+    UploadSessionCreateRequest,
+    UploadSessionResponse,
+)
+from app.services import dataset_service, upload_service
+from app.services.upload_service import UploadSessionNotFoundError
 
 router = APIRouter(tags=["datasets"])
 
@@ -15,3 +24,78 @@ async def upload_dataset(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:  # pragma: no cover - defensive catch for unexpected issues
         raise HTTPException(status_code=500, detail=f"Failed to process dataset: {exc}")
+
+
+@router.get("/datasets/{dataset_id}/profile", response_model=DatasetProfileResponse)
+async def get_dataset_profile(dataset_id: str):
+    try:
+        # Profiles are precomputed at upload; datasets reloaded from disk are
+        # profiled on first access, so keep that off the event loop.
+        return await asyncio.to_thread(dataset_service.get_dataset_profile, dataset_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@router.post("/datasets/uploads", response_model=UploadSessionResponse, status_code=201)
+async def create_upload_session(payload: UploadSessionCreateRequest):
+    try:
+        return await asyncio.to_thread(upload_service.create_session, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/datasets/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload_session(upload_id: str):
+    try:
+        return await asyncio.to_thread(upload_service.get_session, upload_id)
+    except UploadSessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@router.put("/datasets/uploads/{upload_id}/chunks/{index}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str = Header(..., description="Hex SHA-256 digest of the chunk body."),
+):
+    limit = settings.UPLOAD_MAX_CHUNK_SIZE_BYTES
+    too_large = HTTPException(status_code=413, detail=f"Chunks must not exceed {limit} bytes.")
+    if int(request.headers.get("content-length") or 0) > limit:
+        raise too_large
+
+    async def parts():
+        received = 0
+        async for part in request.stream():
+            received += len(part)
+            if received > limit:
+                raise too_large
+            yield part
+
+    try:
+        return await upload_service.write_chunk(upload_id, index, parts(), x_chunk_sha256)
+    except UploadSessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/datasets/uploads/{upload_id}/complete", response_model=DatasetUploadResponse)
+async def complete_upload_session(upload_id: str):
+    try:
+        return await upload_service.complete_session(upload_id)
+    except UploadSessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:  # pragma: no cover - defensive catch for unexpected issues
+        raise HTTPException(status_code=500, detail=f"Failed to process dataset: {exc}")
+
+
+@router.delete("/datasets/uploads/{upload_id}", status_code=204)
+async def abort_upload_session(upload_id: str):
+    try:
+        await asyncio.to_thread(upload_service.abort_session, upload_id)
+    except UploadSessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return Response(status_code=204)
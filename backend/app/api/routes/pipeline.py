@@ -1,15 +1,18 @@
-from io import BytesIO
+import asyncio
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 
 from app.schemas.pipeline import (
+    ModelMetadataResponse,
+    PipelineJobResponse,
     PipelineRunRequest,
     PipelineRunResponse,
     PredictRequest,
     PredictResponse,
 )
-from app.services import pipeline_service
+from app.services import job_service, pipeline_service
+from app.services.pipeline_executor import PipelineQueueFullError
 
 router = APIRouter(tags=["pipeline"])
 
@@ -18,12 +21,51 @@ router = APIRouter(tags=["pipeline"])
 async def run_pipeline(payload: PipelineRunRequest):
     try:
         return await pipeline_service.run_pipeline(payload)
+    except PipelineQueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:  # pragma: no cover - defensive catch for unexpected issues
         raise HTTPException(status_code=500, detail=f"Pipeline execution failed: {exc}")
 
 
+@router.post("/pipeline/jobs", response_model=PipelineJobResponse, status_code=202)
+async def submit_pipeline_job(payload: PipelineRunRequest):
+    try:
+        return await job_service.submit_job(payload)
+    except PipelineQueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+@router.get("/pipeline/jobs/{job_id}", response_model=PipelineJobResponse)
+async def get_pipeline_job(job_id: str):
+    try:
+        return job_service.get_job(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@router.get("/pipeline/jobs/{job_id}/events")
+async def stream_pipeline_job_events(job_id: str):
+    try:
+        events = job_service.stream_job_events(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/pipeline/jobs/{job_id}", response_model=PipelineJobResponse)
+async def cancel_pipeline_job(job_id: str):
+    try:
+        return job_service.cancel_job(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
 @router.post("/pipeline/predict", response_model=PredictResponse)
 async def predict(payload: PredictRequest):
     try:
@@ -34,16 +76,31 @@ async def predict(payload: PredictRequest):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {exc}")
 
 
+@router.get("/pipeline/model/{model_id}", response_model=ModelMetadataResponse)
+async def get_model_metadata(model_id: str):
+    try:
+        return pipeline_service.get_model_metadata(model_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
 @router.get("/pipeline/model/{model_id}/download")
-async def download_model(model_id: str):
-    try:
-        content = pipeline_service.download_model_bytes(model_id)
-        return StreamingResponse(
-            BytesIO(content),
-            media_type="application/octet-stream",
-            headers={"Content-Disposition": f"attachment; filename=model-{model_id}.pkl"},
-        )
+async def download_model(model_id: str, request: Request):
+    try:
+        path = await asyncio.to_thread(pipeline_service.model_download_file, model_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except Exception as exc:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Download failed: {exc}")
+
+    # A model id always refers to the same artifact, so it is a strong ETag.
+    etag = f'"{model_id}"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    # FileResponse streams the file in chunks and handles Range/If-Range.
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"model-{model_id}.pkl",
+        headers={"ETag": etag},
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    last_access: float
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    Thread-safe LRU mapping bounded by entry count, total size and idle TTL.
+
+    ``sizeof`` is evaluated once when an entry is inserted and the result is
+    used for byte accounting. Reads refresh both recency and the idle timer.
+    Every limit is optional; a cache created without limits behaves like a
+    plain dict. The most recently inserted entry is never evicted by the size
+    limits, so a single oversized value is still stored (alone).
+
+    ``on_evict`` is called with the key and value of every entry dropped by a
+    limit or the TTL (not by explicit deletes). It runs with the cache lock
+    held and must not use the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._clock = clock
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[K, _Entry[V]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = RLock()
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                raise KeyError(key)
+            self._hits += 1
+            entry.last_access = self._clock()
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        size = int(self._sizeof(value)) if self._sizeof else 0
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = _Entry(value=value, size=size, last_access=self._clock())
+            self._bytes += size
+            self._expire()
+            self._enforce_limits(keep=key)
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._discard(key)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._discard(key)
+            return entry.value
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            self._expire()
+            return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            self._expire()
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    def keys(self) -> List[K]:
+        return list(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self._evictions,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _discard(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict_oldest(self) -> None:
+        key, entry = next(iter(self._entries.items()))
+        self._discard(key)
+        self._evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(key, entry.value)
+
+    def _expire(self) -> None:
+        if self.ttl_seconds is None:
+            return
+        deadline = self._clock() - self.ttl_seconds
+        # Entries are ordered by last access, so expired ones sit at the front.
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.last_access > deadline:
+                break
+            self._evict_oldest()
+
+    def _enforce_limits(self, keep: K) -> None:
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            if next(iter(self._entries)) == keep:  # pragma: no cover - keep is always newest
+                break
+            self._evict_oldest()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +10,96 @@ class Settings(BaseSettings):
     cors_origins: List[AnyHttpUrl] = []
     API_KEY: str = "default-insecure-key"
     MAX_UPLOAD_SIZE_BYTES: int = 100 * 1024 * 1024  # 100 MB
+    # Cap on decoded data for compressed uploads (.csv.gz, .csv.zst, Parquet,
+    # compressed Feather); MAX_UPLOAD_SIZE_BYTES counts the compressed bytes.
+    MAX_DECOMPRESSED_SIZE_BYTES: int = 1024 * 1024 * 1024  # 1 GB
+    # Resumable uploads (/datasets/uploads) spool chunks to disk here;
+    # unfinished sessions are discarded after UPLOAD_SESSION_TTL_SECONDS.
+    UPLOAD_SESSION_DIR: str = "data/uploads"
+    UPLOAD_CHUNK_SIZE_BYTES: int = 8 * 1024 * 1024  # 8 MB
+    UPLOAD_MAX_CHUNK_SIZE_BYTES: int = 64 * 1024 * 1024  # 64 MB
+    UPLOAD_SESSION_TTL_SECONDS: float = 24 * 3600.0
+    # "pyarrow" parses CSV uploads with Arrow's multithreaded reader;
+    # "calamine" needs the optional python-calamine package.
+    CSV_PARSER_ENGINE: Literal["c", "pyarrow"] = "c"
+    EXCEL_PARSER_ENGINE: Literal["openpyxl", "calamine"] = "openpyxl"
+    # Columns with at most this many distinct values get per-class counts in
+    # the dataset profile (candidate targets).
+    PROFILE_MAX_CLASSES: int = 50
+    # Downcast numerics and store low-cardinality strings as categories on
+    # upload (lossless); string columns with at most this share of distinct
+    # values are converted.
+    DATASET_COMPACTION_ENABLED: bool = False
+    DATASET_CATEGORY_MAX_RATIO: float = 0.5
+    # "memory" keeps datasets in process RAM; "arrow" persists them as
+    # memory-mapped Arrow IPC files shared by every worker.
+    DATASET_STORE_BACKEND: Literal["memory", "arrow"] = "memory"
+    DATASET_STORE_DIR: str = "data/datasets"
+    # Frames the arrow backend keeps materialized in memory.
+    DATASET_CACHE_MAX_ENTRIES: int = 8
+    # Limits on stored datasets for both backends; the least recently read
+    # go first. Bytes are measured in memory for the memory backend and as
+    # file sizes for the arrow backend (whose hot frames also stay within
+    # DATASET_STORE_MAX_BYTES). None = unbounded.
+    DATASET_STORE_MAX_ENTRIES: Optional[int] = None
+    DATASET_STORE_MAX_BYTES: Optional[int] = None
+    DATASET_STORE_TTL_SECONDS: Optional[float] = None
+    # "disk" persists trained models under MODEL_STORE_DIR so every worker
+    # (and a restarted server) can serve every model_id.
+    MODEL_STORE_BACKEND: Literal["memory", "disk"] = "memory"
+    MODEL_STORE_DIR: str = "data/models"
+    MODEL_CACHE_MAX_ENTRIES: int = 16
+    # Limits for artifacts resident in memory (the whole store for the memory
+    # backend, the hot-model cache for the disk backend). None = unbounded.
+    MODEL_STORE_MAX_ENTRIES: Optional[int] = None
+    MODEL_STORE_MAX_BYTES: Optional[int] = None
+    MODEL_STORE_TTL_SECONDS: Optional[float] = None
+    # Pickled artifacts served by the download endpoint (written once per model).
+    MODEL_DOWNLOAD_DIR: str = "data/downloads"
+    # Memoized /pipeline/run responses keyed by dataset content + request.
+    PIPELINE_RESULT_CACHE_ENABLED: bool = True
+    PIPELINE_RESULT_CACHE_MAX_ENTRIES: int = 256
+    PIPELINE_RESULT_CACHE_TTL_SECONDS: Optional[float] = None
+    # Preprocessed feature matrices shared by runs that only change the
+    # model or split.
+    PREPROCESS_CACHE_ENABLED: bool = True
+    PREPROCESS_CACHE_MAX_ENTRIES: int = 16
+    PREPROCESS_CACHE_MAX_BYTES: Optional[int] = 512 * 1024 * 1024  # 512 MB
+    # Where /pipeline/run training executes: "thread" (dedicated pool),
+    # "process" (spawned worker processes; needs DATASET_STORE_BACKEND=arrow)
+    # or "inline". Concurrency defaults to the number of CPU cores; runs
+    # beyond concurrency + queue size are rejected with 503.
+    PIPELINE_EXECUTOR: Literal["thread", "process", "inline"] = "thread"
+    PIPELINE_MAX_CONCURRENCY: Optional[int] = None
+    PIPELINE_QUEUE_SIZE: int = 32
+    # Background training jobs (/pipeline/jobs): queued + running jobs above
+    # JOB_MAX_ACTIVE are rejected with 503. Accepted jobs stay queued until a
+    # pipeline worker is free (they never fail on a full executor queue);
+    # finished jobs are kept for polling for JOB_RETENTION_SECONDS.
+    JOB_MAX_ACTIVE: int = 64
+    JOB_RETENTION_SECONDS: float = 3600.0
+    # Threads one training run may use (random forest n_jobs, OpenMP threads
+    # of histogram gradient boosting). None = all cores.
+    MODEL_MAX_THREADS: Optional[int] = None
+    # Rows per chunk streamed by out-of-core training (memory_mode="out_of_core").
+    OUT_OF_CORE_CHUNK_ROWS: int = 50_000
+    # Preview runs (PipelineRunRequest.preview): rows of the timed
+    # calibration fit, cap on the evaluated test rows (until the final
+    # round) and the training-split shares refinement jobs step through.
+    PREVIEW_CALIBRATION_ROWS: int = 1000
+    PREVIEW_MAX_TEST_ROWS: int = 10_000
+    PREVIEW_REFINE_FRACTIONS: List[float] = [0.1, 0.25, 0.5, 1.0]
+    # Hyperparameter search (PipelineRunRequest.search): parallel fits per
+    # search (None = MODEL_MAX_THREADS, which it can never exceed) and the
+    # largest grid accepted.
+    SEARCH_N_JOBS: Optional[int] = None
+    SEARCH_MAX_CANDIDATES: int = 256
+    # Opt-in dynamic batching of concurrent /pipeline/predict calls per model.
+    PREDICT_BATCHING_ENABLED: bool = False
+    PREDICT_BATCH_WINDOW_MS: float = 2.0
+    PREDICT_BATCH_MAX_RECORDS: int = 256
+    # Request/stage instrumentation exported at /api/metrics.
+    METRICS_ENABLED: bool = True
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,13 +1,23 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import datasets, pipeline
+from app.api.routes import datasets, metrics, pipeline
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
 from app.core.security import get_api_key
+from app.services import pipeline_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    pipeline_service.shutdown_executor()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name, version="1.0.0")
+    app = FastAPI(title=settings.app_name, version="1.0.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -20,6 +30,10 @@ def create_app() -> FastAPI:
     app.include_router(datasets.router, prefix="/api", dependencies=[Depends(get_api_key)])
     app.include_router(pipeline.router, prefix="/api", dependencies=[Depends(get_api_key)])
 
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router, prefix="/api", dependencies=[Depends(get_api_key)])
+
     @app.get("/api/health")
     async def health() -> dict:
         return {"status": "ok"}
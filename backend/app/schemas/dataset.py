@@ -1,6 +1,7 @@
-from typing import List, Dict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DatasetMetadata(BaseModel):
@@ -13,3 +14,46 @@ class DatasetMetadata(BaseModel):
 
 class DatasetUploadResponse(DatasetMetadata):
     preview: List[Dict[str, object]]
+    # Reported when dtype compaction is enabled (DATASET_COMPACTION_ENABLED).
+    memory_usage_bytes: Optional[int] = None
+    memory_saved_bytes: Optional[int] = None
+
+
+class ColumnProfile(BaseModel):
+    name: str
+    dtype: str
+    is_numeric: bool
+    null_count: int
+    cardinality: int
+    mode: Optional[Any] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    # Per-class counts, only for low-cardinality columns (candidate targets).
+    class_counts: Optional[Dict[str, int]] = None
+
+
+class DatasetProfile(BaseModel):
+    rows: int
+    columns: List[ColumnProfile]
+
+
+class DatasetProfileResponse(DatasetProfile):
+    dataset_id: str
+
+
+class UploadSessionCreateRequest(BaseModel):
+    filename: str = Field(..., min_length=1)
+    total_size: int = Field(..., gt=0)
+    chunk_size: Optional[int] = Field(default=None, gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    filename: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    # Indices of chunks already stored; resume by sending the others.
+    received_chunks: List[int]
+    expires_at: datetime
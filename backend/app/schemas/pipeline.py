@@ -1,5 +1,6 @@
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -12,6 +13,30 @@ class PreprocessType(str, Enum):
 class ModelType(str, Enum):
     logistic_regression = "logistic_regression"
     decision_tree = "decision_tree"
+    # Multi-core / histogram-based estimators for large datasets.
+    random_forest = "random_forest"
+    hist_gradient_boosting = "hist_gradient_boosting"
+    # Linear model trained by stochastic gradient descent; the only model
+    # that can be trained out of core.
+    sgd_classifier = "sgd_classifier"
+
+
+class CategoricalEncoding(str, Enum):
+    dense = "dense"
+    sparse = "sparse"
+    # One ordinal code column per categorical feature, split natively by
+    # the model; always used by hist_gradient_boosting.
+    native = "native"
+
+
+class MemoryMode(str, Enum):
+    standard = "standard"
+    # Projects the needed columns and builds one float matrix in place,
+    # split into train/test row views (dense encoding only).
+    lean = "lean"
+    # Streams the stored dataset in chunks over several passes; memory stays
+    # bounded by one chunk whatever the row count (sgd_classifier only).
+    out_of_core = "out_of_core"
 
 
 class PreprocessStep(BaseModel):
@@ -24,6 +49,48 @@ class TrainTestConfig(BaseModel):
     random_state: int = 42
 
 
+class OutOfCoreConfig(BaseModel):
+    # Rows per chunk; defaults to OUT_OF_CORE_CHUNK_ROWS.
+    chunk_rows: Optional[int] = Field(None, ge=100)
+    # Training passes over the data.
+    epochs: int = Field(5, ge=1, le=100)
+
+
+class PreviewConfig(BaseModel):
+    # Seconds the preview fit may take; the training sample is sized from a
+    # timed fit on a small calibration sample.
+    time_budget_seconds: float = Field(2.0, gt=0, le=600)
+    # Train on this share of the training split instead (refinement rounds).
+    sample_fraction: Optional[float] = Field(None, gt=0, le=1)
+    # Background jobs only: keep training on larger samples
+    # (PREVIEW_REFINE_FRACTIONS) and publish each result.
+    refine: bool = False
+
+
+class SearchStrategy(str, Enum):
+    grid = "grid"
+    # Successive halving: all candidates start on a small sample and only
+    # the best 1/factor advance to the next, larger one.
+    halving = "halving"
+
+
+class ParamRange(BaseModel):
+    """Evenly spaced (or log-spaced) values between ``low`` and ``high``."""
+
+    low: float
+    high: float
+    num: int = Field(5, ge=2, le=50)
+    log: bool = False
+    integer: bool = False
+
+
+class SearchConfig(BaseModel):
+    param_grid: Dict[str, Union[List[Any], ParamRange]] = Field(..., min_length=1)
+    cv: int = Field(5, ge=2, le=20)
+    strategy: SearchStrategy = SearchStrategy.halving
+    factor: int = Field(3, ge=2, le=10)
+
+
 class PipelineRunRequest(BaseModel):
     dataset_id: str
     target_column: str
@@ -32,6 +99,19 @@ class PipelineRunRequest(BaseModel):
     split: TrainTestConfig = Field(default_factory=TrainTestConfig)
     model: ModelType
     drop_rare_classes: bool = False
+    categorical_encoding: CategoricalEncoding = CategoricalEncoding.dense
+    # Sparse encoding only: keep at most this many levels per column and
+    # bucket the remaining (least frequent) levels into one "other" column.
+    max_categories: Optional[int] = Field(None, ge=2)
+    memory_mode: MemoryMode = MemoryMode.standard
+    out_of_core: OutOfCoreConfig = Field(default_factory=OutOfCoreConfig)
+    # Measure peak memory of the run and report it in the response.
+    collect_diagnostics: bool = False
+    # Tune the model with k-fold cross-validation on the training split;
+    # the best candidate becomes the stored model.
+    search: Optional[SearchConfig] = None
+    # Train on a stratified subsample for a fast accuracy estimate.
+    preview: Optional[PreviewConfig] = None
 
     @field_validator("feature_columns", mode="before")
     def ensure_features(cls, value):
@@ -58,6 +138,50 @@ class FeatureImportance(BaseModel):
     importance: float
 
 
+class SearchCandidate(BaseModel):
+    params: Dict[str, Any]
+    mean_score: Optional[float] = None
+    std_score: Optional[float] = None
+    rank: int
+    # Training rows the candidate was last evaluated on (halving stops weak
+    # candidates early on subsamples).
+    n_samples: int
+    iteration: int = 0
+
+
+class SearchResult(BaseModel):
+    strategy: SearchStrategy
+    best_params: Dict[str, Any]
+    best_score: float
+    n_candidates: int
+    candidates: List[SearchCandidate]
+
+
+class PipelineDiagnostics(BaseModel):
+    memory_mode: MemoryMode
+    # Deep memory usage of the dataset columns the run reads.
+    input_bytes: Optional[int] = None
+    # Peak bytes allocated by the run itself (tracemalloc: Python objects
+    # and NumPy buffers), above what was allocated when it started. None
+    # when another diagnostics run in this process was already being traced.
+    peak_memory_bytes: Optional[int] = None
+    peak_to_input_ratio: Optional[float] = None
+
+
+class PreviewResult(BaseModel):
+    # Rows the model was trained on, out of the full training split.
+    sample_rows: int
+    training_rows: int
+    sample_fraction: float
+    test_rows: int
+    # Wilson score interval of the accuracy on ``test_rows``.
+    confidence_level: float = 0.95
+    accuracy_low: float
+    accuracy_high: float
+    # Trained and evaluated on the full split: no further refinement.
+    final: bool
+
+
 class PipelineRunResponse(BaseModel):
     status: str
     accuracy: Optional[float] = None
@@ -68,6 +192,9 @@ class PipelineRunResponse(BaseModel):
     model_type: Optional[ModelType] = None
     model_id: Optional[str] = None
     model_download_path: Optional[str] = None
+    diagnostics: Optional[PipelineDiagnostics] = None
+    search: Optional[SearchResult] = None
+    preview: Optional[PreviewResult] = None
 
 
 class PredictRequest(BaseModel):
@@ -77,3 +204,51 @@ class PredictRequest(BaseModel):
 
 class PredictResponse(BaseModel):
     predictions: List[Any]
+
+
+class ModelMetadataResponse(BaseModel):
+    model_id: str
+    created_at: Optional[datetime] = None
+    model_type: Optional[ModelType] = None
+    dataset_fingerprint: Optional[str] = None
+    request: Optional[Dict[str, Any]] = None
+    metrics: Dict[str, Optional[float]] = Field(default_factory=dict)
+    size_bytes: Optional[int] = None
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class StageStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    skipped = "skipped"
+    failed = "failed"
+
+
+class StageProgress(BaseModel):
+    name: str
+    status: StageStatus = StageStatus.pending
+    duration_ms: Optional[float] = None
+    rows: Optional[int] = None
+    columns: Optional[int] = None
+    peak_memory_bytes: Optional[int] = None
+
+
+class PipelineJobResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    current_stage: Optional[str] = None
+    stages: List[StageProgress] = Field(default_factory=list)
+    cancel_requested: bool = False
+    result: Optional[PipelineRunResponse] = None
+    error: Optional[str] = None
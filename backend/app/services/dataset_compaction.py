@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_integer_dtype
+
+
+def compact_dataframe(df: pd.DataFrame, category_max_ratio: float) -> pd.DataFrame:
+    """
+    Return ``df`` with lossless, memory-saving dtypes.
+
+    * integers are downcast to the narrowest signed width holding their range;
+    * string columns whose distinct values make up at most
+      ``category_max_ratio`` of the rows become ``category`` (int codes plus
+      one copy of each level instead of one Python string per row).
+
+    Values are never changed, so profiles, fill values and one-hot columns are
+    the same as for the uncompacted frame. Floats are left at float64: even
+    exactly representable values would get float32 medians and scaling,
+    moving the thresholds tree models split on.
+    """
+    converted: Dict[str, pd.Series] = {}
+    n_rows = len(df)
+    for col in df.columns:
+        series = df[col]
+        if is_bool_dtype(series.dtype):
+            continue
+        if is_integer_dtype(series.dtype):
+            downcast = pd.to_numeric(series, downcast="integer")
+            if downcast.dtype != series.dtype:
+                converted[col] = downcast
+        elif series.dtype == object:
+            if series.nunique(dropna=True) > category_max_ratio * n_rows:
+                continue
+            if infer_dtype(series, skipna=True) == "string":
+                converted[col] = series.astype("category")
+
+    if not converted:
+        return df
+    compacted = df.copy(deep=False)
+    for col, series in converted.items():
+        compacted[col] = series
+    return compacted
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.dataset import ColumnProfile, DatasetProfile
+
+
+def profile_dataframe(df: pd.DataFrame, max_classes: int) -> DatasetProfile:
+    """
+    Summarize every column of ``df`` in one pass.
+
+    Each column is hashed once (``value_counts``) for cardinality, mode and,
+    when it has at most ``max_classes`` distinct values, per-class counts.
+    Null counts and numeric medians/min/max are computed column-wise in a
+    single vectorized reduction over the numeric block. The mode follows
+    ``Series.mode()``: most frequent value, smallest one on ties.
+    """
+    numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    null_counts = df.isna().sum()
+    numeric_stats: Dict[str, Dict[str, Any]] = {}
+    if numeric_cols:
+        numeric = df[numeric_cols]
+        numeric_stats = {
+            "median": numeric.median().to_dict(),
+            "min": numeric.min().to_dict(),
+            "max": numeric.max().to_dict(),
+        }
+
+    columns: List[ColumnProfile] = []
+    for col in df.columns:
+        counts = df[col].value_counts(dropna=True, sort=False)
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            counts = counts[counts > 0]  # unused levels are listed with 0
+        is_numeric = col in numeric_stats.get("median", {})
+        columns.append(
+            ColumnProfile(
+                name=str(col),
+                dtype=str(df[col].dtype),
+                is_numeric=is_numeric,
+                null_count=int(null_counts[col]),
+                cardinality=int(len(counts)),
+                mode=_python(_mode(counts)),
+                median=_number(numeric_stats["median"][col]) if is_numeric else None,
+                min=_number(numeric_stats["min"][col]) if is_numeric else None,
+                max=_number(numeric_stats["max"][col]) if is_numeric else None,
+                class_counts=(
+                    {str(value): int(count) for value, count in counts.items()}
+                    if len(counts) <= max_classes
+                    else None
+                ),
+            )
+        )
+    return DatasetProfile(rows=int(df.shape[0]), columns=columns)
+
+
+def _mode(counts: pd.Series) -> Any:
+    if counts.empty:
+        return None
+    top = counts.index[counts.to_numpy() == counts.max()]
+    try:
+        return sorted(top)[0]
+    except TypeError:  # mixed, unorderable values
+        return top[0]
+
+
+def _python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
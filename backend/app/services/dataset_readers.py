@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import logging
+from functools import lru_cache
+from io import BufferedReader, BytesIO, RawIOBase
+from typing import BinaryIO, Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Arrow parses blocks of this size in parallel.
+_ARROW_BLOCK_SIZE = 4 * 1024 * 1024
+# Decompressed bytes inspected to detect date columns for the Arrow engine.
+_SAMPLE_SIZE = 1024 * 1024
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+# Strings read_csv treats as missing by default (its ``na_values`` list,
+# mirrored here so the Arrow engine parses the same cells as null).
+_CSV_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+class _BoundedReader(RawIOBase):
+    """Fails once more than ``max_size`` bytes have been read from ``source``."""
+
+    def __init__(self, source: BinaryIO, max_size: int) -> None:
+        super().__init__()
+        self._source = source
+        self._max_size = max_size
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._source.read(len(buffer))
+        if not data:
+            return 0
+        self.bytes_read += len(data)
+        if self.bytes_read > self._max_size:
+            raise _too_large(self._max_size)
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _too_large(max_size: int) -> ValueError:
+    return ValueError(f"Uploaded data exceeds the maximum decompressed size of {max_size} bytes.")
+
+
+def read_csv(stream: BinaryIO, engine: str, sample: bytes = b"") -> pd.DataFrame:
+    if engine == "pyarrow":
+        return _read_csv_arrow(stream, sample)
+    # The C parser pulls fixed-size blocks from the stream and tokenizes
+    # them incrementally, so only the parsed columns are kept in memory.
+    return pd.read_csv(stream)
+
+
+def _read_csv_arrow(stream: BinaryIO, sample: bytes) -> pd.DataFrame:
+    """
+    Parse with Arrow's multithreaded CSV reader, matching ``pd.read_csv``.
+
+    Arrow infers types per block and widens them across blocks, but unlike
+    pandas it also recognizes ISO dates and timestamps. ``sample`` (the start
+    of the file) is parsed first to find such columns so they are read as
+    strings, which keeps dtypes identical to the C engine.
+    """
+    convert_options = pacsv.ConvertOptions(
+        null_values=_CSV_NA_VALUES,
+        strings_can_be_null=True,
+        column_types=_temporal_columns_as_strings(sample),
+    )
+    table = pacsv.read_csv(
+        stream,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=_ARROW_BLOCK_SIZE),
+        # Quoted values may span lines, as the C engine allows.
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=convert_options,
+    )
+    # Columns that only turned temporal after the sample are converted back.
+    for index, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(pa.string()))
+    nullable_strings = [
+        field.name
+        for field, column in zip(table.schema, table.columns)
+        if pa.types.is_string(field.type) and column.null_count
+    ]
+    # self_destruct frees each Arrow column once converted, capping peak memory.
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    # Arrow yields None for missing strings; the C engine yields NaN.
+    for name in nullable_strings:
+        df[name] = df[name].where(df[name].notna(), np.nan)
+    return df
+
+
+def read_compressed_csv(
+    stream: BinaryIO, compression: str, engine: str, max_size: int
+) -> pd.DataFrame:
+    """
+    Parse a gzip or zstd compressed CSV while decompressing it incrementally.
+
+    ``stream`` yields the compressed upload (already capped at
+    ``MAX_UPLOAD_SIZE_BYTES``); at most ``max_size`` decompressed bytes are
+    produced, so a small, highly compressed upload cannot exhaust memory.
+    """
+    if compression == "gzip":
+        source: BinaryIO = gzip.GzipFile(fileobj=stream, mode="rb")
+    else:
+        source = pa.CompressedInputStream(pa.PythonFile(stream, mode="r"), compression)
+    try:
+        decompressed = BufferedReader(_BoundedReader(source, max_size), buffer_size=_SAMPLE_SIZE)
+        # The first buffered block doubles as the type-detection sample.
+        sample = decompressed.peek(_SAMPLE_SIZE)[:_SAMPLE_SIZE] if engine == "pyarrow" else b""
+        return read_csv(decompressed, engine, sample)
+    except (OSError, EOFError, pa.ArrowInvalid) as exc:
+        raise ValueError(f"Could not decompress {compression} upload: {exc}") from None
+
+
+def _temporal_columns_as_strings(sample: bytes) -> Dict[str, pa.DataType]:
+    end = sample.rfind(b"\n")
+    if end <= 0:
+        return {}
+    try:
+        schema = pacsv.read_csv(BytesIO(sample[: end + 1])).schema
+    except pa.ArrowInvalid:  # e.g. the sample ends inside a quoted value
+        return {}
+    return {field.name: pa.string() for field in schema if pa.types.is_temporal(field.type)}
+
+
+def read_parquet(stream: BinaryIO, max_size: int) -> pd.DataFrame:
+    """
+    Read a Parquet file.
+
+    The footer sits at the end of the file, so the upload is buffered once.
+    Row group metadata records each group's uncompressed size, which is
+    checked against ``max_size`` before anything is decompressed.
+    """
+    try:
+        parquet = pq.ParquetFile(pa.BufferReader(stream.read()))
+        metadata = parquet.metadata
+        uncompressed = sum(
+            metadata.row_group(index).total_byte_size for index in range(metadata.num_row_groups)
+        )
+        if uncompressed > max_size:
+            raise _too_large(max_size)
+        table = parquet.read(use_threads=True)
+    except (pa.ArrowException, OSError) as exc:
+        raise ValueError(f"Could not read Parquet file: {exc}") from None
+    return _table_to_pandas(table)
+
+
+def read_feather(stream: BinaryIO, max_size: int) -> pd.DataFrame:
+    """
+    Read an Arrow IPC (Feather v2) file or stream.
+
+    Uncompressed record batches reference the upload buffer directly, so
+    numeric columns without nulls reach pandas without a copy. Compressed
+    (lz4/zstd) batches are decoded one at a time and the running size is
+    checked against ``max_size``.
+    """
+    buffer = pa.py_buffer(stream.read())
+    try:
+        try:
+            reader = ipc.open_file(buffer)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            reader = ipc.open_stream(buffer)
+            batches = iter(reader)
+        selected: List[pa.RecordBatch] = []
+        total = 0
+        for batch in batches:
+            total += batch.nbytes
+            if total > max_size:
+                raise _too_large(max_size)
+            selected.append(batch)
+        table = pa.Table.from_batches(selected, schema=reader.schema)
+    except (pa.ArrowException, OSError) as exc:
+        raise ValueError(f"Could not read Arrow/Feather file: {exc}") from None
+    return _table_to_pandas(table)
+
+
+def _table_to_pandas(table: pa.Table) -> pd.DataFrame:
+    # split_blocks keeps one block per column so pandas does not consolidate
+    # (and copy) the Arrow buffers; self_destruct releases converted columns.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_excel(stream: BinaryIO, engine: str, legacy: bool = False) -> pd.DataFrame:
+    """
+    Parse a workbook with ``engine``. openpyxl only reads ``.xlsx``, so for
+    ``legacy`` ``.xls`` files pandas picks the engine (xlrd) unless calamine
+    is in use.
+    """
+    engine = resolve_excel_engine(engine)
+    if legacy and engine != "calamine":
+        engine = None
+    # Workbooks are zip archives whose directory lives at the end of the
+    # file, so they have to be fully buffered before parsing.
+    try:
+        return pd.read_excel(BytesIO(stream.read()), engine=engine)
+    except ImportError:
+        raise ValueError(
+            "Reading .xls files requires the xlrd package or EXCEL_PARSER_ENGINE=calamine."
+        ) from None
+
+
+@lru_cache(maxsize=None)
+def resolve_excel_engine(engine: str) -> str:
+    """
+    ``calamine`` (Rust, optional ``python-calamine`` package) streams sheets
+    far faster than openpyxl and also reads legacy ``.xls``; fall back to
+    openpyxl (which pandas already opens in read-only mode) when missing.
+    """
+    if engine == "calamine" and importlib.util.find_spec("python_calamine") is None:
+        logger.warning(
+            "EXCEL_PARSER_ENGINE=calamine requires the python-calamine package; "
+            "falling back to openpyxl."
+        )
+        return "openpyxl"
+    return engine
@@ -1,73 +1,366 @@
 from __future__ import annotations
 
 import asyncio
-from io import BytesIO
-from typing import Dict
+import hashlib
+import time
+import weakref
+from io import RawIOBase
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
 from threading import RLock
 from uuid import uuid4
 
 import pandas as pd
 from fastapi import UploadFile
 
-from app.schemas.dataset import DatasetUploadResponse
+from app.schemas.dataset import DatasetProfile, DatasetProfileResponse, DatasetUploadResponse
 from app.core.config import settings
+from app.core.metrics import MetricFamily, gauge_family, registry
+from app.services import dataset_readers
+from app.services.dataset_compaction import compact_dataframe
+from app.services.dataset_profile import profile_dataframe
+from app.services.dataset_store import DatasetStore, create_dataset_store, dataframe_nbytes
 
 # WARNING: _dataset_store is protected by _dataset_lock.
 # Direct access to _dataset_store is NOT thread-safe and should only be done in tests.
 # All production code must access datasets via get_dataset and save_dataset.
-_dataset_store: Dict[str, pd.DataFrame] = {}
+# Writes run under the lock; reads only take it to look up the store, since
+# the backends guard their own state and disk reads would otherwise queue
+# behind each other.
+_dataset_store: DatasetStore = create_dataset_store(
+    settings.DATASET_STORE_BACKEND,
+    settings.DATASET_STORE_DIR,
+    settings.DATASET_CACHE_MAX_ENTRIES,
+    max_entries=settings.DATASET_STORE_MAX_ENTRIES,
+    max_bytes=settings.DATASET_STORE_MAX_BYTES,
+    ttl_seconds=settings.DATASET_STORE_TTL_SECONDS,
+)
 _dataset_lock = RLock()
 
+# Derived, per-frame metadata (e.g. content fingerprints) keyed by id() of
+# the stored DataFrame. Entries are removed when the frame is garbage
+# collected, so an id can never be attributed to a different frame. Stored
+# frames are treated as read-only, which keeps the metadata valid.
+_frame_metadata: Dict[int, Dict[str, Any]] = {}
 
-def _read_dataframe(filename: str, content: bytes) -> pd.DataFrame:
+_UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB chunks
+
+UPLOAD_BYTES = registry.counter(
+    "dataset_upload_bytes_total", "Bytes received by successful dataset uploads."
+)
+UPLOAD_THROUGHPUT = registry.histogram(
+    "dataset_upload_throughput_bytes_per_second",
+    "Upload read-and-parse throughput per dataset upload.",
+    buckets=(1e5, 1e6, 5e6, 1e7, 5e7, 1e8, 5e8, 1e9),
+)
+
+
+class _UploadStream(RawIOBase):
+    """
+    Read-only, size-limited view over an uploaded file.
+
+    Bytes are pulled from the underlying file only when the parser asks for
+    them, so the raw upload is never buffered in full. ``head`` holds the
+    bytes already consumed by the caller (e.g. to detect empty uploads) and
+    is replayed before the rest of the file.
+    """
+
+    def __init__(self, source: BinaryIO, max_size: int, head: bytes = b"") -> None:
+        super().__init__()
+        self._source = source
+        self._max_size = max_size
+        self._head = memoryview(head) if head else None
+        self.bytes_read = len(head)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._head:
+            size = min(len(buffer), len(self._head))
+            buffer[:size] = self._head[:size]
+            # Drop the view once replayed so the head bytes can be freed.
+            self._head = self._head[size:] or None
+            return size
+
+        data = self._source.read(len(buffer))
+        if not data:
+            return 0
+        self.bytes_read += len(data)
+        if self.bytes_read > self._max_size:
+            raise ValueError(
+                f"Uploaded file exceeds the maximum allowed size of {self._max_size} bytes."
+            )
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _read_dataframe(filename: str, stream: BinaryIO, sample: bytes = b"") -> pd.DataFrame:
     lowered = filename.lower()
+    max_size = settings.MAX_DECOMPRESSED_SIZE_BYTES
     if lowered.endswith(".csv"):
-        return pd.read_csv(BytesIO(content))
+        return dataset_readers.read_csv(stream, settings.CSV_PARSER_ENGINE, sample)
+    for suffix, compression in dataset_readers.COMPRESSIONS.items():
+        if lowered.endswith(f".csv{suffix}"):
+            return dataset_readers.read_compressed_csv(
+                stream, compression, settings.CSV_PARSER_ENGINE, max_size
+            )
+    if lowered.endswith((".parquet", ".pq")):
+        return dataset_readers.read_parquet(stream, max_size)
+    if lowered.endswith((".feather", ".arrow", ".ipc")):
+        return dataset_readers.read_feather(stream, max_size)
     if lowered.endswith(".xlsx") or lowered.endswith(".xls"):
-        return pd.read_excel(BytesIO(content))
-    raise ValueError("Unsupported file format. Please upload a .csv or .xlsx file.")
+        return dataset_readers.read_excel(
+            stream, settings.EXCEL_PARSER_ENGINE, legacy=lowered.endswith(".xls")
+        )
+    raise ValueError(
+        "Unsupported file format. Please upload a .csv, .csv.gz, .csv.zst, .parquet, "
+        ".feather or .xlsx file."
+    )
+
+
+def _compact(df: pd.DataFrame) -> Tuple[pd.DataFrame, int, int]:
+    before = dataframe_nbytes(df)
+    df = compact_dataframe(df, settings.DATASET_CATEGORY_MAX_RATIO)
+    after = dataframe_nbytes(df)
+    return df, after, before - after
+
+
+def get_dataset(dataset_id: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Return a stored dataset, or only ``columns`` of it.
+
+    Projected reads from the arrow backend materialize just the requested
+    columns; unknown column names are ignored so callers can report them.
+    """
+    store = _current_store()
+    try:
+        if columns is None:
+            return store[dataset_id]
+        return store.read(dataset_id, columns)
+    except KeyError:
+        raise ValueError("Dataset not found. Please upload again.") from None
+
+
+def iter_dataset_chunks(
+    dataset_id: str, chunk_rows: int, columns: Optional[Sequence[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a stored dataset (or ``columns`` of it) in frames of at most
+    ``chunk_rows`` rows, for consumers that must not hold it in memory at once.
+    """
+    store = _current_store()
+    try:
+        return store.iter_chunks(dataset_id, chunk_rows, columns)
+    except KeyError:
+        raise ValueError("Dataset not found. Please upload again.") from None
+
+
+def _current_store() -> DatasetStore:
+    with _dataset_lock:
+        return _dataset_store
+
+
+def _frame_metadata_for(df: pd.DataFrame) -> Dict[str, Any]:
+    with _dataset_lock:
+        key = id(df)
+        metadata = _frame_metadata.get(key)
+        if metadata is None:
+            metadata = _frame_metadata[key] = {}
+            weakref.finalize(df, _frame_metadata.pop, key, None)
+        return metadata
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a stored dataset (schema plus every value).
+
+    Computed once per frame and memoized, so callers can use it as a cheap
+    cache key for anything derived from the dataset.
+    """
+    metadata = _frame_metadata_for(df)
+    fingerprint = metadata.get("fingerprint")
+    if fingerprint is None:
+        digest = hashlib.sha256()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        fingerprint = digest.hexdigest()
+        metadata["fingerprint"] = fingerprint
+    return fingerprint
+
+
+def dataset_profile(df: pd.DataFrame) -> DatasetProfile:
+    """
+    Per-column statistics of a stored dataset (see ``profile_dataframe``).
+
+    Computed at upload time and memoized per frame; pipeline runs take their
+    fill values and rare-class checks from it.
+    """
+    metadata = _frame_metadata_for(df)
+    profile = metadata.get("profile")
+    if profile is None:
+        profile = profile_dataframe(df, settings.PROFILE_MAX_CLASSES)
+        metadata["profile"] = profile
+    return profile
+
 
+def dataset_column_nbytes(df: pd.DataFrame) -> Dict[str, int]:
+    """Deep memory usage of each column of a stored dataset, memoized per frame."""
+    metadata = _frame_metadata_for(df)
+    column_nbytes = metadata.get("column_nbytes")
+    if column_nbytes is None:
+        usage = df.memory_usage(index=False, deep=True)
+        column_nbytes = {str(col): int(nbytes) for col, nbytes in usage.items()}
+        metadata["column_nbytes"] = column_nbytes
+    return column_nbytes
 
-def get_dataset(dataset_id: str) -> pd.DataFrame:
+
+def stored_fingerprint(dataset_id: str) -> str:
+    """``dataset_fingerprint`` of a stored dataset, without loading it where possible."""
+    return _stored_metadata(dataset_id)["fingerprint"]
+
+
+def stored_profile(dataset_id: str) -> DatasetProfile:
+    """``dataset_profile`` of a stored dataset, without loading it where possible."""
+    profile = _stored_metadata(dataset_id)["profile"]
+    if isinstance(profile, DatasetProfile):
+        return profile
+    return DatasetProfile.model_validate(profile)
+
+
+def stored_column_nbytes(dataset_id: str) -> Dict[str, int]:
+    """``dataset_column_nbytes`` of a stored dataset, without loading it where possible."""
+    return _stored_metadata(dataset_id)["column_nbytes"]
+
+
+def _stored_metadata(dataset_id: str) -> Dict[str, Any]:
+    # Disk-backed stores keep what _store_dataset computed next to the data;
+    # otherwise (memory backend, or datasets stored before metadata was
+    # recorded) it is derived from the frame and memoized.
+    try:
+        metadata = _current_store().read_metadata(dataset_id)
+    except KeyError:
+        raise ValueError("Dataset not found. Please upload again.") from None
+    if metadata is not None:
+        return metadata
+    return _describe(get_dataset(dataset_id))
+
+
+def _describe(df: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "fingerprint": dataset_fingerprint(df),
+        "profile": dataset_profile(df),
+        "column_nbytes": dataset_column_nbytes(df),
+    }
+
+
+def get_dataset_profile(dataset_id: str) -> DatasetProfileResponse:
+    profile = stored_profile(dataset_id)
+    return DatasetProfileResponse(dataset_id=dataset_id, **profile.model_dump())
+
+
+def _store_dataset(dataset_id: str, df: pd.DataFrame) -> None:
+    metadata = _describe(df)
+    with _dataset_lock:
+        _dataset_store[dataset_id] = df
+        _dataset_store.write_metadata(
+            dataset_id, {**metadata, "profile": metadata["profile"].model_dump(mode="json")}
+        )
+
+
+def get_store_stats() -> Dict[str, Any]:
     with _dataset_lock:
-        if dataset_id not in _dataset_store:
-            raise ValueError("Dataset not found. Please upload again.")
-        return _dataset_store[dataset_id]
+        return _dataset_store.stats()
+
+
+def _collect_metrics() -> List[MetricFamily]:
+    stats = get_store_stats()
+    return [
+        gauge_family(
+            "dataset_store_entries", "Datasets held by the dataset store.", [({}, stats["entries"])]
+        ),
+        gauge_family(
+            "dataset_store_bytes", "In-memory bytes held by the dataset store.", [({}, stats["bytes"])]
+        ),
+        gauge_family(
+            "dataset_store_disk_bytes",
+            "Bytes the dataset store keeps on disk.",
+            [({}, stats.get("disk_bytes"))],
+        ),
+    ]
+
+
+registry.register_collector(_collect_metrics)
 
 
 async def save_dataset(file: UploadFile) -> DatasetUploadResponse:
-    # Check file size by reading in chunks to avoid memory exhaustion
-    # and to validate size before processing.
+    # Read only the first chunk up front to reject empty/oversized uploads;
+    # the remainder is streamed straight into the parser so the raw bytes
+    # are never held in memory alongside the parsed DataFrame.
     MAX_SIZE = settings.MAX_UPLOAD_SIZE_BYTES
-    chunk_size = 1024 * 1024  # 1MB chunks
-    content = bytearray()
-
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        content.extend(chunk)
-        if len(content) > MAX_SIZE:
-            raise ValueError(
-                f"Uploaded file exceeds the maximum allowed size of {MAX_SIZE} bytes."
-            )
+    start = time.perf_counter()
+    head = await file.read(_UPLOAD_CHUNK_SIZE)
 
-    if not content:
+    if not head:
         raise ValueError("Uploaded file is empty.")
+    if len(head) > MAX_SIZE:
+        raise ValueError(
+            f"Uploaded file exceeds the maximum allowed size of {MAX_SIZE} bytes."
+        )
+
+    stream = _UploadStream(file.file, MAX_SIZE, head)
+    return await _ingest(file.filename or "", stream, head, start)
 
-    filename = file.filename or ""
+
+async def save_dataset_file(filename: str, path: Path) -> DatasetUploadResponse:
+    """Parse and store an upload that was already spooled to ``path``."""
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    # Opening and reading the file block, so like parsing they run off the loop.
+    handle, head = await loop.run_in_executor(None, _open_with_head, path)
+    with handle:
+        if not head:
+            raise ValueError("Uploaded file is empty.")
+        stream = _UploadStream(handle, settings.MAX_UPLOAD_SIZE_BYTES, head)
+        return await _ingest(filename, stream, head, start)
+
+
+def _open_with_head(path: Path) -> Tuple[BinaryIO, bytes]:
+    handle = open(path, "rb")
+    try:
+        return handle, handle.read(_UPLOAD_CHUNK_SIZE)
+    except BaseException:
+        handle.close()
+        raise
+
+
+async def _ingest(
+    filename: str, stream: _UploadStream, head: bytes, start: float
+) -> DatasetUploadResponse:
     loop = asyncio.get_running_loop()
     # Offload blocking IO/CPU task to a thread pool
-    df = await loop.run_in_executor(None, _read_dataframe, filename, content)
+    df = await loop.run_in_executor(None, _read_dataframe, filename, stream, head)
+    del head
 
     if df.empty:
         raise ValueError("Dataset contains no rows.")
 
+    elapsed = time.perf_counter() - start
+    UPLOAD_BYTES.inc(stream.bytes_read)
+    if elapsed > 0:
+        UPLOAD_THROUGHPUT.observe(stream.bytes_read / elapsed)
+
+    memory_usage = memory_saved = None
+    if settings.DATASET_COMPACTION_ENABLED:
+        df, memory_usage, memory_saved = await loop.run_in_executor(None, _compact, df)
+
     dataset_id = str(uuid4())
-    with _dataset_lock:
-        _dataset_store[dataset_id] = df
+    # Disk-backed stores write the dataset out, so keep it off the event loop.
+    await loop.run_in_executor(None, _store_dataset, dataset_id, df)
 
-    preview = df.head(5).fillna("null").to_dict(orient="records")
+    # Object dtype first: category columns reject fill values outside their levels.
+    head = df.head(5).astype(object)
+    preview = head.where(head.notna(), "null").to_dict(orient="records")
     dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
 
     return DatasetUploadResponse(
@@ -77,4 +370,6 @@ async def save_dataset(file: UploadFile) -> DatasetUploadResponse:
         column_names=list(df.columns),
         dtypes=dtypes,
         preview=preview,
+        memory_usage_bytes=memory_usage,
+        memory_saved_bytes=memory_saved,
     )
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from uuid import uuid4
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from pandas.api.types import infer_dtype
+
+from app.core.cache import BoundedCache
+
+# Dataset ids come from request bodies, so only accept ids that cannot be
+# used to escape the store directory.
+_VALID_DATASET_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class DatasetStore(ABC):
+    """
+    Mapping-like interface implemented by every dataset backend.
+
+    Backends raise ``KeyError`` for unknown ids; ``dataset_service`` turns that
+    into the user-facing "Dataset not found" error.
+    """
+
+    @abstractmethod
+    def __getitem__(self, dataset_id: str) -> pd.DataFrame:
+        ...
+
+    def read(self, dataset_id: str, columns: Sequence[str]) -> pd.DataFrame:
+        """Return only ``columns`` (in that order) that exist in the dataset."""
+        df = self[dataset_id]
+        return df[_present(columns, df.columns)]
+
+    def iter_chunks(
+        self, dataset_id: str, chunk_rows: int, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Frames of at most ``chunk_rows`` consecutive rows (optionally only
+        ``columns``). Unknown ids raise ``KeyError`` here, not on iteration.
+        """
+        df = self[dataset_id] if columns is None else self.read(dataset_id, columns)
+        return _row_slices(df, chunk_rows)
+
+    @abstractmethod
+    def __setitem__(self, dataset_id: str, df: pd.DataFrame) -> None:
+        ...
+
+    @abstractmethod
+    def __delitem__(self, dataset_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def __contains__(self, dataset_id: object) -> bool:
+        ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        ...
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def clear(self) -> None:
+        for dataset_id in list(self):
+            del self[dataset_id]
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Report occupancy; ``bytes`` counts frames resident in process memory."""
+
+    def read_metadata(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """
+        JSON metadata saved with ``write_metadata``, or ``None`` when the
+        backend keeps none for ``dataset_id`` (callers then derive it from
+        the frame itself).
+        """
+        return None
+
+    def write_metadata(self, dataset_id: str, metadata: Dict[str, Any]) -> None:
+        """Keep ``metadata`` alongside a stored dataset; a no-op by default."""
+
+
+def _present(columns: Sequence[str], available: Iterable[Any]) -> List[str]:
+    names = set(available)
+    return [name for name in columns if name in names]
+
+
+def _row_slices(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start : start + chunk_rows]
+
+
+def dataframe_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryDatasetStore(DatasetStore):
+    """
+    Keeps DataFrames in process memory (lost on restart).
+
+    Optional limits evict the least recently used datasets once the store
+    holds more than ``max_entries`` frames or ``max_bytes`` of deep memory
+    usage, or when a dataset has not been read for ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self._frames: BoundedCache[str, pd.DataFrame] = BoundedCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=dataframe_nbytes,
+        )
+
+    def __getitem__(self, dataset_id: str) -> pd.DataFrame:
+        return self._frames[dataset_id]
+
+    def __setitem__(self, dataset_id: str, df: pd.DataFrame) -> None:
+        self._frames[dataset_id] = df
+
+    def __delitem__(self, dataset_id: str) -> None:
+        del self._frames[dataset_id]
+
+    def __contains__(self, dataset_id: object) -> bool:
+        return dataset_id in self._frames
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._frames)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._frames.stats()}
+
+
+class ArrowDatasetStore(DatasetStore):
+    """
+    Persists each dataset as an uncompressed Arrow IPC file under ``directory``.
+
+    Reads memory-map the file, so numeric columns without nulls are exposed to
+    pandas zero-copy (as read-only arrays) and pages are shared between all
+    workers reading the same dataset. A small LRU of recently used frames
+    avoids re-materializing object columns on every access; its size, byte
+    budget and idle TTL bound the resident memory.
+
+    ``max_entries``, ``max_bytes`` (file sizes) and ``ttl_seconds`` bound the
+    files themselves. Recency is the file's modification time, refreshed on
+    every read, so all workers sharing the directory see the same order: a
+    write removes the least recently used datasets beyond the limits, and an
+    idle dataset expires on its next access (or when the store is listed).
+
+    Metadata (fingerprint, profile) is kept in a JSON file next to each
+    dataset, so it can be read without loading the table.
+    """
+
+    suffix = ".arrow"
+    metadata_suffix = ".json"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        cache_size: int = 8,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        # Guards the eviction counter; reads run concurrently (see dataset_service).
+        self._lock = Lock()
+        self._evictions = 0
+        self._cache_size = max(cache_size, 0)
+        self._cache: BoundedCache[str, pd.DataFrame] = BoundedCache(
+            max_entries=self._cache_size,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=dataframe_nbytes,
+        )
+
+    def _path(self, dataset_id: str) -> Path:
+        if not isinstance(dataset_id, str) or not _VALID_DATASET_ID.match(dataset_id):
+            raise KeyError(dataset_id)
+        return self.directory / f"{dataset_id}{self.suffix}"
+
+    def _metadata_path(self, dataset_id: str) -> Path:
+        return self._path(dataset_id).with_suffix(self.metadata_suffix)
+
+    def _remember(self, dataset_id: str, df: pd.DataFrame) -> None:
+        if self._cache_size > 0:
+            self._cache[dataset_id] = df
+
+    def _expired(self, path: Path, now: float) -> bool:
+        return self._ttl_seconds is not None and now - path.stat().st_mtime > self._ttl_seconds
+
+    def _touch(self, dataset_id: str) -> None:
+        """Mark a dataset as used; raise ``KeyError`` if it expired or is gone."""
+        path = self._path(dataset_id)
+        try:
+            if self._expired(path, time.time()):
+                self._evict(dataset_id)
+                raise KeyError(dataset_id)
+            os.utime(path)
+        except FileNotFoundError:
+            # Removed by another worker (or its limits); drop our stale copy.
+            self._cache.pop(dataset_id)
+            raise KeyError(dataset_id) from None
+
+    def _discard(self, dataset_id: str) -> None:
+        self._cache.pop(dataset_id)
+        self._metadata_path(dataset_id).unlink(missing_ok=True)
+        self._path(dataset_id).unlink(missing_ok=True)
+
+    def _evict(self, dataset_id: str) -> None:
+        self._discard(dataset_id)
+        with self._lock:
+            self._evictions += 1
+
+    def _files(self) -> Dict[str, int]:
+        """
+        File size per stored dataset, least recently used first. Expired
+        datasets are removed on the way.
+        """
+        now = time.time()
+        files = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by another worker meanwhile
+            if self._ttl_seconds is not None and now - stat.st_mtime > self._ttl_seconds:
+                self._evict(path.stem)
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        return {dataset_id: size for _, dataset_id, size in sorted(files)}
+
+    def _enforce_limits(self, keep: str) -> None:
+        if self._max_entries is None and self._max_bytes is None and self._ttl_seconds is None:
+            return
+        sizes = self._files()
+        total = sum(sizes.values())
+        for dataset_id in list(sizes):
+            over_entries = self._max_entries is not None and len(sizes) > self._max_entries
+            over_bytes = self._max_bytes is not None and total > self._max_bytes
+            if not (over_entries or over_bytes):
+                break
+            if dataset_id == keep:
+                continue
+            self._evict(dataset_id)
+            total -= sizes.pop(dataset_id)
+
+    def __getitem__(self, dataset_id: str) -> pd.DataFrame:
+        self._touch(dataset_id)
+        cached = self._cache.get(dataset_id)
+        if cached is not None:
+            return cached
+
+        df = self._load(dataset_id)
+        self._remember(dataset_id, df)
+        return df
+
+    def read(self, dataset_id: str, columns: Sequence[str]) -> pd.DataFrame:
+        self._touch(dataset_id)
+        cached = self._cache.get(dataset_id)
+        if cached is not None:
+            return cached[_present(columns, cached.columns)]
+        # Projected frames are not cached: they are cheap to rebuild from the
+        # memory map and would otherwise crowd full frames out of the LRU.
+        return self._load(dataset_id, columns)
+
+    def iter_chunks(
+        self, dataset_id: str, chunk_rows: int, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        self._touch(dataset_id)
+        cached = self._cache.get(dataset_id)
+        if cached is not None:
+            if columns is not None:
+                cached = cached[_present(columns, cached.columns)]
+            return _row_slices(cached, chunk_rows)
+        # Slices of the memory-mapped table are zero-copy; only the chunk
+        # being converted is materialized, so datasets larger than RAM can be
+        # streamed.
+        table = self._open(dataset_id, columns)
+        return (
+            table.slice(start, chunk_rows).to_pandas(split_blocks=True)
+            for start in range(0, table.num_rows, chunk_rows)
+        )
+
+    def _open(self, dataset_id: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        path = self._path(dataset_id)
+        try:
+            source = pa.memory_map(str(path), "r")
+        except FileNotFoundError:
+            raise KeyError(dataset_id) from None
+        table = ipc.open_file(source).read_all()
+        if columns is not None:
+            # Unselected columns stay untouched pages of the memory map.
+            table = table.select(_present(columns, table.column_names))
+        return table
+
+    def _load(self, dataset_id: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        # split_blocks keeps one block per column so pandas does not
+        # consolidate (and therefore copy) the memory-mapped buffers.
+        return self._open(dataset_id, columns).to_pandas(split_blocks=True)
+
+    def __setitem__(self, dataset_id: str, df: pd.DataFrame) -> None:
+        path = self._path(dataset_id)
+        df = _uniform_object_columns(df)
+        table = _to_table(df)
+        # Metadata of a replaced dataset no longer describes it.
+        self._metadata_path(dataset_id).unlink(missing_ok=True)
+        with _atomic_write(path) as tmp_path:
+            with pa.OSFile(str(tmp_path), "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        self._remember(dataset_id, df)
+        self._enforce_limits(keep=dataset_id)
+
+    def read_metadata(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        self._touch(dataset_id)
+        try:
+            return json.loads(self._metadata_path(dataset_id).read_text())
+        except FileNotFoundError:
+            return None
+
+    def write_metadata(self, dataset_id: str, metadata: Dict[str, Any]) -> None:
+        path = self._metadata_path(dataset_id)
+        with _atomic_write(path) as tmp_path:
+            tmp_path.write_text(json.dumps(metadata))
+
+    def __delitem__(self, dataset_id: str) -> None:
+        self._cache.pop(dataset_id)
+        self._metadata_path(dataset_id).unlink(missing_ok=True)
+        try:
+            self._path(dataset_id).unlink()
+        except FileNotFoundError:
+            raise KeyError(dataset_id) from None
+
+    def __contains__(self, dataset_id: object) -> bool:
+        try:
+            path = self._path(dataset_id)  # type: ignore[arg-type]
+        except KeyError:
+            return False
+        try:
+            return path.exists() and not self._expired(path, time.time())
+        except FileNotFoundError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._files()))
+
+    def stats(self) -> Dict[str, Any]:
+        files = self._files()
+        cache_stats = self._cache.stats()
+        return {
+            "backend": "arrow",
+            **cache_stats,
+            # Limits and evictions describe the stored files; ``bytes``,
+            # hits and misses the hot-frame cache.
+            "entries": len(files),
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "ttl_seconds": self._ttl_seconds,
+            "evictions": self._evictions,
+            "resident_entries": cache_stats["entries"],
+            "resident_evictions": cache_stats["evictions"],
+            "disk_bytes": sum(files.values()),
+        }
+
+
+def _uniform_object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Arrow columns have a single type, so object columns mixing strings with
+    numbers or booleans (e.g. chunked CSV parsing of ``1, 2, A12``) are
+    stored as strings; missing values stay missing.
+    """
+    mixed = [
+        col
+        for col in df.columns
+        if df[col].dtype == object
+        and infer_dtype(df[col], skipna=True) in ("mixed", "mixed-integer")
+    ]
+    if not mixed:
+        return df
+    df = df.copy(deep=False)
+    for col in mixed:
+        df[col] = df[col].astype(str).where(df[col].notna())
+    return df
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as exc:
+        for col in df.columns:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                raise ValueError(
+                    f"Column '{col}' has values that cannot be stored ({df[col].dtype})."
+                ) from exc
+        raise ValueError(f"Dataset cannot be stored: {exc}") from exc
+
+
+@contextmanager
+def _atomic_write(path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary path that replaces ``path`` once written, so other
+    workers never observe a partially written file.
+    """
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def create_dataset_store(
+    backend: str,
+    directory: str,
+    cache_size: int,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+) -> DatasetStore:
+    if backend == "memory":
+        return MemoryDatasetStore(
+            max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds
+        )
+    if backend == "arrow":
+        return ArrowDatasetStore(
+            directory,
+            cache_size=cache_size,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+        )
+    raise ValueError(f"Unsupported dataset store backend: {backend}")
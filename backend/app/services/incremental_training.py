@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+# Building blocks for out-of-core training (memory_mode="out_of_core"): every
+# step sees one chunk of the stored dataset at a time, so state kept between
+# chunks is limited to per-column statistics and the fitted transformers.
+
+
+@dataclass
+class StreamStatistics:
+    """What one pass over the chunks learns about the run's columns."""
+
+    rows: int
+    feature_columns: List[str]
+    numeric_columns: List[str]
+    categorical_columns: List[str]
+    numeric_sums: Dict[str, float]
+    numeric_counts: Dict[str, int]
+    category_counts: Dict[str, Counter]
+    target_counts: Counter
+    target_missing: int
+
+
+def collect_statistics(
+    chunks: Iterable[pd.DataFrame],
+    target_column: str,
+    feature_columns: Optional[Sequence[str]] = None,
+) -> StreamStatistics:
+    """
+    Column types, running sums and level/class counts over all chunks.
+
+    Without ``feature_columns`` every column except the target is a feature.
+    Column types are taken from the first chunk.
+    """
+    stats: Optional[StreamStatistics] = None
+    for chunk in chunks:
+        if stats is None:
+            stats = _empty_statistics(chunk, target_column, feature_columns)
+        stats.rows += len(chunk)
+        for col in stats.numeric_columns:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = values[~np.isnan(values)]
+            stats.numeric_sums[col] += float(present.sum())
+            stats.numeric_counts[col] += len(present)
+        for col in stats.categorical_columns:
+            stats.category_counts[col].update(_level_counts(chunk[col].dropna().astype(str)))
+        target = chunk[target_column]
+        stats.target_missing += int(target.isna().sum())
+        stats.target_counts.update(_level_counts(target.dropna()))
+
+    if stats is None or stats.rows == 0:
+        raise ValueError("Dataset is empty.")
+    return stats
+
+
+def _empty_statistics(
+    chunk: pd.DataFrame, target_column: str, feature_columns: Optional[Sequence[str]]
+) -> StreamStatistics:
+    if target_column not in chunk.columns:
+        raise ValueError("Target column not found in dataset.")
+    features = list(feature_columns or [c for c in chunk.columns if c != target_column])
+    if not features:
+        raise ValueError("No feature columns selected.")
+    missing = [c for c in features if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Feature columns not found in dataset: {', '.join(map(str, missing))}")
+
+    numeric = [c for c in features if pd.api.types.is_numeric_dtype(chunk[c])]
+    categorical = [c for c in features if c not in set(numeric)]
+    return StreamStatistics(
+        rows=0,
+        feature_columns=features,
+        numeric_columns=numeric,
+        categorical_columns=categorical,
+        numeric_sums={c: 0.0 for c in numeric},
+        numeric_counts={c: 0 for c in numeric},
+        category_counts={c: Counter() for c in categorical},
+        target_counts=Counter(),
+        target_missing=0,
+    )
+
+
+def _level_counts(values: pd.Series) -> Dict[Any, int]:
+    return {level: int(count) for level, count in values.value_counts(sort=False).items() if count}
+
+
+def _most_frequent(counts: Counter) -> Any:
+    # Ties go to the smallest level, like pandas' mode.
+    return max(sorted(counts), key=counts.__getitem__)
+
+
+@dataclass
+class ChunkEncoder:
+    """
+    Turns a raw chunk into the model's input and encoded target.
+
+    Numeric columns are filled and passed through ``preprocessors`` in
+    order; categorical levels are one-hot encoded after the numeric block,
+    the layout the sparse inference plan expects.
+    """
+
+    numeric_columns: List[str]
+    numeric_fill: Dict[str, float]
+    categorical_columns: List[str]
+    categorical_fill: Dict[str, str]
+    encoder: Optional[OneHotEncoder]
+    target_column: str
+    target_fill: Any
+    label_encoder: LabelEncoder
+    preprocessors: List[Tuple[str, List[str], Any]] = field(default_factory=list)
+
+    @property
+    def output_columns(self) -> List[str]:
+        names = list(self.numeric_columns)
+        if self.encoder is not None:
+            names.extend(self.encoder.get_feature_names_out())
+        return names
+
+    def numeric(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Filled and scaled numeric block of ``chunk``."""
+        block = np.empty((len(chunk), len(self.numeric_columns)), dtype=np.float64)
+        for j, col in enumerate(self.numeric_columns):
+            column = block[:, j]
+            column[:] = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            np.copyto(column, self.numeric_fill[col], where=np.isnan(column))
+        positions = {col: j for j, col in enumerate(self.numeric_columns)}
+        for _, cols, scaler in self.preprocessors:
+            indices = [positions[col] for col in cols]
+            block[:, indices] = scaler.transform(block[:, indices])
+        return block
+
+    def transform(self, chunk: pd.DataFrame) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        matrix = sparse.csr_matrix(self.numeric(chunk))
+        if self.encoder is not None:
+            levels = pd.DataFrame(
+                {
+                    col: chunk[col]
+                    .astype(object)
+                    .where(chunk[col].notna(), self.categorical_fill[col])
+                    .astype(str)
+                    for col in self.categorical_columns
+                }
+            )
+            matrix = sparse.hstack([matrix, self.encoder.transform(levels)], format="csr")
+        target = chunk[self.target_column]
+        if self.target_fill is not None:
+            target = target.fillna(self.target_fill)
+        return matrix, self.label_encoder.transform(target.to_numpy())
+
+
+def build_chunk_encoder(
+    stats: StreamStatistics,
+    target_column: str,
+    max_categories: Optional[int],
+    warnings: List[str],
+) -> ChunkEncoder:
+    """
+    Fill values and encoders from the collected statistics.
+
+    Numeric gaps are filled with the column mean (a median would need a
+    second pass or a sketch), categorical and target gaps with the most
+    frequent level. With ``max_categories`` the least frequent levels (and
+    unseen ones) share an "infrequent" column, as on the in-memory sparse
+    path.
+    """
+    numeric_fill: Dict[str, float] = {}
+    for col in stats.numeric_columns:
+        if not stats.numeric_counts[col]:
+            raise ValueError(f"Column '{col}' has no values to impute missing entries from.")
+        numeric_fill[col] = stats.numeric_sums[col] / stats.numeric_counts[col]
+
+    categorical_fill: Dict[str, str] = {}
+    filled_counts: Dict[str, Counter] = {}
+    for col in stats.categorical_columns:
+        counts = stats.category_counts[col]
+        if not counts:
+            raise ValueError(f"Column '{col}' has no values to impute missing entries from.")
+        categorical_fill[col] = _most_frequent(counts)
+        # Level counts once missing entries hold the fill value.
+        filled_counts[col] = counts + Counter(
+            {categorical_fill[col]: stats.rows - sum(counts.values())}
+        )
+
+    encoder = None
+    if stats.categorical_columns:
+        encoder = _fit_one_hot(stats.categorical_columns, filled_counts, max_categories)
+
+    if not stats.target_counts:
+        raise ValueError("Target column has no values.")
+    target_fill = None
+    if stats.target_missing:
+        target_fill = _most_frequent(stats.target_counts)
+        warnings.append(f"Missing target values filled with mode: {target_fill}.")
+    label_encoder = LabelEncoder().fit(np.array(sorted(stats.target_counts)))
+
+    return ChunkEncoder(
+        numeric_columns=list(stats.numeric_columns),
+        numeric_fill=numeric_fill,
+        categorical_columns=list(stats.categorical_columns),
+        categorical_fill=categorical_fill,
+        encoder=encoder,
+        target_column=target_column,
+        target_fill=target_fill,
+        label_encoder=label_encoder,
+    )
+
+
+def _fit_one_hot(
+    columns: List[str], category_counts: Dict[str, Counter], max_categories: Optional[int]
+) -> OneHotEncoder:
+    """
+    One-hot encoder over every collected level, fitted without the rows.
+
+    Only the frequent/infrequent split depends on the counts. It is chosen
+    the way ``OneHotEncoder(max_categories=...)`` chooses it: the
+    ``max_categories - 1`` most frequent levels, ties going to the later
+    level in sorted order. Then the fit sees two rows per frequent level and
+    one per infrequent level, which reproduces that split.
+    """
+    categories = [sorted(category_counts[col]) for col in columns]
+    weights = []
+    for col, levels in zip(columns, categories):
+        counts = np.array([category_counts[col][level] for level in levels])
+        col_weights = np.full(len(levels), 2)
+        if max_categories is not None and len(levels) >= max_categories:
+            col_weights[np.argsort(counts, kind="mergesort")[: -(max_categories - 1)]] = 1
+        weights.append(col_weights)
+
+    width = max(int(col_weights.sum()) for col_weights in weights)
+    rows = {}
+    for col, levels, col_weights in zip(columns, categories, weights):
+        # Padding repeats a frequent level, which keeps it frequent.
+        col_weights[col_weights.argmax()] += width - col_weights.sum()
+        rows[col] = np.repeat(np.array(levels, dtype=object), col_weights)
+    encoder = OneHotEncoder(
+        categories=categories,
+        max_categories=max_categories,
+        handle_unknown="infrequent_if_exist" if max_categories else "ignore",
+        sparse_output=True,
+        dtype=np.float64,
+    )
+    return encoder.fit(pd.DataFrame(rows))
+
+
+def held_out_rows(chunk_index: int, rows: int, test_size: float, random_state: int) -> np.ndarray:
+    """
+    Boolean mask of the chunk's held-out rows.
+
+    Seeded by the chunk's position, so every pass sees the same split
+    without storing it.
+    """
+    rng = np.random.default_rng([random_state, chunk_index])
+    return rng.random(rows) < test_size
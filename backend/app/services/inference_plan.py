@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import MinMaxScaler, OneHotEncoder, OrdinalEncoder, StandardScaler
+
+
+@dataclass
+class InferencePlan:
+    """
+    Fixed recipe that turns raw prediction records into the model's input.
+
+    Compiled once per trained model so that prediction does not rebuild a
+    DataFrame, run get_dummies or reindex per request. Numeric columns are
+    coerced, filled and passed through one fused affine transform (all
+    scalers collapsed into ``x * scale + offset``); categorical values are
+    looked up in a value -> output column map, or, for ordinal output, a
+    value -> code map whose code is written to the column's own position.
+    """
+
+    feature_columns: List[str]
+    n_outputs: int
+    numeric_columns: List[str]
+    numeric_positions: np.ndarray
+    numeric_fill: np.ndarray
+    numeric_scale: np.ndarray
+    numeric_offset: np.ndarray
+    categorical_columns: List[str]
+    categorical_fill: List[str]
+    # Level -> output column (one-hot) or level -> code (ordinal).
+    category_positions: List[Dict[str, int]]
+    # Output column for levels unseen during training (-1: all zeros).
+    unknown_positions: List[int]
+    sparse_output: bool = False
+    ordinal_output: bool = False
+
+    def check_columns(self, records: Sequence[Dict[str, Any]]) -> None:
+        """Fail unless every feature column appears in at least one record."""
+        present = set().union(*records)
+        missing = [c for c in self.feature_columns if c not in present]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+
+    def transform(self, records: Sequence[Dict[str, Any]]) -> Any:
+        self.check_columns(records)
+
+        n_rows = len(records)
+        numeric = np.empty((n_rows, len(self.numeric_columns)), dtype=np.float64)
+        for j, col in enumerate(self.numeric_columns):
+            numeric[:, j] = [_to_float(record.get(col)) for record in records]
+        if self.numeric_columns:
+            np.copyto(numeric, self.numeric_fill, where=np.isnan(numeric))
+            numeric *= self.numeric_scale
+            numeric += self.numeric_offset
+
+        if self.ordinal_output:
+            return self._ordinal_matrix(records, numeric)
+
+        cat_rows: List[int] = []
+        cat_cols: List[int] = []
+        for j, col in enumerate(self.categorical_columns):
+            lookup = self.category_positions[j]
+            fill = self.categorical_fill[j]
+            unknown = self.unknown_positions[j]
+            for i, record in enumerate(records):
+                position = lookup.get(_to_category(record.get(col), fill), unknown)
+                if position >= 0:
+                    cat_rows.append(i)
+                    cat_cols.append(position)
+
+        if self.sparse_output:
+            num_rows = np.repeat(np.arange(n_rows), len(self.numeric_columns))
+            num_cols = np.tile(self.numeric_positions, n_rows)
+            rows = np.concatenate([num_rows, np.asarray(cat_rows, dtype=np.intp)])
+            cols = np.concatenate([num_cols, np.asarray(cat_cols, dtype=np.intp)])
+            values = np.concatenate([numeric.ravel(), np.ones(len(cat_rows))])
+            return sparse.csr_matrix((values, (rows, cols)), shape=(n_rows, self.n_outputs))
+
+        matrix = np.zeros((n_rows, self.n_outputs), dtype=np.float64)
+        matrix[:, self.numeric_positions] = numeric
+        matrix[cat_rows, cat_cols] = 1.0
+        return matrix
+
+    def _ordinal_matrix(self, records: Sequence[Dict[str, Any]], numeric: np.ndarray) -> np.ndarray:
+        # Numeric columns first, then one code column per categorical
+        # feature; unseen levels are NaN, which the model treats as missing.
+        matrix = np.empty((len(records), self.n_outputs), dtype=np.float64)
+        matrix[:, self.numeric_positions] = numeric
+        start = len(self.numeric_columns)
+        for j, col in enumerate(self.categorical_columns):
+            lookup = self.category_positions[j]
+            fill = self.categorical_fill[j]
+            matrix[:, start + j] = [
+                lookup.get(_to_category(record.get(col), fill), math.nan) for record in records
+            ]
+        return matrix
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_category(value: Any, fill: str) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return fill
+    return str(value)
+
+
+def _scaler_affine(scaler: Any) -> Tuple[np.ndarray, np.ndarray]:
+    if isinstance(scaler, StandardScaler):
+        n = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        return 1.0 / scale, -mean / scale
+    if isinstance(scaler, MinMaxScaler) and not scaler.clip:
+        return scaler.scale_, scaler.min_
+    raise ValueError(f"Cannot compile scaler of type {type(scaler).__name__}")
+
+
+def encoder_positions(
+    encoder: OneHotEncoder, start: int
+) -> Tuple[List[Dict[str, int]], List[int]]:
+    """Map each level to its encoder output column, offset by ``start``."""
+    positions: List[Dict[str, int]] = []
+    unknown_positions: List[int] = []
+    infrequent = getattr(encoder, "infrequent_categories_", None) or [None] * len(encoder.categories_)
+    offset = start
+    for categories, rare in zip(encoder.categories_, infrequent):
+        rare_set = set(rare) if rare is not None else set()
+        frequent = [c for c in categories if c not in rare_set]
+        lookup = {str(c): offset + k for k, c in enumerate(frequent)}
+        offset += len(frequent)
+        unknown = -1
+        if rare_set:
+            # Infrequent levels share one trailing "other" column.
+            for c in rare_set:
+                lookup[str(c)] = offset
+            if encoder.handle_unknown == "infrequent_if_exist":
+                unknown = offset
+            offset += 1
+        positions.append(lookup)
+        unknown_positions.append(unknown)
+    return positions, unknown_positions
+
+
+def ordinal_codes(encoder: OrdinalEncoder) -> List[Dict[str, int]]:
+    """Map each level to the code the fitted encoder assigns it."""
+    # Asking the encoder keeps infrequent-level grouping identical to training.
+    width = max(len(categories) for categories in encoder.categories_)
+    frame = pd.DataFrame(
+        {
+            name: [str(c) for c in categories]
+            + [str(categories[0])] * (width - len(categories))
+            for name, categories in zip(encoder.feature_names_in_, encoder.categories_)
+        }
+    )
+    codes = encoder.transform(frame)
+    return [
+        {str(c): int(codes[k, j]) for k, c in enumerate(categories)}
+        for j, categories in enumerate(encoder.categories_)
+    ]
+
+
+def compile_inference_plan(
+    feature_columns: List[str],
+    numeric_fill: Dict[str, Any],
+    categorical_fill: Dict[str, Any],
+    preprocessors: List[Tuple[str, List[str], Any]],
+    output_columns: List[str],
+    categorical_encoder: Optional[Any] = None,
+) -> InferencePlan:
+    numeric_columns = [c for c in feature_columns if c in numeric_fill]
+    categorical_columns = [c for c in feature_columns if c in categorical_fill]
+    numeric_index = {col: j for j, col in enumerate(numeric_columns)}
+
+    scale = np.ones(len(numeric_columns))
+    offset = np.zeros(len(numeric_columns))
+    for _, cols, scaler in preprocessors:
+        step_scale, step_offset = _scaler_affine(scaler)
+        for k, col in enumerate(cols):
+            j = numeric_index.get(col)
+            if j is None:
+                continue
+            scale[j] *= step_scale[k]
+            offset[j] = offset[j] * step_scale[k] + step_offset[k]
+
+    if isinstance(categorical_encoder, OrdinalEncoder):
+        # Native encoding: numeric columns first, then one code per feature.
+        numeric_positions = np.arange(len(numeric_columns))
+        category_positions = ordinal_codes(categorical_encoder)
+        unknown_positions = [-1] * len(categorical_columns)
+    elif categorical_encoder is not None:
+        # Sparse encoding: numeric columns first, then the encoder's block.
+        numeric_positions = np.arange(len(numeric_columns))
+        category_positions, unknown_positions = encoder_positions(
+            categorical_encoder, len(numeric_columns)
+        )
+    else:
+        # get_dummies encoding: numeric columns keep their names and each
+        # level becomes "<column>_<level>". Unknown levels were dropped by
+        # the old reindex, i.e. encoded as all zeros.
+        output_index = {name: i for i, name in enumerate(output_columns)}
+        numeric_positions = np.array([output_index[c] for c in numeric_columns], dtype=np.intp)
+        category_positions = []
+        for col in categorical_columns:
+            prefix = f"{col}_"
+            category_positions.append(
+                {
+                    name[len(prefix):]: i
+                    for name, i in output_index.items()
+                    if name.startswith(prefix) and name not in numeric_index
+                }
+            )
+        unknown_positions = [-1] * len(categorical_columns)
+
+    return InferencePlan(
+        feature_columns=list(feature_columns),
+        n_outputs=len(output_columns),
+        numeric_columns=numeric_columns,
+        numeric_positions=np.asarray(numeric_positions, dtype=np.intp),
+        numeric_fill=np.array([float(numeric_fill[c]) for c in numeric_columns], dtype=np.float64),
+        numeric_scale=scale,
+        numeric_offset=offset,
+        categorical_columns=categorical_columns,
+        categorical_fill=[str(categorical_fill[c]) for c in categorical_columns],
+        category_positions=category_positions,
+        unknown_positions=unknown_positions,
+        sparse_output=isinstance(categorical_encoder, OneHotEncoder),
+        ordinal_output=isinstance(categorical_encoder, OrdinalEncoder),
+    )
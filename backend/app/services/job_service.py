@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Event, RLock
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.metrics import MetricFamily, gauge_family, registry
+from app.schemas.pipeline import (
+    JobStatus,
+    PipelineJobResponse,
+    PipelineRunRequest,
+    PipelineRunResponse,
+    StageProgress,
+    StageStatus,
+)
+from app.services import pipeline_service
+from app.services.pipeline_executor import PipelineQueueFullError
+from app.services.progress import PIPELINE_STAGES, PipelineCancelledError, ProgressReporter
+
+_ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+
+@dataclass
+class _Job:
+    job_id: str
+    request: PipelineRunRequest
+    created_at: datetime
+    status: JobStatus = JobStatus.queued
+    stages: Dict[str, StageProgress] = field(
+        default_factory=lambda: {name: StageProgress(name=name) for name in PIPELINE_STAGES}
+    )
+    current_stage: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[PipelineRunResponse] = None
+    error: Optional[str] = None
+    cancel_event: Event = field(default_factory=Event)
+    # Finished/skipped stage snapshots and intermediate (preview) results, in
+    # order, for event stream subscribers.
+    events: List[Union[StageProgress, PipelineRunResponse]] = field(default_factory=list)
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    listeners: Set[asyncio.Event] = field(default_factory=set)
+
+
+# WARNING: _jobs and every _Job in it are protected by _job_lock; job state is
+# updated from pipeline worker threads while the API reads it.
+_jobs: Dict[str, _Job] = {}
+_job_lock = RLock()
+# Strong references to running job tasks (the event loop only keeps weak ones).
+_job_tasks: Set[asyncio.Task] = set()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class _JobProgress(ProgressReporter):
+    """Records stage progress on a job and aborts the run once cancelled."""
+
+    def __init__(self, job: _Job) -> None:
+        self._job = job
+
+    def check_cancelled(self) -> None:
+        if self._job.cancel_event.is_set():
+            raise PipelineCancelledError()
+
+    def stage_started(self, stage: str) -> None:
+        with _job_lock:
+            job = self._job
+            if job.status == JobStatus.queued:
+                job.status = JobStatus.running
+                job.started_at = _now()
+            job.current_stage = stage
+            job.stages[stage].status = StageStatus.running
+
+    def stage_finished(self, stage: str, duration: float, details: Dict[str, Any]) -> None:
+        with _job_lock:
+            progress = self._job.stages[stage]
+            progress.status = StageStatus.done
+            progress.duration_ms = duration * 1000
+            progress.rows = details.get("rows")
+            progress.columns = details.get("columns")
+            progress.peak_memory_bytes = details.get("peak_memory_bytes")
+            _publish(self._job, progress)
+
+    def stage_skipped(self, stage: str) -> None:
+        with _job_lock:
+            progress = self._job.stages[stage]
+            progress.status = StageStatus.skipped
+            _publish(self._job, progress)
+
+    def stage_failed(self, stage: str, duration: float) -> None:
+        with _job_lock:
+            progress = self._job.stages[stage]
+            progress.status = StageStatus.failed
+            progress.duration_ms = duration * 1000
+            _publish(self._job, progress)
+
+
+def _publish(job: _Job, event: Union[StageProgress, PipelineRunResponse]) -> None:
+    with _job_lock:
+        job.events.append(event.model_copy())
+    _notify(job)
+
+
+def _publish_result(job: _Job, result: PipelineRunResponse) -> None:
+    """Expose an intermediate result (a preview round) while the job continues."""
+    with _job_lock:
+        job.result = result
+    _publish(job, result)
+
+
+def _notify(job: _Job) -> None:
+    """Wake event stream subscribers; safe to call from worker threads."""
+    with _job_lock:
+        listeners = list(job.listeners)
+    if job.loop is None or job.loop.is_closed():
+        return
+    for listener in listeners:
+        job.loop.call_soon_threadsafe(listener.set)
+
+
+async def submit_job(request: PipelineRunRequest) -> PipelineJobResponse:
+    with _job_lock:
+        _prune_finished_jobs()
+        active = sum(1 for job in _jobs.values() if job.status in _ACTIVE_STATUSES)
+        if active >= settings.JOB_MAX_ACTIVE:
+            raise PipelineQueueFullError("Too many training jobs in progress. Please retry shortly.")
+        job = _Job(
+            job_id=str(uuid4()),
+            request=request,
+            created_at=_now(),
+            loop=asyncio.get_running_loop(),
+        )
+        _jobs[job.job_id] = job
+
+    task = asyncio.create_task(_run_job(job))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return _to_response(job)
+
+
+async def _run_job(job: _Job) -> None:
+    progress = _JobProgress(job)
+    try:
+        # The job stays queued until an executor worker is free; the number
+        # of waiting jobs is bounded by JOB_MAX_ACTIVE at submission.
+        result = await pipeline_service.run_pipeline(job.request, progress, wait_for_worker=True)
+        # Refining previews retrain on growing samples; every round's stages
+        # are reported again and its result is published before the next.
+        for request in pipeline_service.preview_refinements(job.request, result):
+            _publish_result(job, result)
+            progress.check_cancelled()
+            result = await pipeline_service.run_pipeline(request, progress, wait_for_worker=True)
+    except PipelineCancelledError:
+        # A cancelled refinement keeps the last published preview.
+        with _job_lock:
+            published = job.result
+        _finish_job(job, JobStatus.cancelled, result=published)
+    except (ValueError, PipelineQueueFullError) as exc:
+        _finish_job(job, JobStatus.failed, error=str(exc))
+    except Exception as exc:  # pragma: no cover - defensive catch for unexpected issues
+        _finish_job(job, JobStatus.failed, error=f"Pipeline execution failed: {exc}")
+    else:
+        _finish_job(job, JobStatus.succeeded, result=result)
+
+
+def _finish_job(
+    job: _Job,
+    status: JobStatus,
+    result: Optional[PipelineRunResponse] = None,
+    error: Optional[str] = None,
+) -> None:
+    with _job_lock:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = _now()
+        job.current_stage = None
+        if status == JobStatus.succeeded:
+            # Stages not reported (e.g. served from the result cache) were skipped.
+            for progress in job.stages.values():
+                if progress.status == StageStatus.pending:
+                    progress.status = StageStatus.skipped
+                    job.events.append(progress.model_copy())
+    _notify(job)
+
+
+def get_job(job_id: str) -> PipelineJobResponse:
+    with _job_lock:
+        return _to_response(_get_job(job_id))
+
+
+def cancel_job(job_id: str) -> PipelineJobResponse:
+    """Request cancellation; the run stops before its next stage starts."""
+    with _job_lock:
+        job = _get_job(job_id)
+        if job.status in _ACTIVE_STATUSES:
+            job.cancel_event.set()
+        return _to_response(job)
+
+
+def stream_job_events(job_id: str) -> AsyncIterator[str]:
+    """
+    Server-sent events for a job: one ``stage`` event per finished, skipped
+    or failed stage and one ``result`` event per intermediate preview result
+    (replayed from the start for late subscribers), then a final ``end``
+    event carrying the full job state.
+    """
+    with _job_lock:
+        job = _get_job(job_id)
+    return _event_stream(job)
+
+
+async def _event_stream(job: _Job) -> AsyncIterator[str]:
+    wake = asyncio.Event()
+    with _job_lock:
+        job.listeners.add(wake)
+    try:
+        cursor = 0
+        while True:
+            with _job_lock:
+                wake.clear()
+                events = job.events[cursor:]
+                cursor += len(events)
+                finished = job.status not in _ACTIVE_STATUSES
+            for event in events:
+                name = "result" if isinstance(event, PipelineRunResponse) else "stage"
+                yield _format_event(name, event.model_dump_json())
+            if finished:
+                yield _format_event("end", _to_response(job).model_dump_json())
+                return
+            await wake.wait()
+    finally:
+        with _job_lock:
+            job.listeners.discard(wake)
+
+
+def _format_event(name: str, data: str) -> str:
+    return f"event: {name}\ndata: {data}\n\n"
+
+
+def _get_job(job_id: str) -> _Job:
+    job = _jobs.get(job_id)
+    if job is None:
+        raise ValueError("Job not found.")
+    return job
+
+
+def _prune_finished_jobs() -> None:
+    cutoff = _now() - timedelta(seconds=settings.JOB_RETENTION_SECONDS)
+    expired = [
+        job_id
+        for job_id, job in _jobs.items()
+        if job.finished_at is not None and job.finished_at < cutoff
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _collect_metrics() -> List[MetricFamily]:
+    with _job_lock:
+        counts = {status: 0 for status in JobStatus}
+        for job in _jobs.values():
+            counts[job.status] += 1
+    return [
+        gauge_family(
+            "pipeline_jobs",
+            "Retained training jobs by status.",
+            [({"status": status.value}, count) for status, count in counts.items()],
+        )
+    ]
+
+
+registry.register_collector(_collect_metrics)
+
+
+def _to_response(job: _Job) -> PipelineJobResponse:
+    with _job_lock:
+        return PipelineJobResponse(
+            job_id=job.job_id,
+            status=job.status,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            current_stage=job.current_stage,
+            stages=[progress.model_copy() for progress in job.stages.values()],
+            cancel_requested=job.cancel_event.is_set(),
+            result=job.result,
+            error=job.error,
+        )
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, StratifiedKFold
+
+from app.schemas.pipeline import (
+    ModelType,
+    ParamRange,
+    SearchCandidate,
+    SearchConfig,
+    SearchResult,
+    SearchStrategy,
+)
+
+# Hyperparameters users may tune per model. Anything else (n_jobs, solver,
+# random_state, ...) stays under the service's control.
+SEARCHABLE_PARAMS: Dict[ModelType, frozenset] = {
+    ModelType.logistic_regression: frozenset(
+        {"C", "penalty", "fit_intercept", "class_weight", "max_iter", "tol"}
+    ),
+    ModelType.decision_tree: frozenset(
+        {
+            "criterion",
+            "max_depth",
+            "min_samples_split",
+            "min_samples_leaf",
+            "max_features",
+            "max_leaf_nodes",
+            "ccp_alpha",
+            "class_weight",
+        }
+    ),
+    ModelType.random_forest: frozenset(
+        {
+            "n_estimators",
+            "criterion",
+            "max_depth",
+            "min_samples_split",
+            "min_samples_leaf",
+            "max_features",
+            "max_samples",
+            "bootstrap",
+            "class_weight",
+        }
+    ),
+    ModelType.hist_gradient_boosting: frozenset(
+        {
+            "learning_rate",
+            "max_iter",
+            "max_leaf_nodes",
+            "max_depth",
+            "min_samples_leaf",
+            "l2_regularization",
+            "max_features",
+            "class_weight",
+        }
+    ),
+    ModelType.sgd_classifier: frozenset(
+        {
+            "loss",
+            "penalty",
+            "alpha",
+            "l1_ratio",
+            "learning_rate",
+            "eta0",
+            "max_iter",
+            "tol",
+            "class_weight",
+        }
+    ),
+}
+
+
+# Inclusive ranges for parameters that scale a fit's time or memory, so one
+# request cannot tie up a worker (e.g. n_estimators=10**6). None, where a
+# model accepts it, keeps the estimator's own default behaviour.
+PARAM_BOUNDS: Dict[str, Tuple[float, float]] = {
+    "n_estimators": (1, 1000),
+    "max_depth": (1, 100),
+    "max_iter": (1, 10_000),
+    "max_leaf_nodes": (2, 10_000),
+}
+
+
+def expand_param_grid(
+    config: SearchConfig, model_type: ModelType, max_candidates: int
+) -> Dict[str, List[Any]]:
+    """Turn ranges into value lists and validate names and grid size."""
+    allowed = SEARCHABLE_PARAMS[model_type]
+    unknown = sorted(set(config.param_grid) - allowed)
+    if unknown:
+        raise ValueError(
+            f"Cannot tune {', '.join(unknown)} for {model_type.value}; "
+            f"searchable parameters: {', '.join(sorted(allowed))}."
+        )
+
+    grid: Dict[str, List[Any]] = {}
+    for name, values in config.param_grid.items():
+        grid[name] = _range_values(values) if isinstance(values, ParamRange) else list(values)
+        if not grid[name]:
+            raise ValueError(f"No values given for parameter '{name}'.")
+        if name in PARAM_BOUNDS:
+            _check_bounds(name, grid[name], *PARAM_BOUNDS[name])
+
+    n_candidates = math.prod(len(values) for values in grid.values())
+    if n_candidates > max_candidates:
+        raise ValueError(
+            f"The parameter grid has {n_candidates} candidates; at most {max_candidates} are allowed."
+        )
+    return grid
+
+
+def _check_bounds(name: str, values: List[Any], low: float, high: float) -> None:
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+            raise ValueError(
+                f"Values of '{name}' must be numbers between {low:g} and {high:g}; got {value!r}."
+            )
+
+
+def _range_values(spec: ParamRange) -> List[Any]:
+    if spec.log:
+        if spec.low <= 0 or spec.high <= 0:
+            raise ValueError("Log-spaced ranges need positive bounds.")
+        values = np.geomspace(spec.low, spec.high, spec.num)
+    else:
+        values = np.linspace(spec.low, spec.high, spec.num)
+    if spec.integer:
+        return sorted({int(round(value)) for value in values})
+    return [float(value) for value in values]
+
+
+def build_search(
+    estimator: BaseEstimator,
+    config: SearchConfig,
+    param_grid: Dict[str, List[Any]],
+    random_state: int,
+    n_jobs: int,
+) -> BaseEstimator:
+    """
+    Cross-validated search over ``param_grid`` that refits the best candidate.
+
+    Folds are stratified and shuffled with ``random_state`` so results are
+    reproducible; candidate fits run on ``n_jobs`` cores. Fits that raise
+    (e.g. an unsupported penalty) score NaN instead of aborting the search.
+    """
+    cv = StratifiedKFold(n_splits=config.cv, shuffle=True, random_state=random_state)
+    if config.strategy == SearchStrategy.halving:
+        return HalvingGridSearchCV(
+            estimator,
+            param_grid,
+            factor=config.factor,
+            cv=cv,
+            scoring="accuracy",
+            random_state=random_state,
+            n_jobs=n_jobs,
+            return_train_score=False,
+        )
+    return GridSearchCV(estimator, param_grid, cv=cv, scoring="accuracy", n_jobs=n_jobs)
+
+
+def summarize_search(
+    search: BaseEstimator, strategy: SearchStrategy, n_samples: int
+) -> SearchResult:
+    """
+    Best parameters plus each candidate's score from the last round it
+    reached; ``n_samples`` is the number of rows the search was fitted on.
+    """
+    results = search.cv_results_
+    iterations = results.get("iter", np.zeros(len(results["params"]), dtype=int))
+    resources = results.get("n_resources")
+    latest: Dict[str, int] = {}
+    for index, params in enumerate(results["params"]):
+        # Later halving rounds list surviving candidates again.
+        latest[json.dumps(params, sort_keys=True, default=str)] = index
+
+    candidates = [
+        SearchCandidate(
+            params=_plain(results["params"][index]),
+            mean_score=_score(results["mean_test_score"][index]),
+            std_score=_score(results["std_test_score"][index]),
+            rank=0,
+            n_samples=int(resources[index]) if resources is not None else n_samples,
+            iteration=int(iterations[index]),
+        )
+        for index in latest.values()
+    ]
+    # Candidates that reached later rounds rank ahead of those cut earlier.
+    candidates.sort(
+        key=lambda c: (-c.iteration, -(c.mean_score if c.mean_score is not None else -math.inf))
+    )
+    for rank, candidate in enumerate(candidates, start=1):
+        candidate.rank = rank
+
+    return SearchResult(
+        strategy=strategy,
+        best_params=_plain(search.best_params_),
+        best_score=float(search.best_score_),
+        n_candidates=len(candidates),
+        candidates=candidates,
+    )
+
+
+def _score(value: Any) -> Any:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _plain(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: value.item() if isinstance(value, np.generic) else value
+        for name, value in params.items()
+    }
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from uuid import uuid4
+
+import joblib
+
+from app.core.cache import BoundedCache
+
+# Model ids come from URLs and request bodies, so only accept ids that cannot
+# be used to escape the store directory.
+_VALID_MODEL_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def is_valid_model_id(model_id: object) -> bool:
+    return isinstance(model_id, str) and bool(_VALID_MODEL_ID.match(model_id))
+
+
+class ModelStore(ABC):
+    """
+    Mapping-like interface implemented by every model artifact backend.
+
+    Backends raise ``KeyError`` for unknown ids; ``pipeline_service`` turns
+    that into the user-facing "Model not found" error. ``save`` stores an
+    artifact together with a JSON-serializable metadata dict. Backends call
+    ``on_remove`` with the id of every model that leaves the store, whether
+    deleted or evicted by a limit, and ``on_evict`` with the id of every
+    artifact a memory limit or TTL drops (for the disk backend, from its
+    hot-model cache only).
+    """
+
+    on_remove: Optional[Callable[[str], None]] = None
+    on_evict: Optional[Callable[[str], None]] = None
+
+    def _removed(self, model_id: str) -> None:
+        if self.on_remove is not None:
+            self.on_remove(model_id)
+
+    def _evicted(self, model_id: str) -> None:
+        if self.on_evict is not None:
+            self.on_evict(model_id)
+
+    @abstractmethod
+    def save(self, model_id: str, artifact: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        ...
+
+    @abstractmethod
+    def metadata(self, model_id: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def __getitem__(self, model_id: str) -> Any:
+        ...
+
+    def __setitem__(self, model_id: str, artifact: Any) -> None:
+        self.save(model_id, artifact)
+
+    @abstractmethod
+    def __delitem__(self, model_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def __contains__(self, model_id: object) -> bool:
+        ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        ...
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def clear(self) -> None:
+        for model_id in list(self):
+            del self[model_id]
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Report occupancy; ``bytes`` counts artifacts resident in process memory."""
+
+
+class MemoryModelStore(ModelStore):
+    """
+    Keeps artifacts in process memory (lost on restart).
+
+    Optional limits evict the least recently used models once the store holds
+    more than ``max_entries`` artifacts or ``max_bytes`` (as measured by
+    ``sizeof``), or when a model has not been used for ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        on_remove: Optional[Callable[[str], None]] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self._sizeof = sizeof
+        self.on_remove = on_remove
+        self.on_evict = on_evict
+        self._entries: BoundedCache[str, Tuple[Any, Dict[str, Any]]] = BoundedCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=lambda entry: entry[1]["size_bytes"] or 0,
+            on_evict=self._drop_evicted,
+        )
+
+    def _drop_evicted(self, model_id: str, entry: Tuple[Any, Dict[str, Any]]) -> None:
+        # Evicted artifacts are gone for good in this backend.
+        self._evicted(model_id)
+        self._removed(model_id)
+
+    def save(self, model_id: str, artifact: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        nbytes = self._sizeof(artifact) if self._sizeof is not None else None
+        self._entries[model_id] = (artifact, {**(metadata or {}), "size_bytes": nbytes})
+
+    def metadata(self, model_id: str) -> Dict[str, Any]:
+        return dict(self._entries[model_id][1])
+
+    def __getitem__(self, model_id: str) -> Any:
+        return self._entries[model_id][0]
+
+    def __delitem__(self, model_id: str) -> None:
+        del self._entries[model_id]
+        self._removed(model_id)
+
+    def __contains__(self, model_id: object) -> bool:
+        return model_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        model_ids = list(self._entries)
+        self._entries.clear()
+        for model_id in model_ids:
+            self._removed(model_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._entries.stats()}
+
+
+class DiskModelStore(ModelStore):
+    """
+    Persists each artifact under ``directory`` as ``<id>.joblib`` plus a
+    ``<id>.json`` metadata sidecar.
+
+    Nothing is read at startup; artifacts are loaded on first use and kept in
+    a small LRU of hot models bounded by ``cache_size``, ``max_bytes`` (file
+    size) and ``ttl_seconds``. Files are written uncompressed and loaded with
+    ``mmap_mode="r"``, so large NumPy arrays (tree node tables, coefficient
+    matrices) are memory-mapped read-only instead of copied, and their pages
+    are shared by every worker serving the same model.
+    """
+
+    suffix = ".joblib"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        cache_size: int = 16,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        on_remove: Optional[Callable[[str], None]] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.on_remove = on_remove
+        self.on_evict = on_evict
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._cache_size = max(cache_size, 0)
+        self._cache: BoundedCache[str, Tuple[Any, int]] = BoundedCache(
+            max_entries=self._cache_size,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=lambda entry: entry[1],
+            on_evict=lambda model_id, _: self._evicted(model_id),
+        )
+
+    def _path(self, model_id: str, suffix: Optional[str] = None) -> Path:
+        if not is_valid_model_id(model_id):
+            raise KeyError(model_id)
+        return self.directory / f"{model_id}{suffix or self.suffix}"
+
+    def _remember(self, model_id: str, artifact: Any, nbytes: int) -> None:
+        if self._cache_size > 0:
+            self._cache[model_id] = (artifact, nbytes)
+
+    def _write_atomic(self, path: Path, write: Callable[[Path], None]) -> None:
+        # Other workers must never observe a partially written file.
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def save(self, model_id: str, artifact: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        path = self._path(model_id)
+        self._write_atomic(path, lambda tmp: joblib.dump(artifact, tmp))
+        nbytes = path.stat().st_size
+        document = {**(metadata or {}), "size_bytes": nbytes}
+        self._write_atomic(
+            self._path(model_id, ".json"),
+            lambda tmp: tmp.write_text(json.dumps(document, default=str)),
+        )
+        self._remember(model_id, artifact, nbytes)
+
+    def metadata(self, model_id: str) -> Dict[str, Any]:
+        try:
+            return json.loads(self._path(model_id, ".json").read_text())
+        except FileNotFoundError:
+            raise KeyError(model_id) from None
+
+    def __getitem__(self, model_id: str) -> Any:
+        cached = self._cache.get(model_id)
+        if cached is not None:
+            return cached[0]
+
+        path = self._path(model_id)
+        try:
+            artifact = joblib.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            raise KeyError(model_id) from None
+        self._remember(model_id, artifact, path.stat().st_size)
+        return artifact
+
+    def __delitem__(self, model_id: str) -> None:
+        self._cache.pop(model_id)
+        try:
+            self._path(model_id).unlink()
+        except FileNotFoundError:
+            raise KeyError(model_id) from None
+        self._path(model_id, ".json").unlink(missing_ok=True)
+        self._removed(model_id)
+
+    def __contains__(self, model_id: object) -> bool:
+        if model_id in self._cache:
+            return True
+        try:
+            return self._path(model_id).exists()  # type: ignore[arg-type]
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([path.stem for path in self.directory.glob(f"*{self.suffix}")])
+
+    def stats(self) -> Dict[str, Any]:
+        files = list(self.directory.glob(f"*{self.suffix}"))
+        cache_stats = self._cache.stats()
+        return {
+            "backend": "disk",
+            **cache_stats,
+            "entries": len(files),
+            "resident_entries": cache_stats["entries"],
+            "disk_bytes": sum(path.stat().st_size for path in files),
+        }
+
+
+def create_model_store(
+    backend: str,
+    directory: str,
+    cache_size: int,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+    sizeof: Optional[Callable[[Any], int]] = None,
+    on_remove: Optional[Callable[[str], None]] = None,
+    on_evict: Optional[Callable[[str], None]] = None,
+) -> ModelStore:
+    if backend == "memory":
+        return MemoryModelStore(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=sizeof,
+            on_remove=on_remove,
+            on_evict=on_evict,
+        )
+    if backend == "disk":
+        return DiskModelStore(
+            directory,
+            cache_size=cache_size,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            on_remove=on_remove,
+            on_evict=on_evict,
+        )
+    raise ValueError(f"Unsupported model store backend: {backend}")
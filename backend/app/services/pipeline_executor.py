@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+REJECTED = registry.counter(
+    "pipeline_executor_rejected_total",
+    "Pipeline runs rejected because the executor queue was full.",
+    labelnames=("backend",),
+)
+
+
+class PipelineQueueFullError(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class PipelineExecutor:
+    """
+    Runs blocking pipeline work on a dedicated, bounded backend.
+
+    ``thread`` uses a private thread pool (so training never starves the
+    default pool used by predictions), ``process`` a spawn-based process pool
+    that takes training off the event loop's GIL entirely, and ``inline``
+    runs the function on the calling thread (debugging only). At most
+    ``max_concurrency`` jobs run at once and at most ``queue_size`` more may
+    wait; further submissions fail fast with ``PipelineQueueFullError``.
+    Submissions with ``wait=True`` (background jobs, which have their own
+    bounded queue) instead wait for a free worker without taking a queue slot.
+    """
+
+    def __init__(self, backend: str, max_concurrency: Optional[int], queue_size: int) -> None:
+        if backend not in ("thread", "process", "inline"):
+            raise ValueError(f"Unsupported pipeline executor backend: {backend}")
+        self.backend = backend
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self._pool: Optional[Executor] = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.backend == "process"
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.backend == "process":
+                    # spawn avoids forking a process that already runs threads.
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="pipeline"
+                    )
+            return self._pool
+
+    def _acquire_slot(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_concurrency + self.queue_size:
+                self._rejected += 1
+                REJECTED.inc(1, self.backend)
+                raise PipelineQueueFullError(
+                    "Too many pipeline runs in progress. Please retry shortly."
+                )
+            self._in_flight += 1
+
+    async def _wait_for_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_concurrency:
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            # Every waiter re-checks for a free worker, so one that was
+            # cancelled meanwhile cannot swallow the wake-up.
+            waiters = list(self._waiters)
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        if wait:
+            await self._wait_for_worker()
+        else:
+            self._acquire_slot()
+        try:
+            if self.backend == "inline":
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "max_concurrency": self.max_concurrency,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - self.max_concurrency, 0),
+                "rejected": self._rejected,
+                "waiting": len(self._waiters),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool; a new one is created on the next submission."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def create_pipeline_executor(
+    backend: str,
+    max_concurrency: Optional[int],
+    queue_size: int,
+    dataset_store_backend: str,
+) -> PipelineExecutor:
+    if backend == "process" and dataset_store_backend == "memory":
+        # Worker processes receive only the dataset id and load the data from
+        # the shared store; an in-process store is invisible to them.
+        logger.warning(
+            "PIPELINE_EXECUTOR=process requires a shared dataset store "
+            "(DATASET_STORE_BACKEND=arrow); falling back to threads."
+        )
+        backend = "thread"
+    return PipelineExecutor(backend, max_concurrency, queue_size)
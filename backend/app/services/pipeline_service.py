@@ -1,31 +1,69 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import math
+import os
 import pickle
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
 from threading import RLock
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.inspection import permutation_importance
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler, MinMaxScaler
+from sklearn.preprocessing import (
+    LabelEncoder,
+    MinMaxScaler,
+    OneHotEncoder,
+    OrdinalEncoder,
+    StandardScaler,
+)
 from sklearn.tree import DecisionTreeClassifier
+from threadpoolctl import threadpool_limits
 
 from app.schemas.pipeline import (
+    CategoricalEncoding,
+    MemoryMode,
+    PipelineDiagnostics,
     PipelineRunRequest,
     PipelineRunResponse,
     PredictResponse,
+    PreviewResult,
+    SearchResult,
     ConfusionMatrix,
     FeatureImportance,
     ModelType,
     PreprocessType,
     PreprocessStep,
 )
-from app.services import dataset_service
+from app.core.cache import BoundedCache
+from app.schemas.dataset import ColumnProfile
+from app.core.config import settings
+from app.core.metrics import MetricFamily, gauge_family, registry
+from app.services import dataset_service, incremental_training, model_search
+from app.services.inference_plan import (
+    InferencePlan,
+    compile_inference_plan,
+    encoder_positions,
+    ordinal_codes,
+)
+from app.services.model_store import ModelStore, create_model_store, is_valid_model_id
+from app.services.pipeline_executor import create_pipeline_executor
+from app.services.predict_batcher import MicroBatcher
+from app.services.progress import NULL_PROGRESS, PIPELINE_STAGES, ProgressReporter, traced_memory
 
 
 @dataclass
@@ -39,42 +77,549 @@ class TrainedModelArtifact:
     label_encoder: Optional[LabelEncoder]
     model_type: ModelType
     target_labels: List[Any]
+    # Set when the model was trained on the sparse encoding (OneHotEncoder;
+    # ``ohe_columns`` then holds its output feature names) or the native one
+    # (OrdinalEncoder; one code column per categorical feature).
+    categorical_encoder: Optional[Any] = None
+    inference_plan: Optional[InferencePlan] = None
+
+
+CACHE_EVICTIONS = registry.counter(
+    "pipeline_cache_evictions_total",
+    "Entries evicted from pipeline caches and the model store.",
+    labelnames=("cache",),
+)
+
 
+def _artifact_nbytes(artifact: TrainedModelArtifact) -> int:
+    return len(pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL))
 
-_model_store: Dict[str, TrainedModelArtifact] = {}
+
+# WARNING: _model_store is protected by _model_lock.
+_model_store: ModelStore = create_model_store(
+    settings.MODEL_STORE_BACKEND,
+    settings.MODEL_STORE_DIR,
+    settings.MODEL_CACHE_MAX_ENTRIES,
+    max_entries=settings.MODEL_STORE_MAX_ENTRIES,
+    max_bytes=settings.MODEL_STORE_MAX_BYTES,
+    ttl_seconds=settings.MODEL_STORE_TTL_SECONDS,
+    sizeof=_artifact_nbytes,
+    on_remove=lambda model_id: _remove_download(model_id),
+    on_evict=lambda model_id: CACHE_EVICTIONS.inc(1, "model_store"),
+)
 _model_lock = RLock()
 
+_pipeline_executor = create_pipeline_executor(
+    settings.PIPELINE_EXECUTOR,
+    settings.PIPELINE_MAX_CONCURRENCY,
+    settings.PIPELINE_QUEUE_SIZE,
+    settings.DATASET_STORE_BACKEND,
+)
+
+# Completed runs keyed by dataset fingerprint + canonical request. Training is
+# deterministic for a given random_state, so an identical request can reuse
+# the stored response (and model) instead of retraining.
+_result_cache: BoundedCache[str, PipelineRunResponse] = BoundedCache(
+    max_entries=settings.PIPELINE_RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PIPELINE_RESULT_CACHE_TTL_SECONDS,
+    on_evict=lambda key, response: CACHE_EVICTIONS.inc(1, "result_cache"),
+)
+
+
+async def run_pipeline(
+    request: PipelineRunRequest,
+    progress: ProgressReporter = NULL_PROGRESS,
+    wait_for_worker: bool = False,
+) -> PipelineRunResponse:
+    # Offload the blocking CPU-bound pipeline execution to the configured
+    # executor backend (thread pool, process pool or inline). Background jobs
+    # wait for a free worker instead of failing on a full queue.
+    if not _pipeline_executor.uses_processes:
+        return await _pipeline_executor.submit(
+            _run_pipeline_sync, request, progress, wait=wait_for_worker
+        )
+
+    # Worker processes only receive the request (i.e. the dataset id) and
+    # load the data from the shared store; caching and the model store stay
+    # in this process. Stages running in the worker are not reported.
+    cache_key, cached = await asyncio.to_thread(_lookup_cached_result, request)
+    if cached is not None:
+        return cached
+    progress.check_cancelled()
+    response, artifact = await _pipeline_executor.submit(
+        _execute_pipeline, request, wait=wait_for_worker
+    )
+    return await asyncio.to_thread(_save_run, request, cache_key, response, artifact, progress)
+
+
+def _run_pipeline_sync(
+    request: PipelineRunRequest, progress: ProgressReporter = NULL_PROGRESS
+) -> PipelineRunResponse:
+    cache_key, cached = _lookup_cached_result(request)
+    if cached is not None:
+        return cached
+
+    response, artifact = _execute_pipeline(request, progress)
+    return _save_run(request, cache_key, response, artifact, progress)
+
+
+def _save_run(
+    request: PipelineRunRequest,
+    cache_key: Optional[str],
+    response: PipelineRunResponse,
+    artifact: Optional[TrainedModelArtifact],
+    progress: ProgressReporter,
+) -> PipelineRunResponse:
+    if artifact is None:
+        return _complete_run(request, cache_key, response, artifact)
+    # 10. Save Artifact
+    with progress.stage("save"):
+        return _complete_run(request, cache_key, response, artifact)
+
+
+def _lookup_cached_result(
+    request: PipelineRunRequest,
+) -> Tuple[Optional[str], Optional[PipelineRunResponse]]:
+    if request.memory_mode == MemoryMode.out_of_core:
+        # The cache key hashes the whole dataset, which streamed runs never load.
+        return None, None
+    fingerprint = dataset_service.stored_fingerprint(request.dataset_id)
+    if not settings.PIPELINE_RESULT_CACHE_ENABLED:
+        return None, None
+    cache_key = _result_cache_key(request, fingerprint)
+    return cache_key, _get_cached_result(cache_key)
+
+
+def _complete_run(
+    request: PipelineRunRequest,
+    cache_key: Optional[str],
+    response: PipelineRunResponse,
+    artifact: Optional[TrainedModelArtifact],
+) -> PipelineRunResponse:
+    if artifact is not None:
+        model_id = _save_model(artifact, _model_metadata(request, response))
+        response.model_id = model_id
+        response.model_download_path = f"/api/pipeline/model/{model_id}/download"
+    if cache_key is not None:
+        _result_cache[cache_key] = response.model_copy(deep=True)
+    return response
+
+
+def _result_cache_key(request: PipelineRunRequest, fingerprint: str) -> str:
+    # dataset_id is replaced by the content fingerprint so re-uploads of the
+    # same file share entries and a reused id never serves stale results.
+    payload = {
+        "dataset": fingerprint,
+        "request": request.model_dump(mode="json", exclude={"dataset_id"}),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _get_cached_result(cache_key: str) -> Optional[PipelineRunResponse]:
+    cached = _result_cache.get(cache_key)
+    if cached is None:
+        return None
+    if cached.model_id is not None and not _has_model(cached.model_id):
+        # The model was evicted since; retrain so the response stays usable.
+        _result_cache.pop(cache_key)
+        return None
+    return cached.model_copy(deep=True)
+
+
+@dataclass
+class PreparedFeatures:
+    """Output of pipeline steps 1-6; treated as read-only once cached."""
+
+    df_features: Any  # DataFrame (dense encoding) or CSR matrix (sparse encoding)
+    target: Any
+    feature_columns: List[str]
+    numeric_fill: Dict[str, Any]
+    categorical_fill: Dict[str, Any]
+    preprocessors: List[Tuple[str, List[str], Any]]
+    ohe_columns: List[str]
+    label_encoder: Optional[LabelEncoder]
+    target_labels: List[Any]
+    warnings: List[str]
+    should_stop: bool
+    categorical_encoder: Optional[Any] = None
+
 
-async def run_pipeline(request: PipelineRunRequest) -> PipelineRunResponse:
-    # Offload the blocking CPU-bound pipeline execution to a separate thread
-    return await asyncio.to_thread(_run_pipeline_sync, request)
+def _matrix_nbytes(matrix: Any) -> int:
+    if sparse.issparse(matrix):
+        return int(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes)
+    if isinstance(matrix, np.ndarray):
+        return int(matrix.nbytes)
+    return int(matrix.memory_usage(index=True, deep=True).sum())
 
 
-def _run_pipeline_sync(request: PipelineRunRequest) -> PipelineRunResponse:
-    df = dataset_service.get_dataset(request.dataset_id)
+def _prepared_nbytes(prepared: PreparedFeatures) -> int:
+    return _matrix_nbytes(prepared.df_features) + int(np.asarray(prepared.target).nbytes)
+
+
+# Preprocessed design matrices keyed by dataset fingerprint + the request
+# fields that affect steps 1-6, so runs that only change the model or split
+# skip straight to training.
+_preprocess_cache: BoundedCache[str, PreparedFeatures] = BoundedCache(
+    max_entries=settings.PREPROCESS_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PREPROCESS_CACHE_MAX_BYTES,
+    sizeof=_prepared_nbytes,
+    on_evict=lambda key, prepared: CACHE_EVICTIONS.inc(1, "preprocess_cache"),
+)
+
+
+def _preprocess_cache_key(request: PipelineRunRequest, fingerprint: str) -> str:
+    payload = {
+        "dataset": fingerprint,
+        "request": request.model_dump(
+            mode="json",
+            include={
+                "target_column",
+                "feature_columns",
+                "preprocess",
+                "drop_rare_classes",
+                "categorical_encoding",
+                "max_categories",
+            },
+        ),
+        "encoding": _effective_encoding(request).value,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+_FEATURE_STAGES = PIPELINE_STAGES[:6]
+
+# Histogram gradient boosting bins each categorical feature into at most
+# 255 categories.
+_NATIVE_MAX_CATEGORIES = 255
+
+
+def _prepare_features(
+    request: PipelineRunRequest, progress: ProgressReporter = NULL_PROGRESS
+) -> PreparedFeatures:
+    if not settings.PREPROCESS_CACHE_ENABLED:
+        return _compute_features(request, progress)
+
+    cache_key = _preprocess_cache_key(
+        request, dataset_service.stored_fingerprint(request.dataset_id)
+    )
+    prepared = _preprocess_cache.get(cache_key)
+    if prepared is None:
+        prepared = _compute_features(request, progress)
+        _preprocess_cache[cache_key] = prepared
+    else:
+        progress.check_cancelled()
+        for stage in _FEATURE_STAGES:
+            progress.stage_skipped(stage)
+    return prepared
+
+
+def _compute_features(
+    request: PipelineRunRequest, progress: ProgressReporter = NULL_PROGRESS
+) -> PreparedFeatures:
     warnings: List[str] = []
 
     # 1. Prepare Data
-    df_features, target, feature_cols = _prepare_data(request)
+    with progress.stage("prepare") as stage:
+        df_features, target, feature_cols = _prepare_data(request)
+        _record_shape(stage, df_features)
 
     # 2. Impute Missing Values
-    numeric_fill, categorical_fill = _impute_values(df_features, target, warnings)
+    with progress.stage("impute") as stage:
+        # Fill values and dtypes come from the profile computed at upload.
+        profile = dataset_service.stored_profile(request.dataset_id)
+        column_stats = {column.name: column for column in profile.columns}
+        numeric_fill, categorical_fill, target = _impute_values(
+            df_features, target, column_stats, warnings
+        )
+        _record_shape(stage, df_features)
 
     # 3. Apply Feature Scaling
-    numeric_cols = [c for c in df_features.columns if pd.api.types.is_numeric_dtype(df_features[c])]
-    preprocessors = _scale_features(df_features, request.preprocess, numeric_cols, warnings)
+    with progress.stage("scale") as stage:
+        numeric_cols = [c for c in df_features.columns if column_stats[str(c)].is_numeric]
+        preprocessors = _scale_features(df_features, request.preprocess, numeric_cols, warnings)
+        _record_shape(stage, df_features)
 
     # 4. Process Categorical Features (One-Hot Encoding)
-    df_features, ohe_columns = _process_categorical(df_features)
+    with progress.stage("encode") as stage:
+        df_features, ohe_columns, categorical_encoder = _process_categorical(
+            df_features, _effective_encoding(request), request.max_categories
+        )
+        _record_shape(stage, df_features)
 
     # 5. Encode Target Variable
-    target, label_encoder = _encode_target(target)
+    with progress.stage("encode_target") as stage:
+        target, label_encoder = _encode_target(target)
+        _record_shape(stage, target)
 
     # 6. Handle Rare Classes
-    df_features, target, should_stop = _filter_rare_classes(
-        df_features, target, request.drop_rare_classes, warnings
+    with progress.stage("filter_rare") as stage:
+        df_features, target, should_stop = _filter_rare_classes(
+            df_features,
+            target,
+            request.drop_rare_classes,
+            warnings,
+            class_counts=column_stats[str(request.target_column)].class_counts,
+        )
+        _record_shape(stage, df_features)
+
+    labels = label_encoder.classes_.tolist() if label_encoder else sorted(list(set(target)))
+
+    return PreparedFeatures(
+        df_features=df_features,
+        target=target,
+        feature_columns=feature_cols,
+        numeric_fill=numeric_fill,
+        categorical_fill=categorical_fill,
+        preprocessors=preprocessors,
+        ohe_columns=ohe_columns,
+        label_encoder=label_encoder,
+        target_labels=labels,
+        warnings=warnings,
+        should_stop=should_stop,
+        categorical_encoder=categorical_encoder,
+    )
+
+
+def _prepare_lean(
+    request: PipelineRunRequest, progress: ProgressReporter
+) -> Tuple[PreparedFeatures, Optional[Tuple[Any, Any, Any, Any]]]:
+    """
+    Memory-lean variant of steps 1-7 (``memory_mode="lean"``).
+
+    The stored frame is only read: fill values come from the profile, the
+    target is encoded and filtered on its own, and the train/test split is
+    computed on row positions. The design matrix is then allocated once,
+    with rows in train-then-test order, filled column by column (numeric
+    values, then one-hot levels in ``pd.get_dummies`` order) and scaled in
+    place, so the split is two row views of it. The result matches the
+    standard pipeline; it is not added to the preprocess cache because the
+    row order depends on the split.
+    """
+    warnings: List[str] = []
+
+    # 1. Prepare Data (projected columns, no copies)
+    with progress.stage("prepare") as stage:
+        df, feature_cols = _load_columns(request)
+        stage["rows"], stage["columns"] = len(df), len(feature_cols)
+
+    # 2. Impute Missing Values (fill values only; features are filled when
+    # the matrix is built)
+    with progress.stage("impute") as stage:
+        profile = dataset_service.stored_profile(request.dataset_id)
+        column_stats = {column.name: column for column in profile.columns}
+        numeric_fill, categorical_fill = _fill_values(feature_cols, column_stats)
+        target = _impute_target(df[request.target_column], column_stats, warnings)
+        _record_shape(stage, target)
+
+    # 5. Encode Target Variable
+    with progress.stage("encode_target") as stage:
+        target, label_encoder = _encode_target(target)
+        _record_shape(stage, target)
+
+    # 6. Handle Rare Classes (on row positions)
+    with progress.stage("filter_rare") as stage:
+        rows, target, should_stop = _filter_rare_classes(
+            np.arange(len(df)),
+            np.asarray(target),
+            request.drop_rare_classes,
+            warnings,
+            class_counts=column_stats[str(request.target_column)].class_counts,
+        )
+        _record_shape(stage, rows)
+
+    labels = label_encoder.classes_.tolist() if label_encoder else sorted(list(set(target)))
+    prepared = PreparedFeatures(
+        df_features=None,
+        target=target,
+        feature_columns=feature_cols,
+        numeric_fill=numeric_fill,
+        categorical_fill=categorical_fill,
+        preprocessors=[],
+        ohe_columns=[],
+        label_encoder=label_encoder,
+        target_labels=labels,
+        warnings=warnings,
+        should_stop=should_stop,
     )
     if should_stop:
+        return prepared, None
+
+    # 7. Split Data (row positions only)
+    with progress.stage("split") as stage:
+        rows_train, rows_test, y_train, y_test = train_test_split(
+            rows,
+            target,
+            test_size=request.split.test_size,
+            random_state=request.split.random_state,
+            stratify=target if len(np.unique(target)) > 1 else None,
+        )
+        _record_shape(stage, rows_train)
+
+    # 4. Build the one-hot design matrix in train-then-test row order
+    with progress.stage("encode") as stage:
+        numeric_cols = [c for c in feature_cols if column_stats[str(c)].is_numeric]
+        matrix, ohe_columns = _lean_design_matrix(
+            df,
+            feature_cols,
+            numeric_cols,
+            np.concatenate([rows_train, rows_test]),
+            numeric_fill,
+            categorical_fill,
+        )
+        _record_shape(stage, matrix)
+
+    # 3. Apply Feature Scaling (in place on the numeric block)
+    with progress.stage("scale") as stage:
+        preprocessors = _scale_in_place(matrix, request.preprocess, numeric_cols, warnings)
+        _record_shape(stage, matrix)
+
+    prepared.df_features = matrix
+    prepared.preprocessors = preprocessors
+    prepared.ohe_columns = ohe_columns
+    n_train = len(rows_train)
+    return prepared, (matrix[:n_train], matrix[n_train:], y_train, y_test)
+
+
+def _lean_design_matrix(
+    df: pd.DataFrame,
+    feature_cols: List[str],
+    numeric_cols: List[str],
+    order: np.ndarray,
+    numeric_fill: Dict[str, Any],
+    categorical_fill: Dict[str, Any],
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Dense float64 matrix of ``df.iloc[order]`` as ``pd.get_dummies`` would lay
+    it out: numeric columns first, then one column per level of each
+    categorical column. Only one source column is gathered at a time.
+    """
+    categorical_cols = [c for c in feature_cols if c not in set(numeric_cols)]
+    levels: List[Tuple[Any, pd.Categorical]] = []
+    for col in categorical_cols:
+        values = df[col].array
+        # Object columns get sorted levels, category columns keep their own
+        # (including unused ones), exactly like get_dummies.
+        categorical = values if isinstance(values, pd.Categorical) else pd.Categorical(values)
+        levels.append((col, categorical))
+
+    n_outputs = len(numeric_cols) + sum(len(cat.categories) for _, cat in levels)
+    matrix = np.zeros((len(order), n_outputs), dtype=np.float64)
+    ohe_columns = list(numeric_cols)
+
+    for j, col in enumerate(numeric_cols):
+        column = matrix[:, j]
+        column[:] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+        np.copyto(column, numeric_fill[col], where=np.isnan(column))
+
+    offset = len(numeric_cols)
+    all_rows = np.arange(len(order))
+    for col, categorical in levels:
+        codes = categorical.codes[order].astype(np.intp)
+        if (codes < 0).any():
+            codes = np.where(codes < 0, categorical.categories.get_loc(categorical_fill[col]), codes)
+        matrix[all_rows, offset + codes] = 1.0
+        ohe_columns.extend(f"{col}_{level}" for level in categorical.categories)
+        offset += len(categorical.categories)
+    return matrix, ohe_columns
+
+
+def _scale_in_place(
+    matrix: np.ndarray,
+    preprocess_steps: List[PreprocessStep],
+    numeric_cols: List[str],
+    warnings: List[str],
+) -> List[Tuple[str, List[str], Any]]:
+    """Fit each scaler on (and apply it to) the numeric columns of ``matrix``."""
+    positions = {col: j for j, col in enumerate(numeric_cols)}
+    preprocessors: List[Tuple[str, List[str], Any]] = []
+    for step in preprocess_steps:
+        cols_to_scale = _columns_to_scale(step, numeric_cols, warnings)
+        if not cols_to_scale:
+            continue
+
+        scaler = (
+            StandardScaler(copy=False) if step.step == PreprocessType.standardize else MinMaxScaler(copy=False)
+        )
+        indices = [positions[col] for col in cols_to_scale]
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            # Contiguous columns: scale the slice view in place.
+            block = matrix[:, indices[0] : indices[0] + len(indices)]
+            scaled = scaler.fit_transform(block)
+            if not np.shares_memory(scaled, block):
+                block[...] = scaled
+        else:
+            matrix[:, indices] = scaler.fit_transform(matrix[:, indices])
+        # Stored scalers must not modify their input when reused later.
+        scaler.set_params(copy=True)
+        preprocessors.append((step.step.value, cols_to_scale, scaler))
+    return preprocessors
+
+
+def _record_shape(details: Dict[str, Any], data: Any) -> None:
+    """Store the rows/columns a stage produced in its progress details."""
+    shape = np.shape(data)
+    details["rows"] = int(shape[0])
+    details["columns"] = int(shape[1]) if len(shape) > 1 else 1
+
+
+def _execute_pipeline(
+    request: PipelineRunRequest, progress: ProgressReporter = NULL_PROGRESS
+) -> Tuple[PipelineRunResponse, Optional[TrainedModelArtifact]]:
+    """Train and evaluate without touching the model store or result cache."""
+    if not request.collect_diagnostics:
+        return _train_and_evaluate(request, progress)
+
+    input_bytes = _input_nbytes(request)
+    with traced_memory() as trace:
+        response, artifact = _train_and_evaluate(request, progress)
+    response.diagnostics = PipelineDiagnostics(
+        memory_mode=request.memory_mode,
+        input_bytes=input_bytes,
+        peak_memory_bytes=trace.peak_bytes if trace is not None else None,
+        peak_to_input_ratio=(
+            trace.peak_bytes / input_bytes if trace is not None and input_bytes else None
+        ),
+    )
+    return response, artifact
+
+
+def _input_nbytes(request: PipelineRunRequest) -> int:
+    if request.memory_mode == MemoryMode.out_of_core:
+        return sum(
+            int(chunk.memory_usage(index=False, deep=True).sum())
+            for chunk in _stream_chunks(request)
+        )
+    column_nbytes = dataset_service.stored_column_nbytes(request.dataset_id)
+    columns = request.feature_columns or list(column_nbytes)
+    needed = dict.fromkeys([*columns, request.target_column])
+    return sum(column_nbytes.get(str(col), 0) for col in needed)
+
+
+def _train_and_evaluate(
+    request: PipelineRunRequest, progress: ProgressReporter
+) -> Tuple[PipelineRunResponse, Optional[TrainedModelArtifact]]:
+    if request.memory_mode == MemoryMode.out_of_core:
+        return _train_out_of_core(request, progress)
+
+    # Reject invalid search grids before any data is prepared.
+    param_grid = (
+        model_search.expand_param_grid(request.search, request.model, settings.SEARCH_MAX_CANDIDATES)
+        if request.search
+        else None
+    )
+    lean = request.memory_mode == MemoryMode.lean
+    if lean and _effective_encoding(request) == CategoricalEncoding.dense:
+        # Steps 1-7 on one in-place matrix; encode and scale run after the split.
+        prepared, split = _prepare_lean(request, progress)
+    else:
+        # Steps 1-6 (prepare, impute, scale, encode, rare-class handling)
+        prepared, split = _prepare_features(request, progress), None
+    warnings = list(prepared.warnings)
+    if lean and split is None and not prepared.should_stop:
+        warnings.append("Lean memory mode only applies to the dense encoding; ran the standard pipeline.")
+    if prepared.should_stop:
         return PipelineRunResponse(
             status="success",
             accuracy=None,
@@ -82,45 +627,93 @@ def _run_pipeline_sync(request: PipelineRunRequest) -> PipelineRunResponse:
             confusion_matrix=None,
             feature_importances=None,
             warnings=warnings,
+        ), None
+
+    if split is None:
+        # 7. Split Data
+        with progress.stage("split") as stage:
+            df_features = prepared.df_features
+            # Models are fitted on plain arrays so the compiled inference plan
+            # can feed them NumPy input directly at prediction time.
+            if isinstance(df_features, pd.DataFrame):
+                df_features = df_features.to_numpy(dtype=np.float64)
+            target = prepared.target
+            split = train_test_split(
+                df_features,
+                target,
+                test_size=request.split.test_size,
+                random_state=request.split.random_state,
+                stratify=target if len(np.unique(target)) > 1 else None,
+            )
+            _record_shape(stage, split[0])
+    X_train, X_test, y_train, y_test = split
+    training_rows, full_test_rows = len(y_train), len(y_test)
+    if request.preview is not None and request.preview.sample_fraction != 1.0:
+        # Enough held-out rows for a tight interval, without scoring them all.
+        test_rows = _stratified_sample(
+            y_test, settings.PREVIEW_MAX_TEST_ROWS, request.split.random_state
         )
-
-    # 7. Split Data
-    X_train, X_test, y_train, y_test = train_test_split(
-        df_features,
-        target,
-        test_size=request.split.test_size,
-        random_state=request.split.random_state,
-        stratify=target if len(np.unique(target)) > 1 else None,
-    )
+        X_test, y_test = X_test[test_rows], np.asarray(y_test)[test_rows]
 
     # 8. Build and Train Model
-    model = _build_model(request.model)
-    model.fit(X_train, y_train)
+    with progress.stage("fit") as stage, _thread_limit():
+        model = _build_model(request.model)
+        if isinstance(prepared.categorical_encoder, OrdinalEncoder):
+            model.set_params(
+                categorical_features=[c in prepared.categorical_fill for c in prepared.ohe_columns]
+            )
+        if request.preview is not None:
+            fits = 1
+            if param_grid is not None:
+                fits = math.prod(len(v) for v in param_grid.values()) * request.search.cv
+            sample = _preview_sample(request, model, X_train, y_train, fits)
+            X_train, y_train = X_train[sample], np.asarray(y_train)[sample]
+        search_result = None
+        if param_grid is not None:
+            model, search_result = _search_model(request, model, param_grid, X_train, y_train)
+        else:
+            model.fit(X_train, y_train)
+        _record_shape(stage, X_train)
 
     # 9. Evaluate Model
-    y_pred = model.predict(X_test)
-    acc = float(accuracy_score(y_test, y_pred))
+    with progress.stage("evaluate") as stage, _thread_limit():
+        y_pred = model.predict(X_test)
+        _record_shape(stage, X_test)
+        acc = float(accuracy_score(y_test, y_pred))
 
-    labels = label_encoder.classes_.tolist() if label_encoder else sorted(list(set(target)))
-    cm = confusion_matrix(y_test, y_pred, labels=range(len(labels)))
-    cm_matrix = cm.tolist()
+        labels = prepared.target_labels
+        cm = confusion_matrix(y_test, y_pred, labels=range(len(labels)))
+        cm_matrix = cm.tolist()
 
-    feature_importances = _extract_feature_importance(model, df_features.columns)
+        feature_importances = _extract_feature_importance(
+            model, prepared.ohe_columns, X_test, y_test
+        )
+        preview = None
+        if request.preview is not None:
+            low, high = _wilson_interval(int(np.trace(cm)), len(y_test))
+            preview = PreviewResult(
+                sample_rows=len(y_train),
+                training_rows=training_rows,
+                sample_fraction=len(y_train) / training_rows,
+                test_rows=len(y_test),
+                accuracy_low=low,
+                accuracy_high=high,
+                final=len(y_train) == training_rows and len(y_test) == full_test_rows,
+            )
 
-    # 10. Save Artifact
     artifact = TrainedModelArtifact(
         model=model,
-        feature_columns=feature_cols,
-        numeric_fill=numeric_fill,
-        categorical_fill=categorical_fill,
-        preprocessors=preprocessors,
-        ohe_columns=ohe_columns,
-        label_encoder=label_encoder,
+        feature_columns=prepared.feature_columns,
+        numeric_fill=prepared.numeric_fill,
+        categorical_fill=prepared.categorical_fill,
+        preprocessors=prepared.preprocessors,
+        ohe_columns=prepared.ohe_columns,
+        label_encoder=prepared.label_encoder,
         model_type=request.model,
         target_labels=labels,
+        categorical_encoder=prepared.categorical_encoder,
     )
-    model_id = _save_model(artifact)
-    download_path = f"/api/pipeline/model/{model_id}/download"
+    artifact.inference_plan = _compile_plan(artifact)
 
     return PipelineRunResponse(
         status="success",
@@ -129,57 +722,343 @@ def _run_pipeline_sync(request: PipelineRunRequest) -> PipelineRunResponse:
         confusion_matrix=ConfusionMatrix(labels=labels, matrix=cm_matrix),
         feature_importances=feature_importances,
         warnings=warnings,
-        model_id=model_id,
-        model_download_path=download_path,
+        search=search_result,
+        preview=preview,
+    ), artifact
+
+
+def _stratified_sample(target: Any, rows: int, random_state: int) -> np.ndarray:
+    """
+    Sorted positions of a class-stratified sample of about ``rows`` rows.
+
+    Classes with a single row cannot be stratified (see
+    ``_filter_rare_classes``); their rows are always kept.
+    """
+    target = np.asarray(target)
+    n = len(target)
+    if rows >= n:
+        return np.arange(n)
+    positions, strata, _ = _filter_rare_classes(np.arange(n), target, True, [])
+    kept = np.setdiff1d(np.arange(n), positions)
+    n_classes = len(np.unique(strata))
+    take = max(rows - len(kept), n_classes)
+    if take > len(positions) - n_classes:
+        return np.arange(n)
+    sampled, _ = train_test_split(
+        positions, train_size=take, stratify=strata, random_state=random_state
+    )
+    return np.sort(np.concatenate([kept, sampled]))
+
+
+def _preview_sample(
+    request: PipelineRunRequest, model: Any, X_train: Any, y_train: Any, fits: int
+) -> np.ndarray:
+    """
+    Training rows for a preview run.
+
+    Without a fixed ``sample_fraction`` a stratified calibration sample is
+    fitted once and timed; assuming fit time grows linearly with rows (times
+    ``fits`` for searches), the sample is grown to what the rest of the time
+    budget allows.
+    """
+    config = request.preview
+    seed = request.split.random_state
+    n = len(y_train)
+    if config.sample_fraction is not None:
+        return _stratified_sample(y_train, math.ceil(config.sample_fraction * n), seed)
+
+    sample = _stratified_sample(y_train, settings.PREVIEW_CALIBRATION_ROWS, seed)
+    if len(sample) == n:
+        return sample
+    start = time.perf_counter()
+    clone(model).fit(X_train[sample], np.asarray(y_train)[sample])
+    seconds_per_row = max(time.perf_counter() - start, 1e-6) * fits / len(sample)
+    affordable = int((config.time_budget_seconds - seconds_per_row * len(sample)) / seconds_per_row)
+    return _stratified_sample(y_train, max(affordable, len(sample)), seed)
+
+
+def _wilson_interval(successes: int, trials: int, z: float = 1.959964) -> Tuple[float, float]:
+    """95% Wilson score interval of a proportion (well-behaved near 0 and 1)."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+def preview_refinements(
+    request: PipelineRunRequest, response: PipelineRunResponse
+) -> List[PipelineRunRequest]:
+    """Follow-up requests on larger samples for a refining preview run."""
+    if request.preview is None or not request.preview.refine or response.preview is None:
+        return []
+    if response.preview.final:
+        return []
+    return [
+        request.model_copy(
+            update={"preview": request.preview.model_copy(update={"sample_fraction": fraction})}
+        )
+        for fraction in sorted(settings.PREVIEW_REFINE_FRACTIONS)
+        if fraction > response.preview.sample_fraction
+    ]
+
+
+def _stream_chunks(request: PipelineRunRequest) -> Iterator[pd.DataFrame]:
+    columns = None
+    if request.feature_columns:
+        columns = list(dict.fromkeys([*request.feature_columns, request.target_column]))
+    return dataset_service.iter_dataset_chunks(
+        request.dataset_id,
+        request.out_of_core.chunk_rows or settings.OUT_OF_CORE_CHUNK_ROWS,
+        columns,
+    )
+
+
+def _train_out_of_core(
+    request: PipelineRunRequest, progress: ProgressReporter
+) -> Tuple[PipelineRunResponse, Optional[TrainedModelArtifact]]:
+    """
+    Out-of-core variant of the whole run (``memory_mode="out_of_core"``).
+
+    The stored dataset is streamed chunk by chunk several times: once to
+    collect fill values, levels and classes, once per scaling step to
+    ``partial_fit`` its scaler, ``epochs`` times to ``partial_fit`` the model
+    on each chunk's training rows (shuffled within the chunk) and once to
+    evaluate on the held-out rows. Each chunk's rows are held out at random
+    with probability ``test_size`` (not stratified), seeded by the chunk's
+    position so all passes agree. Memory is bounded by one chunk plus the
+    model, whatever the row count.
+    """
+    if request.model != ModelType.sgd_classifier:
+        raise ValueError("Out-of-core training only supports the sgd_classifier model.")
+    if request.search is not None:
+        raise ValueError("Hyperparameter search is not available for out-of-core training.")
+    if request.preview is not None:
+        raise ValueError("Preview mode is not available for out-of-core training.")
+    warnings: List[str] = []
+    split = request.split
+
+    # 1-2, 5. Column types, fill values, categorical levels and classes
+    with progress.stage("prepare") as stage:
+        stats = incremental_training.collect_statistics(
+            _stream_chunks(request), request.target_column, request.feature_columns
+        )
+        stage["rows"], stage["columns"] = stats.rows, len(stats.feature_columns)
+    with progress.stage("encode") as stage:
+        encoder = incremental_training.build_chunk_encoder(
+            stats, request.target_column, request.max_categories, warnings
+        )
+        stage["rows"], stage["columns"] = stats.rows, len(encoder.output_columns)
+    # Folded into the streaming passes.
+    for skipped in ("impute", "encode_target", "filter_rare", "split"):
+        progress.stage_skipped(skipped)
+
+    # 3. Fit each scaler incrementally on the output of the previous ones
+    with progress.stage("scale") as stage:
+        positions = {col: j for j, col in enumerate(encoder.numeric_columns)}
+        for step in request.preprocess:
+            cols_to_scale = _columns_to_scale(step, encoder.numeric_columns, warnings)
+            if not cols_to_scale:
+                continue
+            scaler = StandardScaler() if step.step == PreprocessType.standardize else MinMaxScaler()
+            indices = [positions[col] for col in cols_to_scale]
+            for chunk in _stream_chunks(request):
+                progress.check_cancelled()
+                scaler.partial_fit(encoder.numeric(chunk)[:, indices])
+            encoder.preprocessors.append((step.step.value, cols_to_scale, scaler))
+        stage["rows"], stage["columns"] = stats.rows, len(encoder.numeric_columns)
+
+    # 8. Train on every chunk's training rows, several epochs
+    labels = encoder.label_encoder.classes_.tolist()
+    classes = np.arange(len(labels))
+    with progress.stage("fit") as stage:
+        model = _build_model(request.model)
+        trained_rows = 0
+        for epoch in range(request.out_of_core.epochs):
+            rng = np.random.default_rng([split.random_state, epoch])
+            for index, chunk in enumerate(_stream_chunks(request)):
+                progress.check_cancelled()
+                X, y = encoder.transform(chunk)
+                held_out = incremental_training.held_out_rows(
+                    index, len(chunk), split.test_size, split.random_state
+                )
+                rows = rng.permutation(np.flatnonzero(~held_out))
+                if len(rows):
+                    model.partial_fit(X[rows], y[rows], classes=classes)
+                if epoch == 0:
+                    trained_rows += len(rows)
+        if not trained_rows:
+            raise ValueError("The training split is empty; lower test_size.")
+        stage["rows"], stage["columns"] = trained_rows, len(encoder.output_columns)
+
+    # 9. Evaluate on the held-out rows
+    with progress.stage("evaluate") as stage:
+        cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for index, chunk in enumerate(_stream_chunks(request)):
+            progress.check_cancelled()
+            X, y = encoder.transform(chunk)
+            held_out = incremental_training.held_out_rows(
+                index, len(chunk), split.test_size, split.random_state
+            )
+            if held_out.any():
+                np.add.at(cm, (y[held_out], model.predict(X[held_out])), 1)
+        tested = int(cm.sum())
+        if not tested:
+            raise ValueError("The test split is empty; raise test_size or add rows.")
+        stage["rows"], stage["columns"] = tested, len(encoder.output_columns)
+        feature_importances = _extract_feature_importance(model, encoder.output_columns)
+
+    artifact = TrainedModelArtifact(
+        model=model,
+        feature_columns=stats.feature_columns,
+        numeric_fill=encoder.numeric_fill,
+        categorical_fill=encoder.categorical_fill,
+        preprocessors=encoder.preprocessors,
+        ohe_columns=encoder.output_columns,
+        label_encoder=encoder.label_encoder,
+        model_type=request.model,
+        target_labels=labels,
+        categorical_encoder=encoder.encoder,
+    )
+    artifact.inference_plan = _compile_plan(artifact)
+
+    return PipelineRunResponse(
+        status="success",
+        accuracy=float(np.trace(cm) / tested),
+        model_type=request.model,
+        confusion_matrix=ConfusionMatrix(labels=labels, matrix=cm.tolist()),
+        feature_importances=feature_importances,
+        warnings=warnings,
+    ), artifact
+
+
+def _search_model(
+    request: PipelineRunRequest,
+    estimator: Any,
+    param_grid: Dict[str, List[Any]],
+    X_train: Any,
+    y_train: Any,
+) -> Tuple[Any, SearchResult]:
+    """Cross-validate ``param_grid`` on the training split; return the refitted best model."""
+    n_jobs = _search_n_jobs()
+    if n_jobs != 1 and "n_jobs" in estimator.get_params():
+        # Candidates already run in parallel; avoid nested thread pools.
+        estimator.set_params(n_jobs=1)
+    search = model_search.build_search(
+        estimator,
+        request.search,
+        param_grid,
+        random_state=request.split.random_state,
+        n_jobs=n_jobs,
     )
+    try:
+        search.fit(X_train, y_train)
+    except ValueError as exc:
+        raise ValueError(f"Hyperparameter search failed: {exc}") from None
+    result = model_search.summarize_search(search, request.search.strategy, len(y_train))
+    return search.best_estimator_, result
 
 
 async def predict(model_id: str, records: List[Dict[str, Any]]) -> PredictResponse:
+    if settings.PREDICT_BATCHING_ENABLED and records:
+        predictions = await _predict_batcher.submit(model_id, records)
+        return PredictResponse(predictions=predictions)
     return await asyncio.to_thread(_predict_sync, model_id, records)
 
 
 def _predict_sync(model_id: str, records: List[Dict[str, Any]]) -> PredictResponse:
-    artifact = _get_model(model_id)
-    if not records:
-        raise ValueError("Provide at least one record to predict.")
+    return PredictResponse(predictions=_predict_records(model_id, records))
 
-    df = pd.DataFrame(records)
-    missing = [c for c in artifact.feature_columns if c not in df.columns]
-    if missing:
-        raise ValueError(f"Missing feature columns: {', '.join(missing)}")
 
-    df_features = df[artifact.feature_columns].copy()
+PREDICT_BATCH_RECORDS = registry.histogram(
+    "pipeline_predict_batch_records",
+    "Records per model invocation (after micro-batching, if enabled).",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
 
-    for col, fill_value in artifact.numeric_fill.items():
-        if col in df_features.columns:
-            df_features[col] = pd.to_numeric(df_features[col], errors='coerce')
-            df_features[col] = df_features[col].fillna(fill_value)
-    for col, fill_value in artifact.categorical_fill.items():
-        if col in df_features.columns:
-            df_features[col] = df_features[col].fillna(fill_value).astype(str)
 
-    for _, cols, scaler in artifact.preprocessors:
-        cols_to_scale = [c for c in cols if c in df_features.columns]
-        if cols_to_scale:
-            df_features[cols_to_scale] = scaler.transform(df_features[cols_to_scale])
+def _predict_records(model_id: str, records: List[Dict[str, Any]]) -> List[Any]:
+    artifact = _get_model(model_id)
+    if not records:
+        raise ValueError("Provide at least one record to predict.")
 
-    df_features = pd.get_dummies(df_features, drop_first=False)
-    df_features = df_features.reindex(columns=artifact.ohe_columns, fill_value=0)
+    PREDICT_BATCH_RECORDS.observe(len(records))
+    plan = artifact.inference_plan or _compile_plan(artifact)
+    features = plan.transform(records)
 
-    preds = artifact.model.predict(df_features)
+    preds = artifact.model.predict(features)
     if artifact.label_encoder:
         preds = artifact.label_encoder.inverse_transform(preds)
 
-    return PredictResponse(predictions=[_convert_pred(v) for v in preds])
+    return [_convert_pred(v) for v in preds]
 
 
-def download_model_bytes(model_id: str) -> bytes:
+def _check_records(model_id: str, records: List[Dict[str, Any]]) -> None:
     artifact = _get_model(model_id)
-    return pickle.dumps(artifact)
+    (artifact.inference_plan or _compile_plan(artifact)).check_columns(records)
 
 
-def _prepare_data(request: PipelineRunRequest) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
-    df = dataset_service.get_dataset(request.dataset_id).copy()
+_predict_batcher = MicroBatcher(
+    _predict_records,
+    window_seconds=settings.PREDICT_BATCH_WINDOW_MS / 1000,
+    max_records=settings.PREDICT_BATCH_MAX_RECORDS,
+    validate=_check_records,
+)
+
+
+def model_download_file(model_id: str) -> Path:
+    """
+    Pickled artifact for download, serialized on the first request.
+
+    Artifacts never change after training, so the file is written once
+    (streamed straight to disk) and every later download is served from it
+    without touching the model store. The file is deleted when its model
+    leaves the store.
+    """
+    if not is_valid_model_id(model_id):
+        raise ValueError("Model not found. Please re-run the pipeline.")
+    path = _download_path(model_id)
+    if path.exists():
+        return path
+
+    artifact = _get_model(model_id)
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f".{path.name}.{uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as handle:
+            pickle.dump(artifact, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    if not _has_model(model_id):
+        # Evicted while serializing; don't leave a file nothing will remove.
+        _remove_download(model_id)
+        raise ValueError("Model not found. Please re-run the pipeline.")
+    return path
+
+
+def _download_path(model_id: str) -> Path:
+    return Path(settings.MODEL_DOWNLOAD_DIR) / f"model-{model_id}.pkl"
+
+
+def _remove_download(model_id: str) -> None:
+    _download_path(model_id).unlink(missing_ok=True)
+
+
+def _load_columns(request: PipelineRunRequest) -> Tuple[pd.DataFrame, List[str]]:
+    """The stored dataset (projected to the run's columns when known) and the feature columns."""
+    if request.feature_columns:
+        # Only materialize the columns this run uses.
+        df = dataset_service.get_dataset(
+            request.dataset_id,
+            columns=list(dict.fromkeys([*request.feature_columns, request.target_column])),
+        )
+    else:
+        df = dataset_service.get_dataset(request.dataset_id)
 
     if request.target_column not in df.columns:
         raise ValueError("Target column not found in dataset.")
@@ -187,38 +1066,64 @@ def _prepare_data(request: PipelineRunRequest) -> Tuple[pd.DataFrame, pd.Series,
     feature_cols = request.feature_columns or [c for c in df.columns if c != request.target_column]
     if len(feature_cols) == 0:
         raise ValueError("No feature columns selected.")
+    return df, feature_cols
+
 
+def _prepare_data(request: PipelineRunRequest) -> Tuple[pd.DataFrame, pd.Series, List[str]]:
+    df, feature_cols = _load_columns(request)
     df_features = df[feature_cols].copy()
-    target = df[request.target_column]
+    target = df[request.target_column].copy()
 
     return df_features, target, feature_cols
 
 
 def _impute_values(
-    df_features: pd.DataFrame, target: pd.Series, warnings: List[str]
-) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    numeric_fill: Dict[str, Any] = {}
-    categorical_fill: Dict[str, Any] = {}
+    df_features: pd.DataFrame,
+    target: pd.Series,
+    column_stats: Dict[str, ColumnProfile],
+    warnings: List[str],
+) -> Tuple[Dict[str, Any], Dict[str, Any], pd.Series]:
+    numeric_fill, categorical_fill = _fill_values(df_features.columns, column_stats)
 
     for col in df_features.columns:
-        if pd.api.types.is_numeric_dtype(df_features[col]):
-            fill_value = df_features[col].median()
-            numeric_fill[col] = fill_value
-            df_features[col] = df_features[col].fillna(fill_value)
-        else:
-            fill_value = df_features[col].mode().iloc[0]
-            categorical_fill[col] = fill_value
+        # Columns without missing values are left untouched (no copy).
+        if column_stats[str(col)].null_count:
+            fill_value = numeric_fill[col] if col in numeric_fill else categorical_fill[col]
             df_features[col] = df_features[col].fillna(fill_value)
 
-    if target.isna().any():
-        fill_value = target.mode().iloc[0]
-        # In-place modification of the Series object
-        target.fillna(fill_value, inplace=True)
-        warnings.append(f"Missing target values filled with mode: {fill_value}.")
+    return numeric_fill, categorical_fill, _impute_target(target, column_stats, warnings)
 
+
+def _fill_values(
+    columns: Iterable[Any], column_stats: Dict[str, ColumnProfile]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Median (numeric) or mode (categorical) fill value of every feature column."""
+    numeric_fill: Dict[str, Any] = {}
+    categorical_fill: Dict[str, Any] = {}
+    for col in columns:
+        stats = column_stats[str(col)]
+        if stats.is_numeric:
+            numeric_fill[col] = stats.median if stats.median is not None else np.nan
+        else:
+            if stats.mode is None:
+                raise ValueError(f"Column '{col}' has no values to impute missing entries from.")
+            categorical_fill[col] = stats.mode
     return numeric_fill, categorical_fill
 
 
+def _impute_target(
+    target: pd.Series, column_stats: Dict[str, ColumnProfile], warnings: List[str]
+) -> pd.Series:
+    target_stats = column_stats[str(target.name)]
+    if not target_stats.null_count:
+        return target
+    if target_stats.mode is None:
+        raise ValueError("Target column has no values.")
+    fill_value = target_stats.mode
+    warnings.append(f"Missing target values filled with mode: {fill_value}.")
+    return target.fillna(fill_value)
+
+
 def _scale_features(
     df_features: pd.DataFrame,
     preprocess_steps: List[PreprocessStep],
@@ -227,17 +1132,7 @@ def _scale_features(
 ) -> List[Tuple[str, List[str], Any]]:
     preprocessors: List[Tuple[str, List[str], Any]] = []
     for step in preprocess_steps:
-        cols_to_scale: List[str]
-        if step.columns:
-            cols_to_scale = [c for c in step.columns if c in numeric_cols]
-            missing_cols = set(step.columns) - set(cols_to_scale)
-            if missing_cols:
-                warnings.append(
-                    f"Skipped non-numeric or missing columns for {step.step}: {', '.join(missing_cols)}"
-                )
-        else:
-            cols_to_scale = numeric_cols
-
+        cols_to_scale = _columns_to_scale(step, numeric_cols, warnings)
         if not cols_to_scale:
             continue
 
@@ -248,10 +1143,169 @@ def _scale_features(
     return preprocessors
 
 
-def _process_categorical(df_features: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
-    df_features = pd.get_dummies(df_features, drop_first=False)
-    ohe_columns = list(df_features.columns)
-    return df_features, ohe_columns
+def _columns_to_scale(
+    step: PreprocessStep, numeric_cols: List[str], warnings: List[str]
+) -> List[str]:
+    if not step.columns:
+        return numeric_cols
+    cols_to_scale = [c for c in step.columns if c in numeric_cols]
+    missing_cols = set(step.columns) - set(cols_to_scale)
+    if missing_cols:
+        warnings.append(
+            f"Skipped non-numeric or missing columns for {step.step}: {', '.join(missing_cols)}"
+        )
+    return cols_to_scale
+
+
+def _process_categorical(
+    df_features: pd.DataFrame,
+    encoding: CategoricalEncoding = CategoricalEncoding.dense,
+    max_categories: Optional[int] = None,
+) -> Tuple[Any, List[str], Optional[Any]]:
+    numeric_cols = [c for c in df_features.columns if pd.api.types.is_numeric_dtype(df_features[c])]
+    categorical_cols = [c for c in df_features.columns if c not in numeric_cols]
+
+    if encoding == CategoricalEncoding.dense or not categorical_cols:
+        df_features = pd.get_dummies(df_features, drop_first=False)
+        ohe_columns = list(df_features.columns)
+        return df_features, ohe_columns, None
+
+    if encoding == CategoricalEncoding.native:
+        # One code column per categorical feature instead of one column per
+        # level. Levels beyond the histogram's 255 bins share one code, and
+        # levels unseen at prediction time become NaN (treated as missing).
+        limit = min(max_categories or _NATIVE_MAX_CATEGORIES, _NATIVE_MAX_CATEGORIES)
+        encoder = OrdinalEncoder(
+            handle_unknown="use_encoded_value",
+            unknown_value=np.nan,
+            max_categories=limit,
+            dtype=np.float64,
+        )
+        levels, codes = _levels_and_codes(df_features, categorical_cols)
+        _fit_on_levels(encoder, categorical_cols, levels, codes)
+        encoded = np.column_stack(
+            [
+                np.array([lookup[level] for level in col_levels], dtype=np.float64)[col_codes]
+                for lookup, col_levels, col_codes in zip(ordinal_codes(encoder), levels, codes)
+            ]
+        )
+        matrix = np.hstack([df_features[numeric_cols].to_numpy(dtype=np.float64), encoded])
+        return matrix, numeric_cols + categorical_cols, encoder
+
+    # Sparse path: the encoder keeps the category vocabulary and emits CSR,
+    # so memory scales with non-zeros instead of rows x levels.
+    encoder = OneHotEncoder(
+        sparse_output=True,
+        max_categories=max_categories,
+        handle_unknown="infrequent_if_exist" if max_categories else "ignore",
+        dtype=np.float64,
+    )
+    levels, codes = _levels_and_codes(df_features, categorical_cols)
+    _fit_on_levels(encoder, categorical_cols, levels, codes)
+    feature_names = encoder.get_feature_names_out(categorical_cols)
+    matrix = _sparse_design_matrix(
+        df_features[numeric_cols].to_numpy(dtype=np.float64),
+        _one_hot_columns(encoder, levels, codes),
+        len(feature_names),
+    )
+    return matrix, numeric_cols + list(feature_names), encoder
+
+
+def _levels_and_codes(
+    df_features: pd.DataFrame, categorical_cols: List[str]
+) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """
+    Sorted levels (as strings) of each categorical column and every row's
+    index into them.
+
+    Category columns already hold both, so only object columns are turned
+    into strings. The result matches the levels of ``astype(str)``: missing
+    values become "nan" and levels no row uses are dropped.
+    """
+    levels, codes = [], []
+    for col in categorical_cols:
+        series = df_features[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            col_levels = series.cat.categories.astype(str).to_numpy(dtype=object)
+            col_codes = np.array(series.cat.codes, dtype=np.intp)
+            if (col_codes < 0).any():
+                if "nan" not in col_levels:
+                    col_levels = np.append(col_levels, "nan")
+                col_codes[col_codes < 0] = np.flatnonzero(col_levels == "nan")[0]
+        else:
+            col_codes, uniques = pd.factorize(series.astype(str), sort=True)
+            col_levels = np.asarray(uniques, dtype=object)
+        used = np.bincount(col_codes, minlength=len(col_levels)) > 0
+        order = np.argsort(col_levels[used], kind="stable")
+        # Old code -> position among the used levels in sorted order.
+        remap = np.empty(len(col_levels), dtype=np.intp)
+        remap[np.flatnonzero(used)[order]] = np.arange(len(order))
+        levels.append(col_levels[used][order])
+        codes.append(remap[col_codes])
+    return levels, codes
+
+
+def _fit_on_levels(
+    encoder: Any, categorical_cols: List[str], levels: List[np.ndarray], codes: List[np.ndarray]
+) -> None:
+    """
+    Fit ``encoder`` on each column's levels instead of on every row.
+
+    Rows only matter through level frequencies, which ``max_categories``
+    uses to group infrequent levels. That grouping comes from a fit on the
+    integer codes and is reproduced with two rows per frequent level and one
+    per infrequent level.
+    """
+    weights = [np.full(len(col_levels), 2) for col_levels in levels]
+    if encoder.max_categories is not None:
+        by_code = clone(encoder).set_params(
+            categories=[np.arange(len(col_levels)) for col_levels in levels]
+        )
+        by_code.fit(pd.DataFrame(dict(zip(categorical_cols, codes))))
+        for col_weights, rare in zip(weights, by_code.infrequent_categories_):
+            if rare is not None:
+                col_weights[rare] = 1
+
+    width = max(int(col_weights.sum()) for col_weights in weights)
+    rows = {}
+    for col, col_levels, col_weights in zip(categorical_cols, levels, weights):
+        # Padding repeats a frequent level, which keeps it frequent.
+        col_weights[col_weights.argmax()] += width - col_weights.sum()
+        rows[col] = np.repeat(col_levels, col_weights)
+    encoder.set_params(categories=list(levels))
+    encoder.fit(pd.DataFrame(rows))
+
+
+def _one_hot_columns(
+    encoder: OneHotEncoder, levels: List[np.ndarray], codes: List[np.ndarray]
+) -> List[np.ndarray]:
+    """Output column of every row for each categorical column."""
+    positions, _ = encoder_positions(encoder, 0)
+    return [
+        np.array([lookup[level] for level in col_levels], dtype=np.intp)[col_codes]
+        for lookup, col_levels, col_codes in zip(positions, levels, codes)
+    ]
+
+
+def _sparse_design_matrix(
+    numeric: np.ndarray, category_columns: List[np.ndarray], n_encoded: int
+) -> sparse.csr_matrix:
+    # Every row has exactly one level per categorical column.
+    n_rows = len(numeric)
+    rows = np.tile(np.arange(n_rows), len(category_columns))
+    cols = np.concatenate(category_columns)
+    encoded = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_rows, n_encoded))
+    if not numeric.shape[1]:
+        return encoded
+    return sparse.hstack([sparse.csr_matrix(numeric), encoded], format="csr")
+
+
+def _effective_encoding(request: PipelineRunRequest) -> CategoricalEncoding:
+    if request.model == ModelType.hist_gradient_boosting:
+        return CategoricalEncoding.native
+    if request.categorical_encoding == CategoricalEncoding.native:
+        raise ValueError("Native categorical encoding is only supported by hist_gradient_boosting.")
+    return request.categorical_encoding
 
 
 def _encode_target(target: pd.Series) -> Tuple[Any, Optional[LabelEncoder]]:
@@ -263,11 +1317,17 @@ def _encode_target(target: pd.Series) -> Tuple[Any, Optional[LabelEncoder]]:
 
 
 def _filter_rare_classes(
-    df_features: pd.DataFrame,
+    df_features: Any,
     target: Any,
     drop_rare: bool,
-    warnings: List[str]
-) -> Tuple[pd.DataFrame, Any, bool]:
+    warnings: List[str],
+    class_counts: Optional[Dict[str, int]] = None,
+) -> Tuple[Any, Any, bool]:
+    # Imputation only ever adds rows to the most frequent class, so if the
+    # profiled counts have no rare class the encoded target has none either.
+    if class_counts and min(class_counts.values()) >= 2:
+        return df_features, target, False
+
     unique, counts = np.unique(target, return_counts=True)
     rare = {cls: int(cnt) for cls, cnt in zip(unique, counts) if cnt < 2}
 
@@ -276,7 +1336,10 @@ def _filter_rare_classes(
             mask = ~pd.Series(target).isin(list(rare.keys()))
             mask_values = mask.values
 
-            df_features = df_features.loc[mask_values].reset_index(drop=True)
+            if isinstance(df_features, pd.DataFrame):
+                df_features = df_features.loc[mask_values].reset_index(drop=True)
+            else:  # CSR matrix or array of row positions
+                df_features = df_features[mask_values]
             target = target[mask_values]
 
             warnings.append(
@@ -299,15 +1362,47 @@ def _filter_rare_classes(
     return df_features, target, False
 
 
+def _max_threads() -> int:
+    return settings.MODEL_MAX_THREADS or os.cpu_count() or 1
+
+
+def _search_n_jobs() -> int:
+    """Parallel candidate fits: SEARCH_N_JOBS (None = all), capped like any other fit."""
+    if settings.SEARCH_N_JOBS is None or settings.SEARCH_N_JOBS < 1:
+        return _max_threads()
+    return min(settings.SEARCH_N_JOBS, _max_threads())
+
+
+@contextmanager
+def _thread_limit() -> Iterator[None]:
+    """Cap BLAS/OpenMP threads (e.g. histogram gradient boosting) to MODEL_MAX_THREADS."""
+    if settings.MODEL_MAX_THREADS is None:
+        yield
+        return
+    with threadpool_limits(limits=settings.MODEL_MAX_THREADS):
+        yield
+
+
 def _build_model(model_type: ModelType):
     if model_type == ModelType.logistic_regression:
         return LogisticRegression(max_iter=1000, solver="lbfgs")
     if model_type == ModelType.decision_tree:
         return DecisionTreeClassifier(random_state=42)
+    if model_type == ModelType.random_forest:
+        return RandomForestClassifier(n_estimators=100, n_jobs=_max_threads(), random_state=42)
+    if model_type == ModelType.hist_gradient_boosting:
+        return HistGradientBoostingClassifier(random_state=42)
+    if model_type == ModelType.sgd_classifier:
+        # Logistic loss keeps predict_proba available.
+        return SGDClassifier(loss="log_loss", random_state=42)
     raise ValueError("Unsupported model type")
 
 
-def _extract_feature_importance(model, feature_names: List[str]):
+# Rows of the test split used for permutation importance.
+_PERMUTATION_IMPORTANCE_ROWS = 2000
+
+
+def _extract_feature_importance(model, feature_names: List[str], X=None, y=None):
     importances: List[FeatureImportance] = []
     if hasattr(model, "feature_importances_"):
         scores = model.feature_importances_
@@ -317,6 +1412,14 @@ def _extract_feature_importance(model, feature_names: List[str]):
             scores = np.abs(coefs)
         else:
             scores = np.mean(np.abs(coefs), axis=0)
+    elif X is not None and len(y) > 0:
+        # No built-in importances (histogram gradient boosting): mean accuracy
+        # drop when each feature is shuffled, on a capped test sample.
+        rows = min(len(y), _PERMUTATION_IMPORTANCE_ROWS)
+        result = permutation_importance(
+            model, X[:rows], np.asarray(y)[:rows], n_repeats=3, random_state=0
+        )
+        scores = np.clip(result.importances_mean, 0.0, None)
     else:
         return None
 
@@ -328,18 +1431,122 @@ def _extract_feature_importance(model, feature_names: List[str]):
     return importances[:15]
 
 
-def _save_model(artifact: TrainedModelArtifact) -> str:
+def _compile_plan(artifact: TrainedModelArtifact) -> InferencePlan:
+    return compile_inference_plan(
+        feature_columns=artifact.feature_columns,
+        numeric_fill=artifact.numeric_fill,
+        categorical_fill=artifact.categorical_fill,
+        preprocessors=artifact.preprocessors,
+        output_columns=artifact.ohe_columns,
+        categorical_encoder=artifact.categorical_encoder,
+    )
+
+
+def _model_metadata(request: PipelineRunRequest, response: PipelineRunResponse) -> Dict[str, Any]:
+    fingerprint = None
+    try:
+        # Streamed runs never hold the whole dataset, so they are not fingerprinted.
+        if request.memory_mode != MemoryMode.out_of_core:
+            fingerprint = dataset_service.stored_fingerprint(request.dataset_id)
+    except ValueError:  # dataset evicted while training
+        pass
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "model_type": request.model.value,
+        "dataset_fingerprint": fingerprint,
+        "request": request.model_dump(mode="json"),
+        "metrics": {
+            "accuracy": response.accuracy,
+            **({"cv_accuracy": response.search.best_score} if response.search else {}),
+        },
+    }
+
+
+def _save_model(
+    artifact: TrainedModelArtifact, metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    if artifact.inference_plan is None:
+        artifact.inference_plan = _compile_plan(artifact)
     model_id = str(uuid4())
     with _model_lock:
-        _model_store[model_id] = artifact
+        _model_store.save(model_id, artifact, {"model_id": model_id, **(metadata or {})})
     return model_id
 
 
 def _get_model(model_id: str) -> TrainedModelArtifact:
     with _model_lock:
-        if model_id not in _model_store:
-            raise ValueError("Model not found. Please re-run the pipeline.")
-        return _model_store[model_id]
+        try:
+            return _model_store[model_id]
+        except KeyError:
+            raise ValueError("Model not found. Please re-run the pipeline.") from None
+
+
+def get_model_metadata(model_id: str) -> Dict[str, Any]:
+    with _model_lock:
+        try:
+            return _model_store.metadata(model_id)
+        except KeyError:
+            raise ValueError("Model not found. Please re-run the pipeline.") from None
+
+
+def _has_model(model_id: str) -> bool:
+    with _model_lock:
+        return model_id in _model_store
+
+
+def get_model_store_stats() -> Dict[str, Any]:
+    with _model_lock:
+        return _model_store.stats()
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    return _pipeline_executor.stats()
+
+
+def shutdown_executor() -> None:
+    _pipeline_executor.shutdown()
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    return _result_cache.stats()
+
+
+def get_preprocess_cache_stats() -> Dict[str, Any]:
+    return _preprocess_cache.stats()
+
+
+def _collect_metrics() -> List[MetricFamily]:
+    caches = {
+        "model_store": get_model_store_stats(),
+        "result_cache": get_result_cache_stats(),
+        "preprocess_cache": get_preprocess_cache_stats(),
+    }
+    executor = get_executor_stats()
+    return [
+        gauge_family(
+            "pipeline_cache_entries",
+            "Entries held by pipeline caches and the model store.",
+            [({"cache": name}, stats["entries"]) for name, stats in caches.items()],
+        ),
+        gauge_family(
+            "pipeline_cache_bytes",
+            "Accounted bytes held by pipeline caches and the model store.",
+            [({"cache": name}, stats["bytes"]) for name, stats in caches.items()],
+        ),
+        gauge_family(
+            "pipeline_executor_in_flight",
+            "Pipeline runs running or waiting on the executor.",
+            [({"backend": executor["backend"]}, executor["in_flight"])],
+        ),
+        gauge_family(
+            "pipeline_executor_queued",
+            "Pipeline runs waiting for a free executor worker.",
+            [({"backend": executor["backend"]}, executor["queued"])],
+        ),
+    ]
+
+
+registry.register_collector(_collect_metrics)
 
 
 def _convert_pred(value: Any) -> Any:
@@ -351,3 +1558,8 @@ def _convert_pred(value: Any) -> Any:
 def _clear_model_store():  # pragma: no cover - test helper
     with _model_lock:
         _model_store.clear()
+
+
+def _clear_result_cache():  # pragma: no cover - test helper
+    _result_cache.clear()
+    _preprocess_cache.clear()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+Records = List[Dict[str, Any]]
+_Request = Tuple[Records, "asyncio.Future[List[Any]]"]
+
+
+@dataclass
+class _PendingBatch:
+    requests: List[_Request] = field(default_factory=list)
+    n_records: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction calls per key (model id) into one call.
+
+    The first request for a key opens a window of ``window_seconds``; every
+    request that arrives before it closes, or until ``max_records`` records
+    are queued, is concatenated into a single ``run_batch(key, records)`` call
+    executed in a worker thread. Results are split back to each caller in
+    submission order. If the combined call fails, requests are retried one by
+    one so a bad payload only fails its own caller.
+
+    ``validate(key, records)``, if given, runs per request before merging
+    and fails only that caller, so checks that look at a whole request (such
+    as required columns) are not satisfied by another caller's records.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[str, Records], List[Any]],
+        window_seconds: float,
+        max_records: int,
+        validate: Optional[Callable[[str, Records], None]] = None,
+    ) -> None:
+        self._run_batch = run_batch
+        self._validate = validate
+        self.window_seconds = window_seconds
+        self.max_records = max_records
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, key: str, records: Records) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[List[Any]] = loop.create_future()
+        batch = self._pending.setdefault(key, _PendingBatch())
+        batch.requests.append((records, future))
+        batch.n_records += len(records)
+
+        if batch.n_records >= self.max_records:
+            self._flush(key)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self.window_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: str) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._execute(key, batch.requests))
+        # Keep a reference so the task is not garbage collected mid-flight.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, key: str, requests: List[_Request]) -> None:
+        if self._validate is not None:
+            errors = await asyncio.to_thread(self._validate_each, key, requests)
+            for (_, future), error in zip(requests, errors):
+                if error is not None:
+                    _resolve(future, exception=error)
+            requests = [request for request, error in zip(requests, errors) if error is None]
+            if not requests:
+                return
+        combined = [record for records, _ in requests for record in records]
+        try:
+            results = await asyncio.to_thread(self._run_batch, key, combined)
+        except Exception as exc:
+            if len(requests) == 1:
+                _resolve(requests[0][1], exception=exc)
+                return
+            for records, future in requests:
+                try:
+                    _resolve(future, await asyncio.to_thread(self._run_batch, key, records))
+                except Exception as single_exc:
+                    _resolve(future, exception=single_exc)
+            return
+
+        offset = 0
+        for records, future in requests:
+            _resolve(future, results[offset:offset + len(records)])
+            offset += len(records)
+
+    def _validate_each(self, key: str, requests: List[_Request]) -> List[Optional[Exception]]:
+        errors: List[Optional[Exception]] = []
+        for records, _ in requests:
+            try:
+                self._validate(key, records)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+    if future.done():  # caller went away (e.g. request cancelled)
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
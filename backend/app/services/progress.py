@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from threading import Lock, get_ident
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import registry
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Stages of a pipeline run, in execution order (see _execute_pipeline; lean
+# runs encode and scale after splitting).
+PIPELINE_STAGES = (
+    "prepare",
+    "impute",
+    "scale",
+    "encode",
+    "encode_target",
+    "filter_rare",
+    "split",
+    "fit",
+    "evaluate",
+    "save",
+)
+
+
+STAGE_SECONDS = registry.histogram(
+    "pipeline_stage_duration_seconds",
+    "Wall time of each pipeline stage.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+    labelnames=("stage",),
+)
+
+
+def process_peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, if the OS reports it."""
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+@dataclass
+class MemoryTrace:
+    peak_bytes: int = 0
+
+
+_trace_lock = Lock()
+# Active traces with the traced size on entry, guarded by _trace_lock. They
+# all belong to _trace_owner, the thread that started tracing.
+_active_traces: List[Tuple[MemoryTrace, int]] = []
+_trace_owner: Optional[int] = None
+_trace_started = False
+
+
+@contextmanager
+def traced_memory() -> Iterator[Optional[MemoryTrace]]:
+    """
+    Measure the peak bytes allocated inside the block with tracemalloc.
+
+    Counts Python objects and NumPy buffers (not allocations made directly by
+    C/Cython extensions) above the level traced on entry. Tracing slows down
+    allocation-heavy code, so it is only enabled while a trace is active.
+    Traces may nest on one thread (a run and its stages): tracemalloc keeps
+    one peak, so it is folded into every active trace before a new one resets
+    it. tracemalloc is process-wide, so only one thread traces at a time;
+    while another thread is tracing, the block is not traced and ``None`` is
+    yielded instead of a trace.
+    """
+    global _trace_owner, _trace_started
+    trace = MemoryTrace()
+    with _trace_lock:
+        if _trace_owner not in (None, get_ident()):
+            trace = None
+        else:
+            if not _active_traces and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _trace_started = True
+            _trace_owner = get_ident()
+            _record_peak()
+            tracemalloc.reset_peak()
+            _active_traces.append((trace, tracemalloc.get_traced_memory()[0]))
+    if trace is None:
+        yield None
+        return
+    try:
+        yield trace
+    finally:
+        with _trace_lock:
+            _record_peak()
+            _active_traces[:] = [entry for entry in _active_traces if entry[0] is not trace]
+            if not _active_traces:
+                _trace_owner = None
+                if _trace_started:
+                    tracemalloc.stop()
+                    _trace_started = False
+
+
+def _record_peak() -> None:
+    peak = tracemalloc.get_traced_memory()[1]
+    for trace, baseline in _active_traces:
+        trace.peak_bytes = max(trace.peak_bytes, peak - baseline)
+
+
+def is_tracing_memory() -> bool:
+    """Whether this thread is inside a ``traced_memory`` block (e.g. a diagnostics run)."""
+    with _trace_lock:
+        return _trace_owner == get_ident()
+
+
+class PipelineCancelledError(Exception):
+    """Raised inside a run when its job has been cancelled."""
+
+
+class ProgressReporter:
+    """
+    Receives stage notifications from a pipeline run.
+
+    The base class ignores them; subclasses record progress and may abort the
+    run by raising ``PipelineCancelledError`` from ``check_cancelled``, which
+    is called before every stage.
+    """
+
+    def stage_started(self, stage: str) -> None:
+        pass
+
+    def stage_finished(self, stage: str, duration: float, details: Dict[str, Any]) -> None:
+        pass
+
+    def stage_skipped(self, stage: str) -> None:
+        pass
+
+    def stage_failed(self, stage: str, duration: float) -> None:
+        pass
+
+    def check_cancelled(self) -> None:
+        pass
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Wrap one stage; the yielded dict collects details for the report.
+
+        Stages fill in ``rows``/``columns`` for the data they produced. When
+        the run's memory is traced, ``peak_memory_bytes`` (the stage's own
+        traced peak) is added on exit; otherwise it is ``None``. A stage that
+        raises is reported through ``stage_failed`` instead.
+        """
+        self.check_cancelled()
+        self.stage_started(name)
+        details: Dict[str, Any] = {}
+        start = time.perf_counter()
+        with traced_memory() if is_tracing_memory() else nullcontext() as trace:
+            try:
+                yield details
+            except BaseException:
+                self.stage_failed(name, time.perf_counter() - start)
+                raise
+        duration = time.perf_counter() - start
+        STAGE_SECONDS.observe(duration, name)
+        details["peak_memory_bytes"] = trace.peak_bytes if trace is not None else None
+        self.stage_finished(name, duration, details)
+
+
+NULL_PROGRESS = ProgressReporter()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import os
+import re
+import shutil
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterable, Dict, List, Tuple
+from uuid import uuid4
+
+from app.core.config import settings
+from app.schemas.dataset import (
+    DatasetUploadResponse,
+    UploadSessionCreateRequest,
+    UploadSessionResponse,
+)
+from app.services import dataset_service
+
+# Upload ids come from URLs, so only accept ids that cannot be used to escape
+# the session directory.
+_VALID_UPLOAD_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Each session lives in its own directory:
+#   session.json  immutable session description
+#   chunks/<n>    the bytes of chunk n, renamed into place once verified
+#   data          the file assembled from the chunks on completion
+# Keeping all state on disk lets any worker accept any chunk and lets a
+# restarted server resume sessions.
+_SESSION_FILE = "session.json"
+_DATA_FILE = "data"
+_CHUNKS_DIR = "chunks"
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class UploadSessionNotFoundError(ValueError):
+    """Raised for unknown, expired, finished or aborted upload sessions."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _root() -> Path:
+    return Path(settings.UPLOAD_SESSION_DIR)
+
+
+def _session_dir(upload_id: str) -> Path:
+    if not _VALID_UPLOAD_ID.match(upload_id):
+        raise UploadSessionNotFoundError("Upload session not found.")
+    return _root() / upload_id
+
+
+def _load_session(directory: Path) -> Dict[str, Any]:
+    try:
+        session = json.loads((directory / _SESSION_FILE).read_text())
+    except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+        raise UploadSessionNotFoundError("Upload session not found.") from None
+    if datetime.fromisoformat(session["expires_at"]) <= _now():
+        shutil.rmtree(directory, ignore_errors=True)
+        raise UploadSessionNotFoundError("Upload session has expired.")
+    return session
+
+
+def _received_chunks(directory: Path) -> List[int]:
+    try:
+        return sorted(int(marker.name) for marker in (directory / _CHUNKS_DIR).iterdir())
+    except FileNotFoundError:
+        return []
+
+
+def _to_response(session: Dict[str, Any], received: List[int]) -> UploadSessionResponse:
+    return UploadSessionResponse(**session, received_chunks=received)
+
+
+def _prune_expired() -> None:
+    for directory in _root().iterdir():
+        try:
+            _load_session(directory)
+        except UploadSessionNotFoundError:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def create_session(payload: UploadSessionCreateRequest) -> UploadSessionResponse:
+    # Reject oversized uploads before any bytes are sent.
+    if payload.total_size > settings.MAX_UPLOAD_SIZE_BYTES:
+        raise ValueError(
+            "Uploaded file exceeds the maximum allowed size of "
+            f"{settings.MAX_UPLOAD_SIZE_BYTES} bytes."
+        )
+    chunk_size = payload.chunk_size or settings.UPLOAD_CHUNK_SIZE_BYTES
+    if chunk_size > settings.UPLOAD_MAX_CHUNK_SIZE_BYTES:
+        raise ValueError(
+            f"Chunk size must not exceed {settings.UPLOAD_MAX_CHUNK_SIZE_BYTES} bytes."
+        )
+    chunk_size = min(chunk_size, payload.total_size)
+
+    _root().mkdir(parents=True, exist_ok=True)
+    _prune_expired()
+
+    upload_id = uuid4().hex
+    directory = _root() / upload_id
+    (directory / _CHUNKS_DIR).mkdir(parents=True)
+    session = {
+        "upload_id": upload_id,
+        "filename": payload.filename,
+        "total_size": payload.total_size,
+        "chunk_size": chunk_size,
+        "total_chunks": math.ceil(payload.total_size / chunk_size),
+        "expires_at": (_now() + timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)).isoformat(),
+    }
+    (directory / _SESSION_FILE).write_text(json.dumps(session))
+    return _to_response(session, [])
+
+
+def get_session(upload_id: str) -> UploadSessionResponse:
+    directory = _session_dir(upload_id)
+    session = _load_session(directory)
+    return _to_response(session, _received_chunks(directory))
+
+
+def _chunk_length(session: Dict[str, Any], index: int) -> int:
+    if not 0 <= index < session["total_chunks"]:
+        raise ValueError(
+            f"Chunk index must be between 0 and {session['total_chunks'] - 1}."
+        )
+    offset = index * session["chunk_size"]
+    return min(session["chunk_size"], session["total_size"] - offset)
+
+
+async def write_chunk(
+    upload_id: str, index: int, parts: AsyncIterable[bytes], sha256: str
+) -> UploadSessionResponse:
+    """
+    Store chunk ``index`` after verifying its length and SHA-256 digest.
+
+    ``parts`` are streamed into a temporary file while the digest is updated,
+    so a chunk is never held in memory; it replaces ``chunks/<index>`` only
+    once verified. Re-sending a chunk (e.g. after a dropped response) simply
+    overwrites it with the same bytes.
+    """
+    loop = asyncio.get_running_loop()
+    directory = _session_dir(upload_id)
+    session = await loop.run_in_executor(None, _load_session, directory)
+    expected = _chunk_length(session, index)
+
+    part_path = directory / f".{index}.{uuid4().hex}.part"
+    try:
+        handle = await loop.run_in_executor(None, open, part_path, "wb")
+    except FileNotFoundError:
+        raise UploadSessionNotFoundError("Upload session not found.") from None
+    try:
+        digest = hashlib.sha256()
+        received = 0
+        with handle:
+            async for part in parts:
+                received += len(part)
+                if received > expected:
+                    raise ValueError(f"Chunk {index} must be exactly {expected} bytes, got more.")
+                digest.update(part)
+                await loop.run_in_executor(None, handle.write, part)
+        if received != expected:
+            raise ValueError(f"Chunk {index} must be exactly {expected} bytes, got {received}.")
+        if not hmac.compare_digest(digest.hexdigest(), sha256.strip().lower()):
+            raise ValueError(f"Checksum mismatch for chunk {index}.")
+        return await loop.run_in_executor(None, _store_chunk, session, directory, index, part_path)
+    finally:
+        await loop.run_in_executor(None, _discard_file, part_path)
+
+
+def _store_chunk(
+    session: Dict[str, Any], directory: Path, index: int, part_path: Path
+) -> UploadSessionResponse:
+    try:
+        os.replace(part_path, directory / _CHUNKS_DIR / str(index))
+    except FileNotFoundError:
+        # Completed or aborted while the chunk was being received.
+        raise UploadSessionNotFoundError("Upload session not found.") from None
+    return _to_response(session, _received_chunks(directory))
+
+
+def _discard_file(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+def _assemble(directory: Path, total_chunks: int) -> Path:
+    """Concatenate the chunks into the data file, dropping each once copied."""
+    data_path = directory / _DATA_FILE
+    with open(data_path, "wb") as data:
+        for index in range(total_chunks):
+            chunk_path = directory / _CHUNKS_DIR / str(index)
+            with open(chunk_path, "rb") as chunk:
+                shutil.copyfileobj(chunk, data, _COPY_BUFFER_SIZE)
+            chunk_path.unlink()
+    return data_path
+
+
+async def complete_session(upload_id: str) -> DatasetUploadResponse:
+    """Parse the assembled file through the regular upload path and discard the session."""
+    loop = asyncio.get_running_loop()
+    session, claimed = await loop.run_in_executor(None, _claim_session, upload_id)
+    try:
+        data_path = await loop.run_in_executor(
+            None, _assemble, claimed, session["total_chunks"]
+        )
+        return await dataset_service.save_dataset_file(session["filename"], data_path)
+    finally:
+        await loop.run_in_executor(None, partial(shutil.rmtree, claimed, ignore_errors=True))
+
+
+def _claim_session(upload_id: str) -> Tuple[Dict[str, Any], Path]:
+    directory = _session_dir(upload_id)
+    session = _load_session(directory)
+    received = len(_received_chunks(directory))
+    if received != session["total_chunks"]:
+        raise ValueError(
+            f"Upload is incomplete: {session['total_chunks'] - received} chunk(s) missing."
+        )
+
+    # Claim the session atomically so concurrent finalize calls cannot both
+    # ingest it; the loser sees an unknown session.
+    claimed = directory.with_name(f".{upload_id}.{uuid4().hex}")
+    try:
+        os.rename(directory, claimed)
+    except FileNotFoundError:
+        raise UploadSessionNotFoundError("Upload session not found.") from None
+    return session, claimed
+
+
+def abort_session(upload_id: str) -> None:
+    directory = _session_dir(upload_id)
+    _load_session(directory)
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,8 @@
+"""
+Reproducible benchmarks for the upload, train and predict hot paths.
+
+Run from the backend directory::
+
+    python -m benchmarks.run run --rows 100000 --output bench.json
+    python -m benchmarks.run compare baseline.json bench.json
+"""
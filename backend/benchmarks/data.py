@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class DatasetSpec:
+    rows: int = 10_000
+    numeric_columns: int = 8
+    categorical_columns: int = 2
+    cardinality: int = 20
+    missing_rate: float = 0.05
+    n_classes: int = 2
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def make_dataset(spec: DatasetSpec) -> pd.DataFrame:
+    """
+    Synthetic classification frame with columns ``num_<i>``, ``cat_<i>`` and
+    ``target``. The target depends on the features so models have signal to
+    fit; feature cells are blanked at ``missing_rate``. Deterministic for a
+    given spec.
+    """
+    rng = np.random.default_rng(spec.seed)
+    numeric = rng.normal(size=(spec.rows, spec.numeric_columns))
+    codes = rng.integers(0, spec.cardinality, size=(spec.rows, spec.categorical_columns))
+
+    score = numeric[:, : min(3, spec.numeric_columns)].sum(axis=1) + 0.1 * codes.sum(axis=1)
+    if spec.n_classes > 1:
+        edges = np.quantile(score, np.linspace(0, 1, spec.n_classes + 1)[1:-1])
+        target = np.digitize(score, edges)
+    else:
+        target = np.zeros(spec.rows, dtype=int)
+
+    columns: Dict[str, Any] = {}
+    for i in range(spec.numeric_columns):
+        values = numeric[:, i]
+        values[rng.random(spec.rows) < spec.missing_rate] = np.nan
+        columns[f"num_{i}"] = values
+    for i in range(spec.categorical_columns):
+        values = np.char.add("level_", codes[:, i].astype(str)).astype(object)
+        values[rng.random(spec.rows) < spec.missing_rate] = None
+        columns[f"cat_{i}"] = values
+    columns["target"] = np.char.add("class_", target.astype(str))
+    return pd.DataFrame(columns)
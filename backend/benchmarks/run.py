@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import sklearn
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.schemas.pipeline import (
+    MemoryMode,
+    ModelType,
+    PipelineRunRequest,
+    PreprocessStep,
+    PreprocessType,
+)
+from app.services import dataset_service, pipeline_service
+from app.services.progress import ProgressReporter, process_peak_rss_bytes
+from benchmarks.data import DatasetSpec, make_dataset
+
+DEFAULT_PREDICT_BATCHES = (1, 100, 10_000)
+DEFAULT_THRESHOLD = 0.10
+
+
+class _StageRecorder(ProgressReporter):
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+
+    def stage_finished(self, stage: str, duration: float, details: Dict[str, Any]) -> None:
+        self.durations[stage] = duration
+
+
+@contextmanager
+def _settings_override(**values: Any) -> Iterator[None]:
+    previous = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def _summarize(samples: Sequence[float], units: Optional[float] = None, unit: str = "") -> Dict[str, Any]:
+    """Latency percentiles in ms and, if ``units`` is given, median throughput."""
+    values = np.asarray(samples, dtype=np.float64)
+    summary: Dict[str, Any] = {
+        "samples": len(values),
+        "mean_ms": float(values.mean() * 1000),
+        "min_ms": float(values.min() * 1000),
+        "p50_ms": float(np.percentile(values, 50) * 1000),
+        "p95_ms": float(np.percentile(values, 95) * 1000),
+        "p99_ms": float(np.percentile(values, 99) * 1000),
+        # High-water mark of the whole benchmark process so far.
+        "peak_rss_bytes": process_peak_rss_bytes(),
+    }
+    if units is not None:
+        median = float(np.median(values))
+        summary["throughput"] = units / median if median > 0 else None
+        summary["throughput_unit"] = unit
+    return summary
+
+
+def _time(fn: Callable[[], Any], repeats: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _bench_upload(df: pd.DataFrame, repeats: int) -> Dict[str, Any]:
+    buffer = BytesIO()
+    df.to_csv(buffer, index=False)
+    payload = buffer.getvalue()
+    dataset_ids: List[str] = []
+
+    def upload() -> None:
+        file = UploadFile(file=BytesIO(payload), filename="benchmark.csv")
+        dataset_ids.append(asyncio.run(dataset_service.save_dataset(file)).dataset_id)
+
+    samples = _time(upload, repeats)
+    with dataset_service._dataset_lock:
+        for dataset_id in dataset_ids:
+            del dataset_service._dataset_store[dataset_id]
+    return _summarize(samples, units=len(payload), unit="bytes/s")
+
+
+def _pipeline_request(
+    dataset_id: str, model: ModelType, **options: Any
+) -> PipelineRunRequest:
+    return PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+        model=model,
+        **options,
+    )
+
+
+def _bench_train(dataset_id: str, rows: int, repeats: int) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for model in ModelType:
+        request = _pipeline_request(dataset_id, model)
+        stage_samples: Dict[str, List[float]] = {}
+        totals: List[float] = []
+        for attempt in range(repeats + 1):
+            recorder = _StageRecorder()
+            start = time.perf_counter()
+            pipeline_service._run_pipeline_sync(request, recorder)
+            elapsed = time.perf_counter() - start
+            if attempt == 0:
+                continue  # warm-up
+            totals.append(elapsed)
+            for stage, duration in recorder.durations.items():
+                stage_samples.setdefault(stage, []).append(duration)
+        results[f"train.{model.value}.total"] = _summarize(totals, units=rows, unit="rows/s")
+        for stage, samples in stage_samples.items():
+            results[f"train.{model.value}.{stage}"] = _summarize(samples)
+    return results
+
+
+def _bench_memory(dataset_id: str) -> Dict[str, Dict[str, Any]]:
+    """Traced peak memory of one training run per model and memory mode."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for model in ModelType:
+        for mode in MemoryMode:
+            if mode == MemoryMode.out_of_core and model != ModelType.sgd_classifier:
+                continue
+            request = _pipeline_request(dataset_id, model, memory_mode=mode, collect_diagnostics=True)
+            diagnostics = pipeline_service._run_pipeline_sync(request).diagnostics
+            results[f"memory.{model.value}.{mode.value}"] = {
+                "input_bytes": diagnostics.input_bytes,
+                "peak_traced_bytes": diagnostics.peak_memory_bytes,
+                "peak_to_input_ratio": diagnostics.peak_to_input_ratio,
+            }
+    return results
+
+
+def _bench_predict(
+    dataset_id: str, df: pd.DataFrame, batch_sizes: Sequence[int], repeats: int
+) -> Dict[str, Dict[str, Any]]:
+    request = _pipeline_request(dataset_id, ModelType.logistic_regression)
+    model_id = pipeline_service._run_pipeline_sync(request).model_id
+    features = df.drop(columns=["target"])
+    # Missing cells go over the wire as JSON nulls.
+    features = features.astype(object).where(features.notna(), None)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for batch_size in batch_sizes:
+        sample = features.sample(n=batch_size, replace=batch_size > len(features), random_state=0)
+        records = sample.to_dict(orient="records")
+        samples = _time(lambda: pipeline_service._predict_sync(model_id, records), repeats)
+        results[f"predict.batch_{batch_size}"] = _summarize(samples, units=batch_size, unit="records/s")
+    return results
+
+
+def run_benchmarks(
+    spec: DatasetSpec,
+    repeats: int = 5,
+    predict_batches: Sequence[int] = DEFAULT_PREDICT_BATCHES,
+) -> Dict[str, Any]:
+    df = make_dataset(spec)
+    results: Dict[str, Dict[str, Any]] = {}
+    # Measure the work itself, not cache hits from earlier repeats.
+    with _settings_override(PIPELINE_RESULT_CACHE_ENABLED=False, PREPROCESS_CACHE_ENABLED=False):
+        results["upload.csv"] = _bench_upload(df, repeats)
+
+        dataset_id = "benchmark"
+        dataset_service._store_dataset(dataset_id, df)
+        try:
+            results.update(_bench_train(dataset_id, spec.rows, repeats))
+            results.update(_bench_memory(dataset_id))
+            results.update(_bench_predict(dataset_id, df, predict_batches, repeats))
+        finally:
+            with dataset_service._dataset_lock:
+                del dataset_service._dataset_store[dataset_id]
+            pipeline_service._clear_model_store()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+            "dataset": spec.to_dict(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "p50_ms",
+) -> List[Dict[str, Any]]:
+    """
+    Compare ``metric`` for every benchmark present in both runs.
+
+    A benchmark regressed when it is more than ``threshold`` (relative)
+    slower than the baseline.
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None or not base.get(metric):
+            continue
+        ratio = cur[metric] / base[metric]
+        rows.append(
+            {
+                "name": name,
+                "baseline": base[metric],
+                "current": cur[metric],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Upload, train and predict benchmarks."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write JSON results")
+    defaults = DatasetSpec()
+    run.add_argument("--rows", type=int, default=defaults.rows)
+    run.add_argument("--numeric-columns", type=int, default=defaults.numeric_columns)
+    run.add_argument("--categorical-columns", type=int, default=defaults.categorical_columns)
+    run.add_argument("--cardinality", type=int, default=defaults.cardinality)
+    run.add_argument("--missing-rate", type=float, default=defaults.missing_rate)
+    run.add_argument("--classes", type=int, default=defaults.n_classes)
+    run.add_argument("--seed", type=int, default=defaults.seed)
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument(
+        "--predict-batches", type=int, nargs="+", default=list(DEFAULT_PREDICT_BATCHES)
+    )
+    run.add_argument("--output", help="file to write results to (default: stdout)")
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare.add_argument(
+        "--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms", "min_ms"]
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    if args.command == "run":
+        spec = DatasetSpec(
+            rows=args.rows,
+            numeric_columns=args.numeric_columns,
+            categorical_columns=args.categorical_columns,
+            cardinality=args.cardinality,
+            missing_rate=args.missing_rate,
+            n_classes=args.classes,
+            seed=args.seed,
+        )
+        output = json.dumps(run_benchmarks(spec, args.repeats, args.predict_batches), indent=2)
+        if args.output:
+            with open(args.output, "w") as handle:
+                handle.write(output + "\n")
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.current) as handle:
+        current = json.load(handle)
+    rows = compare_results(baseline, current, args.threshold, args.metric)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<45} {row['baseline']:>12.3f} {row['current']:>12.3f} "
+            f"{row['ratio']:>7.2f}x {flag}"
+        )
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
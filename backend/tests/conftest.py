@@ -29,6 +29,24 @@ def reset_model_store() -> None:
     pipeline_service._clear_model_store()
 
 
+@pytest.fixture(autouse=True)
+def reset_result_cache() -> None:
+    """Clear memoized pipeline responses between tests."""
+    pipeline_service._clear_result_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolate_model_downloads(tmp_path, monkeypatch) -> None:
+    """Write serialized model downloads to a per-test directory."""
+    monkeypatch.setattr(settings, "MODEL_DOWNLOAD_DIR", str(tmp_path / "downloads"))
+
+
+@pytest.fixture(autouse=True)
+def isolate_upload_sessions(tmp_path, monkeypatch) -> None:
+    """Spool resumable uploads to a per-test directory."""
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_DIR", str(tmp_path / "uploads"))
+
+
 @pytest.fixture()
 def sample_dataframe() -> pd.DataFrame:
     return pd.DataFrame(
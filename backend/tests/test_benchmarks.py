@@ -0,0 +1,39 @@
+from benchmarks.data import DatasetSpec, make_dataset
+from benchmarks.run import compare_results, run_benchmarks
+
+
+def test_make_dataset_is_deterministic_and_honours_spec():
+    spec = DatasetSpec(
+        rows=200, numeric_columns=3, categorical_columns=2, cardinality=5, missing_rate=0.2, n_classes=3
+    )
+
+    df = make_dataset(spec)
+
+    assert df.shape == (200, 6)
+    assert df["cat_0"].nunique() <= 5
+    assert df["target"].nunique() == 3
+    assert 0.1 < df["num_0"].isna().mean() < 0.3
+    assert df.equals(make_dataset(spec))
+
+
+def test_run_benchmarks_reports_every_hot_path():
+    report = run_benchmarks(DatasetSpec(rows=120), repeats=1, predict_batches=(1, 10))
+
+    results = report["results"]
+    assert results["upload.csv"]["throughput_unit"] == "bytes/s"
+    assert "train.logistic_regression.fit" in results
+    assert "train.decision_tree.total" in results
+    assert results["predict.batch_10"]["p50_ms"] > 0
+    assert results["memory.decision_tree.lean"]["peak_traced_bytes"] > 0
+    assert report["meta"]["dataset"]["rows"] == 120
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"results": {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}, "gone": {"p50_ms": 1.0}}}
+    current = {"results": {"a": {"p50_ms": 10.5}, "b": {"p50_ms": 12.0}}}
+
+    rows = {row["name"]: row for row in compare_results(baseline, current, threshold=0.1)}
+
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"]
@@ -0,0 +1,76 @@
+import pytest
+
+from app.core.cache import BoundedCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_unbounded_cache_behaves_like_dict():
+    cache = BoundedCache()
+    cache["a"] = 1
+    cache["b"] = 2
+
+    assert cache["a"] == 1
+    assert len(cache) == 2
+    del cache["a"]
+    assert "a" not in cache
+    with pytest.raises(KeyError):
+        cache["a"]
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = BoundedCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"]  # refresh recency of "a"
+    cache["c"] = 3
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_on_evict_sees_limit_evictions_but_not_deletes():
+    evicted = []
+    cache = BoundedCache(max_entries=1, on_evict=lambda key, value: evicted.append((key, value)))
+    cache["a"] = 1
+    cache["b"] = 2
+    del cache["b"]
+
+    assert evicted == [("a", 1)]
+
+
+def test_max_bytes_tracks_sizes_and_keeps_newest_entry():
+    cache = BoundedCache(max_bytes=10, sizeof=len)
+    cache["a"] = "xxxx"
+    cache["b"] = "yyyy"
+    assert cache.stats()["bytes"] == 8
+
+    cache["c"] = "zzzz"
+    assert cache.keys() == ["b", "c"]
+    assert cache.stats()["bytes"] == 8
+
+    # A single value over budget is still stored, alone.
+    cache["big"] = "w" * 20
+    assert cache.keys() == ["big"]
+    assert cache.stats()["bytes"] == 20
+
+
+def test_ttl_expires_idle_entries_and_reads_refresh_timer():
+    clock = FakeClock()
+    cache = BoundedCache(ttl_seconds=10, clock=clock)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    clock.now = 8
+    assert cache["a"] == 1
+
+    clock.now = 12
+    assert "b" not in cache
+    assert cache["a"] == 1
+    assert cache.stats()["entries"] == 1
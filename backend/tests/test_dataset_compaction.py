@@ -0,0 +1,113 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.schemas.pipeline import (
+    ModelType,
+    PipelineRunRequest,
+    PreprocessStep,
+    PreprocessType,
+    TrainTestConfig,
+)
+from app.services import dataset_service, pipeline_service
+from app.services.dataset_compaction import compact_dataframe
+
+
+def _frame(rows: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "count": rng.integers(0, 100, size=rows),
+            "ratio": rng.integers(0, 8, size=rows) / 4,
+            "noise": rng.normal(size=rows),
+            "city": rng.choice(["north", "south", None], size=rows),
+            "id": [f"row-{i}" for i in range(rows)],
+            "target": rng.choice(["a", "b"], size=rows),
+        }
+    )
+
+
+def test_compact_dataframe_is_lossless():
+    df = _frame()
+
+    compacted = compact_dataframe(df, category_max_ratio=0.5)
+
+    assert compacted["count"].dtype == np.int8
+    assert compacted["ratio"].dtype == np.float64  # floats are never narrowed
+    assert compacted["noise"].dtype == np.float64
+    assert isinstance(compacted["city"].dtype, pd.CategoricalDtype)
+    assert compacted["id"].dtype == object  # every value is distinct
+    for col in df.columns:
+        assert compacted[col].astype(object).where(compacted[col].notna()).equals(
+            df[col].astype(object).where(df[col].notna())
+        )
+    assert df["count"].dtype == np.int64  # input untouched
+
+
+def test_upload_reports_memory_saved(client, monkeypatch):
+    monkeypatch.setattr(settings, "DATASET_COMPACTION_ENABLED", True)
+    csv = _frame().to_csv(index=False).encode()
+
+    resp = client.post("/api/datasets/upload", files={"file": ("data.csv", csv, "text/csv")})
+
+    body = resp.json()
+    assert resp.status_code == 200
+    assert body["memory_saved_bytes"] > 0
+    assert body["dtypes"]["city"] == "category"
+    assert body["preview"][0]["city"] in ("north", "south", "null")
+
+
+def test_pipeline_results_match_on_compacted_frames():
+    df = _frame()
+    responses = []
+    for dataset_id, frame in (("plain", df), ("compact", compact_dataframe(df, 0.5))):
+        dataset_service._dataset_store[dataset_id] = frame
+        request = PipelineRunRequest(
+            dataset_id=dataset_id,
+            target_column="target",
+            feature_columns=["count", "ratio", "city"],
+            preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+            split=TrainTestConfig(test_size=0.25, random_state=0),
+            model=ModelType.logistic_regression,
+        )
+        responses.append(asyncio.run(pipeline_service.run_pipeline(request)))
+
+    plain, compact = responses
+    assert compact.accuracy == plain.accuracy
+    assert [f.name for f in compact.feature_importances] == [f.name for f in plain.feature_importances]
+
+
+def test_tree_model_predictions_match_on_compacted_frames():
+    rng = np.random.default_rng(1)
+    rows = 400
+    # Quarter steps up to 2**22 fit float32 exactly, but standardizing them in
+    # float32 moves values across the split thresholds.
+    level = rng.integers(2**22, 2**24, size=rows) / 4
+    level[rng.random(rows) < 0.1] = np.nan
+    cut = np.nanmedian(level)
+    df = pd.DataFrame(
+        {
+            "level": level,
+            "count": rng.integers(0, 50, size=rows),
+            "target": np.where(np.nan_to_num(level, nan=cut) > cut, "high", "low"),
+        }
+    )
+    records = [{"level": float(value), "count": 7} for value in np.unique(level[~np.isnan(level)])]
+    records.append({"level": None, "count": 7})
+
+    for model in (ModelType.decision_tree, ModelType.hist_gradient_boosting):
+        predictions = []
+        for dataset_id, frame in (("plain", df), ("compact", compact_dataframe(df, 0.5))):
+            dataset_service._dataset_store[dataset_id] = frame
+            request = PipelineRunRequest(
+                dataset_id=dataset_id,
+                target_column="target",
+                preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+                split=TrainTestConfig(test_size=0.25, random_state=0),
+                model=model,
+            )
+            result = asyncio.run(pipeline_service.run_pipeline(request))
+            predictions.append(asyncio.run(pipeline_service.predict(result.model_id, records)).predictions)
+        assert predictions[0] == predictions[1], model
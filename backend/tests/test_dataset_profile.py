@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from app.services import dataset_service
+from app.services.dataset_profile import profile_dataframe
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "age": [30, np.nan, 20, 40, 20],
+            "flag": [True, False, True, True, False],
+            "city": ["b", "a", None, "a", "b"],
+            "target": ["yes", "no", "yes", "no", "yes"],
+        }
+    )
+
+
+def test_profile_matches_pandas_reductions():
+    df = _frame()
+
+    profile = {column.name: column for column in profile_dataframe(df, max_classes=3).columns}
+
+    age = profile["age"]
+    assert age.is_numeric and age.null_count == 1 and age.cardinality == 3
+    assert age.median == df["age"].median()
+    assert (age.min, age.max) == (20.0, 40.0)
+    assert age.mode == df["age"].mode().iloc[0]
+    # Ties resolve like Series.mode(): the smallest value wins.
+    assert profile["city"].mode == "a" == df["city"].mode().iloc[0]
+    assert profile["city"].median is None
+    assert profile["flag"].is_numeric
+    assert profile["target"].class_counts == {"yes": 3, "no": 2}
+
+
+def test_profile_skips_class_counts_for_high_cardinality():
+    df = pd.DataFrame({"id": range(10)})
+
+    column = profile_dataframe(df, max_classes=5).columns[0]
+
+    assert column.cardinality == 10
+    assert column.class_counts is None
+
+
+def test_profile_is_computed_at_upload_and_served(client):
+    csv = _frame().to_csv(index=False).encode()
+    upload = client.post("/api/datasets/upload", files={"file": ("data.csv", csv, "text/csv")})
+    dataset_id = upload.json()["dataset_id"]
+
+    df = dataset_service.get_dataset(dataset_id)
+    assert "profile" in dataset_service._frame_metadata_for(df)
+
+    resp = client.get(f"/api/datasets/{dataset_id}/profile")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["dataset_id"] == dataset_id
+    assert body["rows"] == 5
+    assert [column["name"] for column in body["columns"]] == ["age", "flag", "city", "target"]
+    assert client.get("/api/datasets/missing/profile").status_code == 404
@@ -0,0 +1,169 @@
+import asyncio
+import gzip
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.services import dataset_readers, dataset_service
+
+CSV = (
+    b"count,ratio,city,flag,day,note\n"
+    b'1,1.5,north,True,2024-01-01,"multi\nline"\n'
+    b"2,,NA,False,2024-01-02,plain\n"
+    b"3,2.5,,True,2024-02-01,plain\n"
+)
+
+
+def test_pyarrow_csv_matches_c_engine():
+    expected = dataset_readers.read_csv(BytesIO(CSV), "c")
+
+    parsed = dataset_readers.read_csv(BytesIO(CSV), "pyarrow", sample=CSV)
+
+    pd.testing.assert_frame_equal(parsed, expected)
+    assert parsed["day"].tolist() == ["2024-01-01", "2024-01-02", "2024-02-01"]
+
+
+
+def test_pyarrow_csv_nulls_match_c_engine_defaults():
+    tokens = dataset_readers._CSV_NA_VALUES + ["missing", "nul"]
+    body = "value,other\n" + "".join(f"{token},x\n" for token in tokens)
+    expected = dataset_readers.read_csv(BytesIO(body.encode()), "c")
+
+    parsed = dataset_readers.read_csv(BytesIO(body.encode()), "pyarrow")
+
+    pd.testing.assert_frame_equal(parsed, expected)
+    assert parsed["value"].notna().sum() == 2
+
+def test_pyarrow_csv_keeps_dates_as_strings_without_sample():
+    parsed = dataset_readers.read_csv(BytesIO(CSV), "pyarrow")
+
+    assert parsed["day"].dtype == object
+
+
+def test_save_dataset_with_pyarrow_engine_enforces_size_limit(monkeypatch):
+    monkeypatch.setattr(settings, "CSV_PARSER_ENGINE", "pyarrow")
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE_BYTES", 2048)
+    monkeypatch.setattr(dataset_service, "_UPLOAD_CHUNK_SIZE", 1024)
+    body = b"a,b\n" + b"1,2\n" * 1000
+
+    with pytest.raises(ValueError, match="exceeds the maximum allowed size"):
+        asyncio.run(dataset_service.save_dataset(UploadFile(filename="big.csv", file=BytesIO(body))))
+
+
+def test_excel_engine_falls_back_without_calamine(monkeypatch):
+    dataset_readers.resolve_excel_engine.cache_clear()
+    monkeypatch.setattr(dataset_readers.importlib.util, "find_spec", lambda name: None)
+    try:
+        assert dataset_readers.resolve_excel_engine("calamine") == "openpyxl"
+    finally:
+        dataset_readers.resolve_excel_engine.cache_clear()
+
+
+def test_calamine_reads_xlsx(monkeypatch, sample_dataframe):
+    pytest.importorskip("python_calamine")
+    monkeypatch.setattr(settings, "EXCEL_PARSER_ENGINE", "calamine")
+    buffer = BytesIO()
+    sample_dataframe.to_excel(buffer, index=False, engine="openpyxl")
+
+    upload = UploadFile(filename="data.xlsx", file=BytesIO(buffer.getvalue()))
+    response = asyncio.run(dataset_service.save_dataset(upload))
+
+    stored = dataset_service.get_dataset(response.dataset_id)
+    pd.testing.assert_frame_equal(stored, sample_dataframe)
+
+
+@pytest.mark.parametrize(
+    ("filename", "configured", "expected"),
+    [
+        ("data.xlsx", "openpyxl", "openpyxl"),
+        ("data.xls", "openpyxl", None),
+        ("data.XLS", "calamine", "calamine"),
+    ],
+)
+def test_excel_engine_depends_on_workbook_format(monkeypatch, filename, configured, expected):
+    monkeypatch.setattr(settings, "EXCEL_PARSER_ENGINE", configured)
+    monkeypatch.setattr(dataset_readers, "resolve_excel_engine", lambda engine: engine)
+    engines = []
+
+    def fake_read_excel(buffer, engine):
+        engines.append(engine)
+        return pd.DataFrame({"a": [1]})
+
+    monkeypatch.setattr(dataset_readers.pd, "read_excel", fake_read_excel)
+    upload = UploadFile(filename=filename, file=BytesIO(b"workbook"))
+    asyncio.run(dataset_service.save_dataset(upload))
+
+    # openpyxl cannot open .xls, so pandas picks the engine for legacy workbooks.
+    assert engines == [expected]
+
+
+@pytest.mark.skipif(
+    dataset_readers.importlib.util.find_spec("xlrd") is not None, reason="xlrd is installed"
+)
+def test_xls_upload_without_xlrd_is_a_client_error(client):
+    # OLE2 compound document signature, which pandas detects as .xls.
+    payload = bytes.fromhex("D0CF11E0A1B11AE1") + b"\0" * 504
+
+    resp = client.post(
+        "/api/datasets/upload",
+        files={"file": ("legacy.xls", payload, "application/vnd.ms-excel")},
+    )
+
+    assert resp.status_code == 400
+    assert "xlrd" in resp.json()["detail"]
+
+
+def _upload(filename: str, payload: bytes):
+    upload = UploadFile(filename=filename, file=BytesIO(payload))
+    response = asyncio.run(dataset_service.save_dataset(upload))
+    return dataset_service.get_dataset(response.dataset_id)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_columnar_uploads_round_trip(suffix, sample_dataframe):
+    buffer = BytesIO()
+    if suffix == ".parquet":
+        sample_dataframe.to_parquet(buffer, index=False)
+    else:
+        sample_dataframe.to_feather(buffer)
+
+    stored = _upload(f"data{suffix}", buffer.getvalue())
+
+    pd.testing.assert_frame_equal(stored, sample_dataframe)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_compressed_csv_uploads(compression, engine, monkeypatch):
+    monkeypatch.setattr(settings, "CSV_PARSER_ENGINE", engine)
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, compression) as compressed:
+        compressed.write(CSV)
+    suffix = ".gz" if compression == "gzip" else ".zst"
+
+    stored = _upload(f"data.csv{suffix}", sink.getvalue().to_pybytes())
+
+    assert stored.shape == (3, 6)
+    assert stored["day"].tolist() == ["2024-01-01", "2024-01-02", "2024-02-01"]
+
+
+def test_compressed_csv_rejects_decompression_bombs(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_DECOMPRESSED_SIZE_BYTES", 64 * 1024)
+    payload = gzip.compress(b"a,b\n" + b"0,0\n" * 100_000)
+    assert len(payload) < settings.MAX_UPLOAD_SIZE_BYTES
+
+    with pytest.raises(ValueError, match="maximum decompressed size"):
+        _upload("bomb.csv.gz", payload)
+
+
+def test_parquet_rejects_oversized_row_groups(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_DECOMPRESSED_SIZE_BYTES", 1024)
+    buffer = BytesIO()
+    pd.DataFrame({"x": range(100_000)}).to_parquet(buffer, compression="zstd")
+
+    with pytest.raises(ValueError, match="maximum decompressed size"):
+        _upload("bomb.parquet", buffer.getvalue())
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from io import BytesIO
 
 import pandas as pd
@@ -7,6 +8,7 @@ from starlette.datastructures import UploadFile
 
 from app.schemas.dataset import DatasetUploadResponse
 from app.services import dataset_service
+from app.services.dataset_store import ArrowDatasetStore
 
 
 def _upload_file(name: str, content: bytes) -> UploadFile:
@@ -40,6 +42,46 @@ def test_save_dataset_csv_success(sample_csv_bytes):
     assert stored.equals(pd.read_csv(BytesIO(sample_csv_bytes)))
 
 
+
+@pytest.mark.filterwarnings("ignore::pandas.errors.DtypeWarning")
+def test_arrow_store_accepts_csv_columns_with_mixed_types(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_service, "_dataset_store", ArrowDatasetStore(tmp_path))
+    # The C parser infers types per chunk, so this column ends up holding
+    # ints followed by one string.
+    rows = "".join(f"{i},{i % 2}\n" for i in range(300_000))
+    upload = _upload_file("codes.csv", f"code,target\n{rows}A12,1\n".encode())
+
+    response = asyncio.run(dataset_service.save_dataset(upload))
+
+    stored = ArrowDatasetStore(tmp_path, cache_size=0)[response.dataset_id]
+    assert stored["code"].iloc[0] == "0"
+    assert stored["code"].iloc[-1] == "A12"
+
+
+def test_arrow_reads_do_not_wait_for_each_other(tmp_path, monkeypatch, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path, cache_size=0)
+    store["slow"] = sample_dataframe
+    store["fast"] = sample_dataframe
+    monkeypatch.setattr(dataset_service, "_dataset_store", store)
+    release = threading.Event()
+    load = store._load
+
+    def blocking_load(dataset_id, columns=None):
+        if dataset_id == "slow":
+            release.wait(5)
+        return load(dataset_id, columns)
+
+    monkeypatch.setattr(store, "_load", blocking_load)
+    slow = threading.Thread(target=dataset_service.get_dataset, args=("slow",))
+    slow.start()
+    try:
+        # Would block until ``release`` if reads held the dataset lock.
+        assert dataset_service.get_dataset("fast").equals(sample_dataframe)
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join()
+
 def test_get_dataset_raises_for_missing_id():
     with pytest.raises(ValueError, match="Dataset not found"):
         dataset_service.get_dataset("missing-id")
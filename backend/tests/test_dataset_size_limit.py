@@ -35,3 +35,17 @@ async def test_save_dataset_accepts_valid_size_file():
     with patch("app.core.config.settings.MAX_UPLOAD_SIZE_BYTES", 1024):
         response = await dataset_service.save_dataset(upload)
         assert response.dataset_id is not None
+
+
+@pytest.mark.asyncio
+async def test_save_dataset_rejects_large_file_while_streaming():
+    # The first chunk fits under the limit; the overflow is only detected
+    # while the parser is pulling the rest of the upload.
+    content = b"col1,col2\n" + b"1,2\n" * 512
+    upload = UploadFile(filename="large.csv", file=BytesIO(content))
+
+    with patch("app.core.config.settings.MAX_UPLOAD_SIZE_BYTES", 1024), patch.object(
+        dataset_service, "_UPLOAD_CHUNK_SIZE", 256
+    ):
+        with pytest.raises(ValueError, match="exceeds the maximum allowed size of 1024 bytes"):
+            await dataset_service.save_dataset(upload)
@@ -0,0 +1,210 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from app.services.dataset_store import (
+    ArrowDatasetStore,
+    DatasetStore,
+    MemoryDatasetStore,
+    create_dataset_store,
+)
+
+
+def test_arrow_store_round_trip(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path, cache_size=0)
+    store["ds-1"] = sample_dataframe
+
+    loaded = store["ds-1"]
+    assert loaded.equals(sample_dataframe)
+    assert "ds-1" in store
+    assert list(store) == ["ds-1"]
+
+
+def test_arrow_store_is_shared_between_instances(tmp_path, sample_dataframe):
+    # A second instance stands in for another worker or a restarted process.
+    ArrowDatasetStore(tmp_path)["ds-1"] = sample_dataframe
+
+    other = ArrowDatasetStore(tmp_path)
+    assert "ds-1" in other
+    assert other["ds-1"].equals(sample_dataframe)
+
+
+def test_arrow_store_memory_maps_numeric_columns(tmp_path):
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0], "label": ["a", "b", "c"]})
+    ArrowDatasetStore(tmp_path)["ds-1"] = df
+
+    loaded = ArrowDatasetStore(tmp_path, cache_size=0)["ds-1"]
+    # Zero-copy columns are read-only views over the mapped file.
+    assert not loaded["x"].to_numpy().flags.writeable
+
+
+def test_arrow_store_projects_columns(tmp_path, sample_dataframe):
+    ArrowDatasetStore(tmp_path)["ds-1"] = sample_dataframe
+    store = ArrowDatasetStore(tmp_path, cache_size=4)
+
+    projected = store.read("ds-1", ["target", "feature1", "unknown"])
+
+    assert list(projected.columns) == ["target", "feature1"]
+    assert projected["feature1"].equals(sample_dataframe["feature1"])
+    # Projections are not cached as if they were the full frame.
+    assert store.stats()["resident_entries"] == 0
+
+
+@pytest.mark.parametrize("cache_size", [0, 4])
+def test_stores_stream_row_chunks(tmp_path, sample_dataframe, cache_size):
+    arrow = ArrowDatasetStore(tmp_path, cache_size=cache_size)
+    memory = MemoryDatasetStore()
+    for store in (arrow, memory):
+        store["ds-1"] = sample_dataframe
+
+        chunks = list(store.iter_chunks("ds-1", 4, columns=["target", "missing"]))
+
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        combined = pd.concat(chunks, ignore_index=True)
+        assert combined.equals(sample_dataframe[["target"]].reset_index(drop=True))
+        with pytest.raises(KeyError):
+            store.iter_chunks("missing", 4)
+
+
+def test_arrow_store_lru_bounds_hot_frames(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path, cache_size=1)
+    store["ds-1"] = sample_dataframe
+    store["ds-2"] = sample_dataframe
+
+    assert list(store._cache) == ["ds-2"]
+    # Evicted frames are reloaded from disk.
+    assert store["ds-1"].equals(sample_dataframe)
+    assert list(store._cache) == ["ds-1"]
+
+
+def test_arrow_store_rejects_unknown_and_unsafe_ids(tmp_path):
+    store = ArrowDatasetStore(tmp_path)
+    with pytest.raises(KeyError):
+        store["missing"]
+    with pytest.raises(KeyError):
+        store["../outside"]
+    assert "../outside" not in store
+
+
+def test_arrow_store_delete_and_clear(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path)
+    store["ds-1"] = sample_dataframe
+    store["ds-2"] = sample_dataframe
+
+    del store["ds-1"]
+    assert "ds-1" not in store
+
+    store.clear()
+    assert len(store) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_arrow_store_keeps_metadata_next_to_dataset(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path)
+    store["ds-1"] = sample_dataframe
+    assert store.read_metadata("ds-1") is None
+
+    store.write_metadata("ds-1", {"fingerprint": "abc"})
+    assert ArrowDatasetStore(tmp_path).read_metadata("ds-1") == {"fingerprint": "abc"}
+
+    # Replacing the dataset drops metadata that described the old frame.
+    store["ds-1"] = sample_dataframe.head(2)
+    assert store.read_metadata("ds-1") is None
+
+    store.write_metadata("ds-1", {"fingerprint": "def"})
+    del store["ds-1"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def _age(store, dataset_id, seconds):
+    stamp = time.time() - seconds
+    os.utime(store.directory / f"{dataset_id}.arrow", (stamp, stamp))
+
+
+def test_arrow_store_limits_files_by_recency(tmp_path, sample_dataframe):
+    store = create_dataset_store("arrow", str(tmp_path), 4, max_entries=2)
+    store["ds-1"] = sample_dataframe
+    store["ds-2"] = sample_dataframe
+    _age(store, "ds-1", 20)
+    _age(store, "ds-2", 10)
+    store["ds-1"]  # reading refreshes ds-1, so ds-2 is now the oldest
+    store["ds-3"] = sample_dataframe
+
+    assert sorted(store) == ["ds-1", "ds-3"]
+    assert not (tmp_path / "ds-2.arrow").exists()
+    assert store.stats()["evictions"] == 1
+    # Another worker sharing the directory no longer sees it either.
+    with pytest.raises(KeyError):
+        ArrowDatasetStore(tmp_path)["ds-2"]
+
+
+def test_arrow_store_limits_files_by_bytes(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path)
+    store["ds-1"] = sample_dataframe
+    file_bytes = (tmp_path / "ds-1.arrow").stat().st_size
+    _age(store, "ds-1", 10)
+
+    store = ArrowDatasetStore(tmp_path, max_bytes=file_bytes)
+    store["ds-2"] = sample_dataframe
+
+    assert list(store) == ["ds-2"]
+    assert store.stats()["disk_bytes"] == file_bytes
+
+
+def test_arrow_store_expires_idle_files(tmp_path, sample_dataframe):
+    store = ArrowDatasetStore(tmp_path, ttl_seconds=60)
+    store["ds-1"] = sample_dataframe
+    store.write_metadata("ds-1", {"fingerprint": "abc"})
+    store["ds-2"] = sample_dataframe
+    _age(store, "ds-1", 120)
+
+    assert "ds-1" not in store
+    with pytest.raises(KeyError):
+        store["ds-1"]  # also dropped from the hot-frame cache
+    assert not (tmp_path / "ds-1.json").exists()
+    assert list(store) == ["ds-2"]
+    assert store.stats()["evictions"] == 1
+
+
+
+def test_arrow_store_stores_mixed_object_columns_as_strings(tmp_path):
+    df = pd.DataFrame({"code": pd.Series([1, 2, "A12", None], dtype=object), "x": [1, 2, 3, 4]})
+    ArrowDatasetStore(tmp_path)["ds-1"] = df
+
+    loaded = ArrowDatasetStore(tmp_path, cache_size=0)["ds-1"]
+    assert loaded["code"].tolist()[:3] == ["1", "2", "A12"]
+    assert pd.isna(loaded["code"].iloc[3])
+    assert loaded["x"].tolist() == [1, 2, 3, 4]
+
+
+def test_arrow_store_names_columns_it_cannot_store(tmp_path):
+    df = pd.DataFrame({"x": [1, 2], "z": [1 + 2j, 3j]})
+    with pytest.raises(ValueError, match="Column 'z'"):
+        ArrowDatasetStore(tmp_path)["ds-1"] = df
+    assert "ds-1" not in ArrowDatasetStore(tmp_path)
+
+def test_dataset_store_base_is_abstract():
+    with pytest.raises(TypeError):
+        DatasetStore()
+
+
+def test_create_dataset_store_selects_backend(tmp_path):
+    assert isinstance(create_dataset_store("memory", str(tmp_path), 4), MemoryDatasetStore)
+    assert isinstance(create_dataset_store("arrow", str(tmp_path), 4), ArrowDatasetStore)
+    with pytest.raises(ValueError, match="Unsupported dataset store backend"):
+        create_dataset_store("redis", str(tmp_path), 4)
+
+
+def test_memory_store_evicts_by_bytes_and_reports_occupancy(sample_dataframe):
+    frame_bytes = int(sample_dataframe.memory_usage(index=True, deep=True).sum())
+    store = MemoryDatasetStore(max_bytes=frame_bytes * 2)
+    for dataset_id in ("ds-1", "ds-2", "ds-3"):
+        store[dataset_id] = sample_dataframe
+
+    assert list(store) == ["ds-2", "ds-3"]
+    stats = store.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == frame_bytes * 2
+    assert stats["evictions"] == 1
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from app.services.inference_plan import compile_inference_plan
+
+
+@pytest.fixture()
+def training_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "age": [20.0, 35.0, 50.0, 41.0],
+            "income": [1.0, 4.0, 2.5, 3.0],
+            "city": ["paris", "rome", "oslo", "rome"],
+        }
+    )
+
+
+def _reference_transform(records, fills, preprocessors, ohe_columns):
+    """The per-request pandas pipeline the plan replaces."""
+    df = pd.DataFrame(records)[["age", "income", "city"]].copy()
+    for col in ("age", "income"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(fills[col])
+    df["city"] = df["city"].fillna(fills["city"]).astype(str)
+    for _, cols, scaler in preprocessors:
+        df[cols] = scaler.transform(df[cols])
+    df = pd.get_dummies(df, drop_first=False)
+    return df.reindex(columns=ohe_columns, fill_value=0).to_numpy(dtype=np.float64)
+
+
+def test_plan_matches_pandas_pipeline(training_frame):
+    numeric = ["age", "income"]
+    standardize = StandardScaler().fit(training_frame[numeric])
+    scaled = training_frame.copy()
+    scaled[numeric] = standardize.transform(training_frame[numeric])
+    normalize = MinMaxScaler().fit(scaled[["income"]])
+    preprocessors = [("standardize", numeric, standardize), ("normalize", ["income"], normalize)]
+    ohe_columns = list(pd.get_dummies(training_frame).columns)
+    fills = {"age": 38.0, "income": 2.75, "city": "rome"}
+
+    plan = compile_inference_plan(
+        feature_columns=["age", "income", "city"],
+        numeric_fill={"age": fills["age"], "income": fills["income"]},
+        categorical_fill={"city": fills["city"]},
+        preprocessors=preprocessors,
+        output_columns=ohe_columns,
+    )
+    records = [
+        {"age": 30, "income": "2", "city": "oslo"},
+        {"age": None, "income": "n/a", "city": None},
+        {"age": "44", "income": 9.5, "city": "berlin"},
+    ]
+
+    expected = _reference_transform(records, fills, preprocessors, ohe_columns)
+    np.testing.assert_allclose(plan.transform(records), expected)
+
+
+def test_plan_reports_missing_columns(training_frame):
+    plan = compile_inference_plan(
+        feature_columns=["age", "city"],
+        numeric_fill={"age": 1.0},
+        categorical_fill={"city": "rome"},
+        preprocessors=[],
+        output_columns=["age", "city_paris", "city_rome"],
+    )
+    with pytest.raises(ValueError, match="Missing feature columns: city"):
+        plan.transform([{"age": 1}])
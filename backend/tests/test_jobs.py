@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.schemas.pipeline import (
+    JobStatus,
+    ModelType,
+    PipelineRunRequest,
+    PreprocessStep,
+    PreprocessType,
+    PreviewConfig,
+    StageProgress,
+    StageStatus,
+    TrainTestConfig,
+)
+from app.services import dataset_service, job_service, pipeline_service
+from app.services.pipeline_executor import PipelineExecutor, PipelineQueueFullError
+
+
+def _request(df: pd.DataFrame, target: str = "target") -> PipelineRunRequest:
+    dataset_service._dataset_store["job-dataset"] = df
+    return PipelineRunRequest(
+        dataset_id="job-dataset",
+        target_column=target,
+        feature_columns=["feature1", "feature2"],
+        preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+        split=TrainTestConfig(test_size=0.34, random_state=0),
+        model=ModelType.logistic_regression,
+    )
+
+
+async def _submit_and_wait(request: PipelineRunRequest, cancel: bool = False):
+    job = await job_service.submit_job(request)
+    if cancel:
+        job_service.cancel_job(job.job_id)
+    await asyncio.gather(*job_service._job_tasks)
+    return job, job_service.get_job(job.job_id)
+
+
+def test_job_runs_to_completion_with_stage_timings(sample_dataframe):
+    submitted, job = asyncio.run(_submit_and_wait(_request(sample_dataframe)))
+
+    assert submitted.status == JobStatus.queued
+    assert job.status == JobStatus.succeeded
+    assert job.result is not None and job.result.model_id
+    assert job.started_at is not None and job.finished_at is not None
+    stages = {stage.name: stage for stage in job.stages}
+    assert stages["fit"].status == StageStatus.done
+    assert stages["fit"].duration_ms is not None
+    assert stages["save"].status == StageStatus.done
+
+
+def test_job_cancelled_before_first_stage(sample_dataframe):
+    _, job = asyncio.run(_submit_and_wait(_request(sample_dataframe), cancel=True))
+
+    assert job.status == JobStatus.cancelled
+    assert job.cancel_requested
+    assert job.result is None
+
+
+def test_job_records_validation_errors(sample_dataframe):
+    _, job = asyncio.run(_submit_and_wait(_request(sample_dataframe, target="missing")))
+
+    assert job.status == JobStatus.failed
+    assert job.error == "Target column not found in dataset."
+    # The stage that raised is not left "running".
+    stages = {stage.name: stage for stage in job.stages}
+    assert stages["prepare"].status == StageStatus.failed
+    assert stages["prepare"].duration_ms is not None
+    assert stages["impute"].status == StageStatus.pending
+
+
+def test_submit_job_rejects_when_too_many_active(sample_dataframe, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ACTIVE", 0)
+
+    with pytest.raises(PipelineQueueFullError):
+        asyncio.run(job_service.submit_job(_request(sample_dataframe)))
+
+
+def test_jobs_wait_for_a_free_executor_worker(client, sample_dataframe, monkeypatch):
+    executor = PipelineExecutor("thread", max_concurrency=1, queue_size=0)
+    monkeypatch.setattr(pipeline_service, "_pipeline_executor", executor)
+    request = _request(sample_dataframe)
+    # Distinct requests so no job is served from the result cache.
+    payloads = [
+        request.model_copy(update={"split": TrainTestConfig(test_size=0.34, random_state=seed)})
+        for seed in range(3)
+    ]
+
+    job_ids = []
+    for payload in payloads:
+        submitted = client.post("/api/pipeline/jobs", json=payload.model_dump(mode="json"))
+        assert submitted.status_code == 202
+        job_ids.append(submitted.json()["job_id"])
+
+    deadline = time.monotonic() + 30
+    while True:
+        jobs = [client.get(f"/api/pipeline/jobs/{job_id}").json() for job_id in job_ids]
+        if all(job["status"] not in ("queued", "running") for job in jobs) or (
+            time.monotonic() > deadline
+        ):
+            break
+        time.sleep(0.05)
+
+    assert [job["status"] for job in jobs] == ["succeeded"] * 3
+    assert executor.stats()["rejected"] == 0
+    executor.shutdown()
+
+
+def test_job_routes(client, sample_dataframe):
+    request = _request(sample_dataframe).model_dump(mode="json")
+
+    submitted = client.post("/api/pipeline/jobs", json=request)
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    polled = client.get(f"/api/pipeline/jobs/{job_id}")
+    assert polled.status_code == 200
+    assert polled.json()["job_id"] == job_id
+
+    assert client.get("/api/pipeline/jobs/unknown").status_code == 404
+    assert client.delete("/api/pipeline/jobs/unknown").status_code == 404
+
+
+def test_job_stages_report_shape_and_memory(sample_dataframe):
+    _, job = asyncio.run(_submit_and_wait(_request(sample_dataframe)))
+
+    stages = {stage.name: stage for stage in job.stages}
+    assert (stages["prepare"].rows, stages["prepare"].columns) == (6, 2)
+    assert stages["split"].rows == 3
+    # Memory is only traced for diagnostics runs.
+    assert stages["fit"].peak_memory_bytes is None
+
+    request = _request(sample_dataframe).model_copy(update={"collect_diagnostics": True})
+    _, job = asyncio.run(_submit_and_wait(request))
+
+    stages = {stage.name: stage for stage in job.stages}
+    run_peak = job.result.diagnostics.peak_memory_bytes
+    for name in ("split", "fit", "evaluate"):  # feature stages come from the preprocess cache
+        assert 0 < stages[name].peak_memory_bytes <= run_peak
+
+
+def test_job_events_stream(client, sample_dataframe):
+    request = _request(sample_dataframe).model_dump(mode="json")
+    job_id = client.post("/api/pipeline/jobs", json=request).json()["job_id"]
+
+    with client.stream("GET", f"/api/pipeline/jobs/{job_id}/events") as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = "".join(resp.iter_text())
+
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    assert names[-1] == "end"
+    assert names.count("stage") == 10
+    end = json.loads(events[-1][1].removeprefix("data: "))
+    assert end["status"] == "succeeded"
+
+    assert client.get("/api/pipeline/jobs/unknown/events").status_code == 404
+
+
+def test_preview_job_refines_on_larger_samples(monkeypatch):
+    monkeypatch.setattr(settings, "PREVIEW_REFINE_FRACTIONS", [0.5, 1.0])
+    df = pd.DataFrame(
+        {
+            "feature1": range(200),
+            "feature2": [i % 7 for i in range(200)],
+            "target": [int(i >= 100) for i in range(200)],
+        }
+    )
+    request = _request(df).model_copy(
+        update={"preview": PreviewConfig(sample_fraction=0.25, refine=True)}
+    )
+
+    _, job = asyncio.run(_submit_and_wait(request))
+
+    assert job.status == JobStatus.succeeded
+    assert job.result.preview.final
+    assert job.result.preview.sample_rows == job.result.preview.training_rows
+    events = job_service._jobs[job.job_id].events
+    results = [event for event in events if not isinstance(event, StageProgress)]
+    assert [round(r.preview.sample_fraction, 2) for r in results] == [0.25, 0.5]
+    assert all(r.preview.accuracy_low <= r.accuracy <= r.preview.accuracy_high for r in results)
@@ -0,0 +1,64 @@
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, gauge_family
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("op_seconds", "Op latency.", buckets=(0.1, 1.0), labelnames=("op",))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.5, "read")
+    histogram.observe(5, "read")
+
+    text = registry.render()
+
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="read",le="1.0"} 2' in text
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 3' in text
+    assert 'op_seconds_sum{op="read"} 5.55' in text
+    assert 'op_seconds_count{op="read"} 3' in text
+
+
+def test_counter_and_collectors_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("items_total", "Items.")
+    counter.inc(2)
+    counter.inc()
+    registry.register_collector(
+        lambda: [gauge_family("depth", 'Queue "depth".', [({"q": 'a"b'}, 4), ({"q": "c"}, None)])]
+    )
+
+    text = registry.render()
+
+    assert "items_total 3" in text
+    assert 'depth{q="a\\"b"} 4' in text
+    assert 'q="c"' not in text
+    with pytest.raises(ValueError):
+        registry.counter("items_total", "Duplicate.")
+
+
+def test_metrics_endpoint_reports_requests_and_uploads(client, sample_csv_bytes):
+    client.get("/api/health")
+    client.post(
+        "/api/datasets/upload", files={"file": ("data.csv", sample_csv_bytes, "text/csv")}
+    )
+
+    resp = client.get("/api/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"}' in text
+    assert 'route="/api/datasets/upload"' in text
+    assert "dataset_upload_bytes_total" in text
+    assert "dataset_store_entries 1" in text
+    assert 'pipeline_executor_in_flight{backend="thread"} 0' in text
+    assert "# TYPE pipeline_cache_evictions_total counter" in text
+    assert "# TYPE pipeline_executor_rejected_total counter" in text
+
+
+def test_metrics_endpoint_requires_api_key(client):
+    resp = client.get("/api/metrics", headers={"X-API-Key": settings.API_KEY + "-wrong"})
+    assert resp.status_code == 401
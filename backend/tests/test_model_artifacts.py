@@ -1,6 +1,11 @@
+import pickle
+from pathlib import Path
+
 import pandas as pd
 
-from app.services import dataset_service
+from app.core.config import settings
+from app.services import dataset_service, pipeline_service
+from app.services.model_store import create_model_store
 
 
 def _store_dataset(df: pd.DataFrame) -> str:
@@ -72,3 +77,81 @@ def test_predict_endpoint_uses_trained_model(client):
     preds = predict_resp.json()["predictions"]
     assert isinstance(preds, list)
     assert len(preds) == 1
+
+
+def test_model_download_supports_etag_and_ranges(client):
+    df = pd.DataFrame(
+        {
+            "f1": [1, 2, 3, 4, 5, 6, 7, 8],
+            "f2": [0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9],
+            "target": [0, 1, 0, 1, 0, 1, 0, 1],
+        }
+    )
+    payload = {
+        "dataset_id": _store_dataset(df),
+        "target_column": "target",
+        "preprocess": [],
+        "split": {"test_size": 0.25, "random_state": 0},
+        "model": "decision_tree",
+    }
+    path = client.post("/api/pipeline/run", json=payload).json()["model_download_path"]
+
+    full = client.get(path)
+    assert full.status_code == 200
+    assert int(full.headers["content-length"]) == len(full.content)
+    assert "attachment" in full.headers["content-disposition"]
+    artifact = pickle.loads(full.content)
+    assert artifact.model_type.value == "decision_tree"
+
+    etag = full.headers["etag"]
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    partial = client.get(path, headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.content == full.content[:10]
+    assert client.get(path).content == full.content
+
+    assert client.get("/api/pipeline/model/unknown/download").status_code == 404
+
+
+def _train(client, model: str = "decision_tree") -> dict:
+    df = pd.DataFrame({"f1": range(8), "target": [0, 1] * 4})
+    payload = {
+        "dataset_id": _store_dataset(df),
+        "target_column": "target",
+        "split": {"test_size": 0.25, "random_state": 0},
+        "model": model,
+    }
+    return client.post("/api/pipeline/run", json=payload).json()
+
+
+def test_model_download_is_served_from_existing_file(client, monkeypatch):
+    path = _train(client)["model_download_path"]
+    first = client.get(path)
+
+    def no_lookup(model_id):
+        raise AssertionError("the store should not be read for an existing download")
+
+    monkeypatch.setattr(pipeline_service, "_get_model", no_lookup)
+    again = client.get(path)
+
+    assert again.status_code == 200
+    assert again.content == first.content
+    assert client.get("/api/pipeline/model/..%2Fsecret/download").status_code == 404
+
+
+def test_model_downloads_are_removed_with_their_model(client, monkeypatch):
+    store = create_model_store(
+        "memory", "", 0, max_entries=1, on_remove=pipeline_service._remove_download
+    )
+    monkeypatch.setattr(pipeline_service, "_model_store", store)
+    monkeypatch.setattr(settings, "PIPELINE_RESULT_CACHE_ENABLED", False)
+    first = _train(client)
+    assert client.get(first["model_download_path"]).status_code == 200
+    download = Path(settings.MODEL_DOWNLOAD_DIR) / f"model-{first['model_id']}.pkl"
+    assert download.exists()
+
+    _train(client, model="logistic_regression")  # evicts the first model
+
+    assert not download.exists()
+    assert client.get(first["model_download_path"]).status_code == 404
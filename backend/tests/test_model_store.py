@@ -0,0 +1,134 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.schemas.pipeline import ModelType, PipelineRunRequest, TrainTestConfig
+from app.services import dataset_service, pipeline_service
+from app.services.model_store import (
+    DiskModelStore,
+    MemoryModelStore,
+    ModelStore,
+    create_model_store,
+)
+
+
+def test_memory_store_keeps_metadata_and_evicts():
+    store = MemoryModelStore(max_entries=1, sizeof=lambda artifact: 10)
+    store.save("a", "model-a", {"model_type": "decision_tree"})
+    assert store.metadata("a") == {"model_type": "decision_tree", "size_bytes": 10}
+
+    store.save("b", "model-b")
+
+    assert "a" not in store
+    assert store["b"] == "model-b"
+    with pytest.raises(KeyError):
+        store.metadata("a")
+
+
+def test_disk_store_round_trip_is_visible_to_other_instances(tmp_path):
+    weights = np.arange(100_000, dtype=np.float64)
+    DiskModelStore(tmp_path).save("m1", {"weights": weights}, {"model_type": "logistic_regression"})
+
+    # A fresh instance (another worker, or after a restart) loads lazily.
+    other = DiskModelStore(tmp_path)
+    assert other.stats()["resident_entries"] == 0
+    loaded = other["m1"]
+
+    assert isinstance(loaded["weights"], np.memmap)
+    np.testing.assert_array_equal(loaded["weights"], weights)
+    metadata = other.metadata("m1")
+    assert metadata["model_type"] == "logistic_regression"
+    assert metadata["size_bytes"] == (tmp_path / "m1.joblib").stat().st_size
+    assert list(other) == ["m1"]
+
+
+def test_disk_store_delete_and_invalid_ids(tmp_path):
+    store = DiskModelStore(tmp_path, cache_size=0)
+    store["m1"] = {"weights": [1, 2]}
+
+    del store["m1"]
+
+    assert "m1" not in store
+    assert not list(tmp_path.iterdir())
+    with pytest.raises(KeyError):
+        store["../m1"]
+    with pytest.raises(KeyError):
+        store["missing"]
+
+
+def test_stores_report_evicted_and_removed_models(tmp_path):
+    evicted, removed = [], []
+    memory = MemoryModelStore(max_entries=1, on_remove=removed.append, on_evict=evicted.append)
+    memory["a"] = 1
+    memory["b"] = 2
+    del memory["b"]
+    assert (evicted, removed) == (["a"], ["a", "b"])
+
+    evicted.clear()
+    removed.clear()
+    disk = DiskModelStore(tmp_path, cache_size=1, on_remove=removed.append, on_evict=evicted.append)
+    disk["a"] = 1
+    disk["b"] = 2
+    # Only the hot cache evicts; the model stays on disk until deleted.
+    assert (evicted, removed) == (["a"], [])
+    del disk["a"]
+    assert removed == ["a"]
+
+
+def test_model_store_base_is_abstract():
+    with pytest.raises(TypeError):
+        ModelStore()
+
+
+def test_create_model_store_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        create_model_store("redis", str(tmp_path), 4)
+
+
+def test_pipeline_serves_models_from_disk_store(tmp_path, monkeypatch, sample_dataframe):
+    monkeypatch.setattr(pipeline_service, "_model_store", DiskModelStore(tmp_path))
+    dataset_service._dataset_store["disk-models"] = sample_dataframe
+    request = PipelineRunRequest(
+        dataset_id="disk-models",
+        target_column="target",
+        split=TrainTestConfig(test_size=0.34, random_state=0),
+        model=ModelType.decision_tree,
+    )
+
+    model_id = asyncio.run(pipeline_service.run_pipeline(request)).model_id
+    # Simulate a restarted worker: only the files on disk remain.
+    monkeypatch.setattr(pipeline_service, "_model_store", DiskModelStore(tmp_path))
+
+    prediction = asyncio.run(
+        pipeline_service.predict(model_id, [{"feature1": 2, "feature2": 0.2}])
+    )
+    metadata = pipeline_service.get_model_metadata(model_id)
+
+    assert len(prediction.predictions) == 1
+    assert metadata["model_id"] == model_id
+    assert metadata["dataset_fingerprint"] == dataset_service.dataset_fingerprint(sample_dataframe)
+    assert metadata["request"]["target_column"] == "target"
+    assert metadata["metrics"]["accuracy"] is not None
+
+
+def test_model_metadata_route(client, sample_dataframe):
+    dataset_service._dataset_store["route-models"] = sample_dataframe
+    run = client.post(
+        "/api/pipeline/run",
+        json={
+            "dataset_id": "route-models",
+            "target_column": "target",
+            "preprocess": [],
+            "split": {"test_size": 0.34, "random_state": 0},
+            "model": "logistic_regression",
+        },
+    )
+    model_id = run.json()["model_id"]
+
+    resp = client.get(f"/api/pipeline/model/{model_id}")
+
+    assert resp.status_code == 200
+    assert resp.json()["model_type"] == "logistic_regression"
+    assert resp.json()["size_bytes"] > 0
+    assert client.get("/api/pipeline/model/unknown").status_code == 404
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.schemas.pipeline import ModelType, PipelineRunRequest, TrainTestConfig
+from app.services import pipeline_service
+from app.services.dataset_store import ArrowDatasetStore
+from app.services.pipeline_executor import (
+    REJECTED,
+    PipelineExecutor,
+    PipelineQueueFullError,
+    create_pipeline_executor,
+)
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_workers_and_queue_are_full():
+    executor = PipelineExecutor("thread", max_concurrency=1, queue_size=1)
+    release = threading.Event()
+    rejected_before = REJECTED._values.get(("thread",), 0)
+
+    running = [asyncio.ensure_future(executor.submit(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert executor.stats()["in_flight"] == 2
+    assert executor.stats()["queued"] == 1
+
+    with pytest.raises(PipelineQueueFullError):
+        await executor.submit(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+    stats = executor.stats()
+    assert stats["in_flight"] == 0
+    assert stats["rejected"] == 1
+    assert REJECTED._values[("thread",)] == rejected_before + 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_waiting_submissions_take_the_next_free_worker():
+    executor = PipelineExecutor("thread", max_concurrency=1, queue_size=0)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.submit(release.wait))
+    waiting = asyncio.ensure_future(executor.submit(threading.get_ident, wait=True))
+    await asyncio.sleep(0.05)
+    assert executor.stats()["waiting"] == 1
+    assert not waiting.done()
+
+    release.set()
+    await asyncio.gather(running, waiting)
+    stats = executor.stats()
+    assert (stats["in_flight"], stats["waiting"], stats["rejected"]) == (0, 0, 0)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_runs_on_calling_thread():
+    executor = PipelineExecutor("inline", max_concurrency=1, queue_size=0)
+    assert await executor.submit(threading.get_ident) == threading.get_ident()
+
+
+def test_process_executor_needs_shared_dataset_store():
+    assert create_pipeline_executor("process", 2, 4, "memory").backend == "thread"
+    assert create_pipeline_executor("process", 2, 4, "arrow").backend == "process"
+    with pytest.raises(ValueError, match="Unsupported pipeline executor"):
+        PipelineExecutor("gpu", 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_process_executor_trains_from_shared_store(tmp_path, monkeypatch, sample_dataframe):
+    # Spawned workers build their own settings from the environment.
+    monkeypatch.setenv("DATASET_STORE_BACKEND", "arrow")
+    monkeypatch.setenv("DATASET_STORE_DIR", str(tmp_path))
+    ArrowDatasetStore(tmp_path)["shared-dataset"] = sample_dataframe
+
+    request = PipelineRunRequest(
+        dataset_id="shared-dataset",
+        target_column="target",
+        split=TrainTestConfig(test_size=0.34, random_state=0),
+        model=ModelType.logistic_regression,
+    )
+    executor = PipelineExecutor("process", max_concurrency=1, queue_size=0)
+    try:
+        response, artifact = await executor.submit(pipeline_service._execute_pipeline, request)
+    finally:
+        executor.shutdown()
+
+    assert response.accuracy is not None
+    assert artifact.inference_plan is not None
+    model_id = pipeline_service._complete_run(request, None, response, artifact).model_id
+    assert pipeline_service._has_model(model_id)
@@ -4,6 +4,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from app.api.routes.pipeline import router
+from app.services.pipeline_executor import PipelineQueueFullError
 from app.schemas.pipeline import (
     PipelineRunRequest,
     PipelineRunResponse,
@@ -83,6 +84,15 @@ class TestPipelineRoute:
         assert resp.status_code == 500
         assert "Pipeline execution failed" in resp.json()["detail"]
 
+    @patch("app.api.routes.pipeline.pipeline_service.run_pipeline", new_callable=AsyncMock)
+    def test_run_pipeline_queue_full_returns_503(self, mock_run, client, valid_request):
+        mock_run.side_effect = PipelineQueueFullError("Too many pipeline runs in progress.")
+
+        resp = client.post("/pipeline/run", json=valid_request)
+
+        assert resp.status_code == 503
+        assert "Too many pipeline runs" in resp.json()["detail"]
+
     def test_run_pipeline_missing_body_422(self, client):
         resp = client.post("/pipeline/run")
         assert resp.status_code == 422
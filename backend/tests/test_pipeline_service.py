@@ -1,17 +1,30 @@
 import asyncio
+import threading
 
+import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse as sp
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
 
 from app.schemas.pipeline import (
+    CategoricalEncoding,
     ConfusionMatrix,
+    MemoryMode,
+    OutOfCoreConfig,
     ModelType,
+    ParamRange,
     PipelineRunRequest,
     PreprocessStep,
     PreprocessType,
+    PreviewConfig,
+    SearchConfig,
+    SearchStrategy,
     TrainTestConfig,
 )
-from app.services import dataset_service, pipeline_service
+from app.services import dataset_service, incremental_training, pipeline_service
+from app.services.dataset_store import ArrowDatasetStore
+from app.services.progress import is_tracing_memory, traced_memory
 
 
 def _store_dataset(df: pd.DataFrame) -> str:
@@ -133,3 +146,596 @@ def test_run_pipeline_rare_classes_error_without_drop(sample_dataframe):
 
     with pytest.raises(ValueError, match="least populated classes"):
         asyncio.run(pipeline_service.run_pipeline(request))
+
+
+def test_model_store_reports_occupancy(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        feature_columns=["feature1", "feature2"],
+        split=TrainTestConfig(test_size=0.34, random_state=0),
+        model=ModelType.decision_tree,
+    )
+
+    asyncio.run(pipeline_service.run_pipeline(request))
+
+    stats = pipeline_service.get_model_store_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+
+
+def _cache_request(dataset_id: str) -> PipelineRunRequest:
+    return PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        feature_columns=["feature1", "feature2"],
+        preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+        split=TrainTestConfig(test_size=0.34, random_state=0),
+        model=ModelType.logistic_regression,
+    )
+
+
+def test_run_pipeline_reuses_cached_result(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+
+    first = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+    second = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+
+    assert second.model_id == first.model_id
+    assert second.accuracy == first.accuracy
+    stats = pipeline_service.get_result_cache_stats()
+    assert stats["hits"] >= 1
+    assert pipeline_service.get_model_store_stats()["entries"] == 1
+
+
+def test_run_pipeline_cache_is_keyed_on_dataset_content(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    first = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+
+    changed = sample_dataframe.copy()
+    changed["feature1"] = changed["feature1"] * 10
+    _store_dataset(changed)
+    second = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+
+    assert second.model_id != first.model_id
+
+
+def test_run_pipeline_cache_skips_evicted_models(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    first = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+
+    pipeline_service._clear_model_store()
+    second = asyncio.run(pipeline_service.run_pipeline(_cache_request(dataset_id)))
+
+    assert second.model_id != first.model_id
+    assert pipeline_service._has_model(second.model_id)
+
+
+def test_run_pipeline_reuses_preprocessed_features_across_models(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = _cache_request(dataset_id)
+
+    asyncio.run(pipeline_service.run_pipeline(request))
+    tree = request.model_copy(update={"model": ModelType.decision_tree})
+    response = asyncio.run(pipeline_service.run_pipeline(tree))
+
+    assert response.model_type == ModelType.decision_tree
+    stats = pipeline_service.get_preprocess_cache_stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] >= 1
+
+
+def _high_cardinality_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "num": [float(i % 7) for i in range(40)],
+            "user_id": [f"user-{i}" for i in range(40)],
+            "color": ["red", "blue"] * 20,
+            "target": [0, 1] * 20,
+        }
+    )
+
+
+def test_process_categorical_sparse_caps_levels():
+    df = _high_cardinality_frame().drop(columns="target")
+
+    matrix, columns, encoder = pipeline_service._process_categorical(
+        df, CategoricalEncoding.sparse, max_categories=5
+    )
+
+    assert sp.issparse(matrix)
+    assert matrix.shape == (40, len(columns))
+    # 4 kept user ids + 1 "other" bucket, 2 colors, 1 numeric column.
+    assert len(columns) == 1 + 5 + 2
+    assert any("infrequent" in name for name in columns)
+    assert encoder is not None
+
+
+def _fail_on_string_cast(astype):
+    def checked(values, dtype, *args, **kwargs):
+        assert getattr(dtype, "kind", None) != "U", "category column converted to strings"
+        return astype(values, dtype, *args, **kwargs)
+
+    return checked
+
+
+@pytest.mark.parametrize("encoding", [CategoricalEncoding.sparse, CategoricalEncoding.native])
+@pytest.mark.parametrize("max_categories", [None, 3])
+def test_process_categorical_encodes_category_codes_like_strings(
+    encoding, max_categories, monkeypatch
+):
+    rng = np.random.default_rng(0)
+    city = pd.Series(rng.choice(list("bacdefg"), 500, p=[0.3, 0.2, 0.2, 0.1, 0.1, 0.05, 0.05]))
+    city[::50] = np.nan
+    tie = pd.Series(rng.choice(list("xyzw"), 500))
+    as_objects = pd.DataFrame({"num": rng.normal(size=500), "city": city, "tie": tie})
+    # Unsorted and unused levels, as compaction or an Arrow dictionary may leave them.
+    as_categories = as_objects.assign(
+        city=pd.Categorical(city, categories=list("gfedcba") + ["unused"]),
+        tie=tie.astype("category"),
+    )
+    # Reference: the encoders fitted on every row's string.
+    strings = as_objects[["city", "tie"]].astype(str)
+    if encoding == CategoricalEncoding.sparse:
+        reference = OneHotEncoder(
+            max_categories=max_categories,
+            handle_unknown="infrequent_if_exist" if max_categories else "ignore",
+        ).fit(strings)
+        expected_columns = ["num", *reference.get_feature_names_out()]
+        expected = reference.transform(strings).toarray()
+    else:
+        reference = OrdinalEncoder(max_categories=max_categories or 255).fit(strings)
+        expected_columns = ["num", "city", "tie"]
+        expected = reference.transform(strings)
+
+    for frame in (as_objects, as_categories):
+        if frame is as_categories:
+            # Category columns are encoded from their codes, never per-row strings.
+            monkeypatch.setattr(pd.Categorical, "astype", _fail_on_string_cast(pd.Categorical.astype))
+        matrix, columns, encoder = pipeline_service._process_categorical(
+            frame, encoding, max_categories
+        )
+        monkeypatch.undo()
+        matrix = matrix.toarray() if sp.issparse(matrix) else matrix
+        assert columns == expected_columns
+        np.testing.assert_array_equal(matrix[:, 1:], expected)
+        # The stored encoder still maps the raw strings seen at prediction time.
+        encoded = encoder.transform(strings)
+        encoded = encoded.toarray() if sp.issparse(encoded) else encoded
+        np.testing.assert_array_equal(encoded, expected)
+
+
+def test_run_pipeline_sparse_encoding_trains_and_predicts():
+    dataset_id = _store_dataset(_high_cardinality_frame())
+
+    for model in (ModelType.logistic_regression, ModelType.decision_tree):
+        request = PipelineRunRequest(
+            dataset_id=dataset_id,
+            target_column="target",
+            split=TrainTestConfig(test_size=0.25, random_state=0),
+            model=model,
+            categorical_encoding=CategoricalEncoding.sparse,
+            max_categories=10,
+        )
+        response = asyncio.run(pipeline_service.run_pipeline(request))
+        assert response.accuracy is not None
+
+        prediction = asyncio.run(
+            pipeline_service.predict(
+                response.model_id,
+                [{"num": 3, "user_id": "never-seen", "color": "red"}, {"num": None, "user_id": "user-1", "color": None}],
+            )
+        )
+        assert len(prediction.predictions) == 2
+
+
+def _mixed_dataframe(rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"num_{i}": rng.normal(size=rows) for i in range(4)})
+    df.loc[rng.random(rows) < 0.1, "num_0"] = np.nan
+    df["city"] = rng.choice(["north", "south", None], rows)
+    df["tier"] = pd.Categorical(rng.choice(["gold", "basic"], rows), categories=["basic", "gold", "unused"])
+    df["target"] = rng.choice(["a", "b"], rows)
+    return df
+
+
+@pytest.mark.parametrize("model", list(ModelType))
+def test_lean_memory_mode_matches_standard_pipeline(model, monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "PIPELINE_RESULT_CACHE_ENABLED", False)
+    monkeypatch.setattr(pipeline_service.settings, "PREPROCESS_CACHE_ENABLED", False)
+    df = _mixed_dataframe()
+    dataset_id = _store_dataset(df)
+    responses = {}
+    for mode in (MemoryMode.standard, MemoryMode.lean):
+        request = PipelineRunRequest(
+            dataset_id=dataset_id,
+            target_column="target",
+            preprocess=[
+                PreprocessStep(step=PreprocessType.standardize),
+                PreprocessStep(step=PreprocessType.normalize, columns=["num_1", "num_3"]),
+            ],
+            model=model,
+            memory_mode=mode,
+        )
+        responses[mode] = pipeline_service._run_pipeline_sync(request)
+
+    standard, lean = responses[MemoryMode.standard], responses[MemoryMode.lean]
+    assert lean.accuracy == standard.accuracy
+    assert lean.confusion_matrix == standard.confusion_matrix
+    assert [f.name for f in lean.feature_importances] == [f.name for f in standard.feature_importances]
+    records = df.drop(columns="target").head(20).astype(object)
+    records = records.where(records.notna(), None).to_dict(orient="records")
+    assert (
+        pipeline_service._predict_sync(lean.model_id, records).predictions
+        == pipeline_service._predict_sync(standard.model_id, records).predictions
+    )
+
+
+def test_collect_diagnostics_reports_lean_memory_reduction(monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "PIPELINE_RESULT_CACHE_ENABLED", False)
+    monkeypatch.setattr(pipeline_service.settings, "PREPROCESS_CACHE_ENABLED", False)
+    dataset_id = _store_dataset(_mixed_dataframe(rows=20_000))
+    diagnostics = {}
+    for mode in (MemoryMode.standard, MemoryMode.lean):
+        request = PipelineRunRequest(
+            dataset_id=dataset_id,
+            target_column="target",
+            preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+            model=ModelType.logistic_regression,
+            memory_mode=mode,
+            collect_diagnostics=True,
+        )
+        diagnostics[mode] = pipeline_service._run_pipeline_sync(request).diagnostics
+
+    assert diagnostics[MemoryMode.lean].memory_mode == MemoryMode.lean
+    assert diagnostics[MemoryMode.lean].input_bytes > 0
+    assert (
+        diagnostics[MemoryMode.lean].peak_memory_bytes
+        < diagnostics[MemoryMode.standard].peak_memory_bytes
+    )
+
+
+def test_collect_diagnostics_skips_tracing_while_another_run_is_traced(monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "PIPELINE_RESULT_CACHE_ENABLED", False)
+    dataset_id = _store_dataset(_mixed_dataframe(rows=200))
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        model=ModelType.logistic_regression,
+        collect_diagnostics=True,
+    )
+    tracing, release = threading.Event(), threading.Event()
+
+    def other_run():
+        with traced_memory():
+            tracing.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=other_run)
+    thread.start()
+    try:
+        assert tracing.wait(10)
+        assert not is_tracing_memory()
+        concurrent = pipeline_service._run_pipeline_sync(request).diagnostics
+    finally:
+        release.set()
+        thread.join()
+
+    assert concurrent.peak_memory_bytes is None
+    assert concurrent.peak_to_input_ratio is None
+    assert pipeline_service._run_pipeline_sync(request).diagnostics.peak_memory_bytes > 0
+
+
+def test_lean_memory_mode_reads_only_projected_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_service, "_dataset_store", ArrowDatasetStore(tmp_path, cache_size=0))
+    dataset_id = "arrow-dataset"
+    dataset_service._store_dataset(dataset_id, _mixed_dataframe(rows=200))
+    full_loads = []
+    original = ArrowDatasetStore.__getitem__
+    monkeypatch.setattr(
+        ArrowDatasetStore,
+        "__getitem__",
+        lambda store, key: full_loads.append(key) or original(store, key),
+    )
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        feature_columns=["num_1", "city"],
+        model=ModelType.logistic_regression,
+        memory_mode=MemoryMode.lean,
+        collect_diagnostics=True,
+    )
+
+    response = pipeline_service._run_pipeline_sync(request)
+
+    # Fingerprint, profile and input size come from the stored metadata.
+    assert full_loads == []
+    assert response.diagnostics.input_bytes > 0
+    metadata = pipeline_service.get_model_metadata(response.model_id)
+    assert metadata["dataset_fingerprint"] == dataset_service.stored_fingerprint(dataset_id)
+
+
+@pytest.mark.parametrize("strategy", list(SearchStrategy))
+def test_search_mode_picks_best_candidate_and_reports_scores(strategy, monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "SEARCH_N_JOBS", 1)
+    dataset_id = _store_dataset(_mixed_dataframe(rows=300))
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        model=ModelType.decision_tree,
+        search=SearchConfig(
+            param_grid={
+                "max_depth": [1, 3, None],
+                "min_samples_leaf": ParamRange(low=1, high=20, num=3, integer=True),
+            },
+            cv=3,
+            strategy=strategy,
+        ),
+    )
+
+    response = pipeline_service._run_pipeline_sync(request)
+
+    search = response.search
+    assert search.n_candidates == 9
+    assert [c.rank for c in search.candidates] == list(range(1, 10))
+    assert search.candidates[0].params == search.best_params
+    if strategy == SearchStrategy.halving:
+        # Weak candidates were dropped on a subsample of the training rows.
+        assert min(c.n_samples for c in search.candidates) < search.candidates[0].n_samples
+    model = pipeline_service._get_model(response.model_id).model
+    assert model.get_params()["max_depth"] == search.best_params["max_depth"]
+    metadata = pipeline_service.get_model_metadata(response.model_id)
+    assert metadata["metrics"]["cv_accuracy"] == search.best_score
+
+
+def test_search_mode_rejects_unknown_parameters(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        model=ModelType.logistic_regression,
+        search=SearchConfig(param_grid={"n_jobs": [1, 2]}),
+    )
+
+    with pytest.raises(ValueError, match="Cannot tune n_jobs"):
+        pipeline_service._run_pipeline_sync(request)
+
+
+@pytest.mark.parametrize(
+    "param_grid",
+    [
+        {"n_estimators": [10, 10**6]},
+        {"max_depth": ParamRange(low=1, high=500, num=3, integer=True)},
+        {"max_depth": ["deep"]},
+    ],
+)
+def test_search_mode_rejects_out_of_bounds_values(sample_dataframe, param_grid):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        model=ModelType.random_forest,
+        search=SearchConfig(param_grid=param_grid),
+    )
+
+    with pytest.raises(ValueError, match="must be numbers between 1 and"):
+        pipeline_service._run_pipeline_sync(request)
+
+
+@pytest.mark.parametrize(
+    ("configured", "cap", "expected"), [(None, 3, 3), (-1, 2, 2), (8, 2, 2), (1, 4, 1)]
+)
+def test_search_parallelism_respects_thread_cap(monkeypatch, configured, cap, expected):
+    monkeypatch.setattr(pipeline_service.settings, "SEARCH_N_JOBS", configured)
+    monkeypatch.setattr(pipeline_service.settings, "MODEL_MAX_THREADS", cap)
+
+    assert pipeline_service._search_n_jobs() == expected
+
+
+def test_hist_gradient_boosting_uses_native_categories():
+    df = _mixed_dataframe()
+    dataset_id = _store_dataset(df)
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+        model=ModelType.hist_gradient_boosting,
+    )
+
+    response = asyncio.run(pipeline_service.run_pipeline(request))
+    artifact = pipeline_service._get_model(response.model_id)
+
+    # One column per feature instead of one per level.
+    assert artifact.ohe_columns == ["num_0", "num_1", "num_2", "num_3", "city", "tier"]
+    assert list(artifact.model.is_categorical_) == [False] * 4 + [True] * 2
+    assert response.feature_importances
+
+    # The compiled plan turns raw records into the training matrix.
+    prepared = pipeline_service._compute_features(request)
+    records = df.drop(columns="target").to_dict("records")
+    np.testing.assert_allclose(artifact.inference_plan.transform(records), prepared.df_features)
+
+    unseen = asyncio.run(
+        pipeline_service.predict(
+            response.model_id,
+            [{"num_0": 1, "num_1": 0, "num_2": 0, "num_3": 0, "city": "east", "tier": None}],
+        )
+    )
+    assert len(unseen.predictions) == 1
+
+
+def test_native_encoding_requires_hist_gradient_boosting(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        model=ModelType.decision_tree,
+        categorical_encoding=CategoricalEncoding.native,
+    )
+
+    with pytest.raises(ValueError, match="only supported by hist_gradient_boosting"):
+        pipeline_service._run_pipeline_sync(request)
+
+
+def test_random_forest_respects_thread_cap(monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "MODEL_MAX_THREADS", 1)
+    dataset_id = _store_dataset(_mixed_dataframe())
+    request = PipelineRunRequest(
+        dataset_id=dataset_id, target_column="target", model=ModelType.random_forest
+    )
+
+    response = asyncio.run(pipeline_service.run_pipeline(request))
+
+    artifact = pipeline_service._get_model(response.model_id)
+    assert artifact.model.n_jobs == 1
+    assert response.feature_importances
+
+
+def _separable_dataframe(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"x": rng.normal(size=rows), "noise": rng.normal(size=rows)})
+    df["shade"] = rng.choice(["dark", "light"], rows)
+    df["target"] = np.where(df["x"] + (df["shade"] == "dark") > 0.5, "yes", "no")
+    df.loc[rng.random(rows) < 0.05, "x"] = np.nan
+    return df
+
+
+def _out_of_core_request(dataset_id: str, **options) -> PipelineRunRequest:
+    return PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        preprocess=[PreprocessStep(step=PreprocessType.standardize)],
+        model=ModelType.sgd_classifier,
+        memory_mode=MemoryMode.out_of_core,
+        out_of_core=OutOfCoreConfig(chunk_rows=500, epochs=3),
+        **options,
+    )
+
+
+def test_out_of_core_training_streams_chunks_and_predicts():
+    df = _separable_dataframe(3000)
+    dataset_id = _store_dataset(df)
+
+    response = asyncio.run(pipeline_service.run_pipeline(_out_of_core_request(dataset_id)))
+
+    assert response.accuracy > 0.85
+    assert response.confusion_matrix.labels == ["no", "yes"]
+    # Every held-out row is counted once.
+    assert 450 < np.sum(response.confusion_matrix.matrix) < 750
+    artifact = pipeline_service._get_model(response.model_id)
+    assert artifact.ohe_columns == ["x", "noise", "shade_dark", "shade_light"]
+    # The scaler was fitted incrementally on mean-filled values.
+    x = df["x"].fillna(df["x"].mean())
+    np.testing.assert_allclose(artifact.preprocessors[0][2].mean_[0], x.mean())
+
+    prediction = asyncio.run(
+        pipeline_service.predict(
+            response.model_id,
+            [{"x": 3.0, "noise": 0, "shade": "dark"}, {"x": -3.0, "noise": None, "shade": "unseen"}],
+        )
+    )
+    assert prediction.predictions == ["yes", "no"]
+
+
+def test_out_of_core_memory_does_not_grow_with_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_service, "_dataset_store", ArrowDatasetStore(tmp_path, cache_size=0))
+    peaks = []
+    # The first run also pays for one-off allocations (imports, caches).
+    for rows in (1000, 4000, 16000):
+        dataset_id = _store_dataset(_separable_dataframe(rows))
+        response = pipeline_service._run_pipeline_sync(
+            _out_of_core_request(dataset_id, collect_diagnostics=True)
+        )
+        peaks.append(response.diagnostics.peak_memory_bytes)
+
+    # 4x the rows, roughly the same peak (one chunk plus the model).
+    assert peaks[2] < peaks[1] * 2
+    assert response.diagnostics.peak_to_input_ratio < 0.2
+
+
+@pytest.mark.parametrize("max_categories", [None, 2, 3, 4])
+def test_out_of_core_categories_match_in_memory_sparse_encoding(max_categories):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "x": rng.normal(size=600),
+            "city": rng.choice(list("abcdefg"), 600, p=[0.3, 0.2, 0.2, 0.1, 0.1, 0.05, 0.05]),
+            "tie": rng.choice(list("wxyz"), 600),
+            "target": rng.choice(["yes", "no"], 600),
+        }
+    )
+    df.loc[::40, "city"] = np.nan
+    chunks = [df.iloc[start : start + 250] for start in range(0, len(df), 250)]
+    stats = incremental_training.collect_statistics(chunks, "target")
+    encoder = incremental_training.build_chunk_encoder(stats, "target", max_categories, [])
+
+    features = df.drop(columns="target")
+    features["city"] = features["city"].fillna(features["city"].mode()[0])
+    matrix, columns, _ = pipeline_service._process_categorical(
+        features, CategoricalEncoding.sparse, max_categories
+    )
+
+    assert encoder.output_columns == columns
+    streamed = sp.vstack([encoder.transform(chunk)[0] for chunk in chunks])
+    np.testing.assert_array_equal(streamed.toarray()[:, 1:], matrix.toarray()[:, 1:])
+
+def test_out_of_core_requires_sgd_classifier(sample_dataframe):
+    dataset_id = _store_dataset(sample_dataframe)
+    request = _out_of_core_request(dataset_id).model_copy(update={"model": ModelType.decision_tree})
+
+    with pytest.raises(ValueError, match="only supports the sgd_classifier model"):
+        pipeline_service._run_pipeline_sync(request)
+
+
+def _preview_request(dataset_id: str, **preview) -> PipelineRunRequest:
+    return PipelineRunRequest(
+        dataset_id=dataset_id,
+        target_column="target",
+        split=TrainTestConfig(test_size=0.2, random_state=0),
+        model=ModelType.logistic_regression,
+        preview=PreviewConfig(**preview),
+    )
+
+
+def test_preview_trains_on_stratified_sample_with_interval():
+    df = _separable_dataframe(5000)
+    # Two rows: one lands in each split, so it cannot be stratified when
+    # sampling the training split and is always kept.
+    df.loc[[0, 1], "target"] = "rare"
+    dataset_id = _store_dataset(df)
+
+    response = pipeline_service._run_pipeline_sync(
+        _preview_request(dataset_id, sample_fraction=0.1)
+    )
+
+    preview = response.preview
+    assert preview.training_rows == 4000
+    assert abs(preview.sample_rows - 400) <= 2
+    assert not preview.final
+    assert preview.accuracy_low < response.accuracy < preview.accuracy_high
+    assert preview.accuracy_high - preview.accuracy_low < 0.05
+    artifact = pipeline_service._get_model(response.model_id)
+    assert "rare" in artifact.target_labels
+
+
+def test_preview_sizes_sample_to_time_budget(monkeypatch):
+    monkeypatch.setattr(pipeline_service.settings, "PREVIEW_CALIBRATION_ROWS", 200)
+    dataset_id = _store_dataset(_separable_dataframe(5000))
+
+    tight = pipeline_service._run_pipeline_sync(
+        _preview_request(dataset_id, time_budget_seconds=1e-6)
+    )
+    generous = pipeline_service._run_pipeline_sync(
+        _preview_request(dataset_id, time_budget_seconds=60)
+    )
+
+    assert tight.preview.sample_rows == 200
+    assert generous.preview.sample_rows == 4000
+    assert generous.preview.final
+
+
+def test_wilson_interval():
+    low, high = pipeline_service._wilson_interval(90, 100)
+    assert (round(low, 3), round(high, 3)) == (0.826, 0.945)
+    assert pipeline_service._wilson_interval(10, 10)[1] == pytest.approx(1.0)
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.schemas.pipeline import ModelType, PipelineRunRequest, TrainTestConfig
+from app.services import dataset_service, pipeline_service
+from app.services.predict_batcher import MicroBatcher
+
+
+class RecordingRunner:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, key, records):
+        self.calls.append((key, len(records)))
+        if any(record.get("bad") for record in records):
+            raise ValueError("bad record")
+        return [record["x"] * 2 for record in records]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_call():
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_seconds=0.01, max_records=100)
+
+    results = await asyncio.gather(
+        *[batcher.submit("model", [{"x": i}, {"x": i + 100}]) for i in range(5)]
+    )
+
+    assert results == [[i * 2, (i + 100) * 2] for i in range(5)]
+    assert runner.calls == [("model", 10)]
+
+
+@pytest.mark.asyncio
+async def test_max_records_flushes_before_window_closes():
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_seconds=10, max_records=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.submit("model", [{"x": 1}]), batcher.submit("model", [{"x": 2}])),
+        timeout=1,
+    )
+
+    assert results == [[2], [4]]
+
+
+@pytest.mark.asyncio
+async def test_failing_request_does_not_fail_the_rest_of_the_batch():
+    runner = RecordingRunner()
+    batcher = MicroBatcher(runner, window_seconds=0.01, max_records=100)
+
+    good, bad = await asyncio.gather(
+        batcher.submit("model", [{"x": 1}]),
+        batcher.submit("model", [{"x": 2, "bad": True}]),
+        return_exceptions=True,
+    )
+
+    assert good == [2]
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_predict_uses_batcher_when_enabled():
+    df = pd.DataFrame({"f1": [1, 2, 3, 4, 5, 6, 7, 8], "target": [0, 1] * 4})
+    dataset_service._dataset_store["batch-dataset"] = df
+    run = await pipeline_service.run_pipeline(
+        PipelineRunRequest(
+            dataset_id="batch-dataset",
+            target_column="target",
+            split=TrainTestConfig(test_size=0.25, random_state=0),
+            model=ModelType.decision_tree,
+        )
+    )
+
+    with patch("app.core.config.settings.PREDICT_BATCHING_ENABLED", True):
+        responses = await asyncio.gather(
+            *[pipeline_service.predict(run.model_id, [{"f1": value}]) for value in range(1, 9)]
+        )
+        with pytest.raises(ValueError, match="Model not found"):
+            await pipeline_service.predict("missing-model", [{"f1": 1}])
+
+    assert all(len(response.predictions) == 1 for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_batched_callers_are_validated_separately():
+    df = pd.DataFrame({"a": range(8), "b": [0.5, 1.5] * 4, "target": [0, 1] * 4})
+    dataset_service._dataset_store["batch-dataset"] = df
+    run = await pipeline_service.run_pipeline(
+        PipelineRunRequest(
+            dataset_id="batch-dataset",
+            target_column="target",
+            split=TrainTestConfig(test_size=0.25, random_state=0),
+            model=ModelType.decision_tree,
+        )
+    )
+
+    with patch("app.core.config.settings.PREDICT_BATCHING_ENABLED", True):
+        complete, partial = await asyncio.gather(
+            pipeline_service.predict(run.model_id, [{"a": 1, "b": 0.5}]),
+            pipeline_service.predict(run.model_id, [{"a": 2}]),
+            return_exceptions=True,
+        )
+
+    assert len(complete.predictions) == 1
+    assert isinstance(partial, ValueError)
+    assert "Missing feature columns: b" in str(partial)
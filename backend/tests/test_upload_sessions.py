@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import threading
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.schemas.dataset import UploadSessionCreateRequest
+from app.services import dataset_service, upload_service
+
+
+def _put_chunk(client, upload_id, index, data, checksum=None):
+    return client.put(
+        f"/api/datasets/uploads/{upload_id}/chunks/{index}",
+        content=data,
+        headers={"X-Chunk-SHA256": checksum or hashlib.sha256(data).hexdigest()},
+    )
+
+
+def _create(client, payload: bytes, chunk_size: int, filename: str = "data.csv"):
+    resp = client.post(
+        "/api/datasets/uploads",
+        json={"filename": filename, "total_size": len(payload), "chunk_size": chunk_size},
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def test_resumable_upload_out_of_order(client, sample_csv_bytes, sample_dataframe):
+    session = _create(client, sample_csv_bytes, chunk_size=16)
+    chunks = [sample_csv_bytes[i : i + 16] for i in range(0, len(sample_csv_bytes), 16)]
+    assert session["total_chunks"] == len(chunks)
+
+    for index in reversed(range(1, len(chunks))):
+        assert _put_chunk(client, session["upload_id"], index, chunks[index]).status_code == 200
+
+    incomplete = client.post(f"/api/datasets/uploads/{session['upload_id']}/complete")
+    assert incomplete.status_code == 400
+    assert "1 chunk(s) missing" in incomplete.json()["detail"]
+
+    # Resume: the status lists what the server already has.
+    status = client.get(f"/api/datasets/uploads/{session['upload_id']}").json()
+    missing = set(range(session["total_chunks"])) - set(status["received_chunks"])
+    assert missing == {0}
+    assert _put_chunk(client, session["upload_id"], 0, chunks[0]).status_code == 200
+
+    done = client.post(f"/api/datasets/uploads/{session['upload_id']}/complete")
+    assert done.status_code == 200
+    stored = dataset_service.get_dataset(done.json()["dataset_id"])
+    pd.testing.assert_frame_equal(stored, sample_dataframe)
+    # The session is discarded once ingested.
+    assert client.get(f"/api/datasets/uploads/{session['upload_id']}").status_code == 404
+
+
+def test_chunk_checksum_and_length_are_verified(client, sample_csv_bytes):
+    session = _create(client, sample_csv_bytes, chunk_size=16)
+    upload_id = session["upload_id"]
+
+    bad_checksum = _put_chunk(client, upload_id, 0, sample_csv_bytes[:16], checksum="0" * 64)
+    assert bad_checksum.status_code == 400
+    assert "Checksum mismatch" in bad_checksum.json()["detail"]
+
+    assert _put_chunk(client, upload_id, 0, sample_csv_bytes[:15]).status_code == 400
+    assert _put_chunk(client, upload_id, 99, sample_csv_bytes[:16]).status_code == 400
+    assert client.get(f"/api/datasets/uploads/{upload_id}").json()["received_chunks"] == []
+
+
+
+def test_chunks_are_streamed_to_disk_in_parts(sample_csv_bytes):
+    session = upload_service.create_session(
+        UploadSessionCreateRequest(filename="data.csv", total_size=len(sample_csv_bytes))
+    )
+    directory = upload_service._session_dir(session.upload_id)
+
+    async def parts(data, size=7):
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
+
+    async def upload(checksum):
+        return await upload_service.write_chunk(
+            session.upload_id, 0, parts(sample_csv_bytes), checksum
+        )
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        asyncio.run(upload("0" * 64))
+    status = asyncio.run(upload(hashlib.sha256(sample_csv_bytes).hexdigest()))
+
+    assert status.received_chunks == [0]
+    assert (directory / "chunks" / "0").read_bytes() == sample_csv_bytes
+    # Neither the rejected nor the accepted attempt leaves a partial file.
+    assert not list(directory.glob("*.part"))
+    response = asyncio.run(upload_service.complete_session(session.upload_id))
+    assert response.rows == 6
+
+def test_oversized_upload_rejected_before_any_bytes(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE_BYTES", 1024)
+
+    resp = client.post("/api/datasets/uploads", json={"filename": "big.csv", "total_size": 1025})
+
+    assert resp.status_code == 400
+    assert "maximum allowed size" in resp.json()["detail"]
+
+
+def test_abort_and_expired_sessions(client, sample_csv_bytes, monkeypatch):
+    session = _create(client, sample_csv_bytes, chunk_size=16)
+    assert client.delete(f"/api/datasets/uploads/{session['upload_id']}").status_code == 204
+    assert client.get(f"/api/datasets/uploads/{session['upload_id']}").status_code == 404
+
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_TTL_SECONDS", 0)
+    expired = _create(client, sample_csv_bytes, chunk_size=16)
+    resp = _put_chunk(client, expired["upload_id"], 0, sample_csv_bytes[:16])
+    assert resp.status_code == 404
+    assert client.get("/api/datasets/uploads/..%2Fescape").status_code == 404
+
+
+def test_spooled_upload_is_opened_off_the_event_loop(tmp_path, sample_csv_bytes, monkeypatch):
+    path = tmp_path / "spooled.csv"
+    path.write_bytes(sample_csv_bytes)
+    threads = []
+    original = dataset_service._open_with_head
+
+    def record_thread(target):
+        threads.append(threading.get_ident())
+        return original(target)
+
+    monkeypatch.setattr(dataset_service, "_open_with_head", record_thread)
+
+    async def save():
+        return threading.get_ident(), await dataset_service.save_dataset_file("data.csv", path)
+
+    loop_thread, response = asyncio.run(save())
+
+    assert response.rows == 6
+    assert threads and loop_thread not in threads
+
+
+def test_completion_touches_the_filesystem_off_the_event_loop(sample_csv_bytes, monkeypatch):
+    session = upload_service.create_session(
+        UploadSessionCreateRequest(filename="data.csv", total_size=len(sample_csv_bytes))
+    )
+    (upload_service._session_dir(session.upload_id) / "chunks" / "0").write_bytes(
+        sample_csv_bytes
+    )
+    threads = {}
+    for name in ("_claim_session", "_assemble"):
+        original = getattr(upload_service, name)
+
+        def record(*args, _name=name, _original=original):
+            threads[_name] = threading.get_ident()
+            return _original(*args)
+
+        monkeypatch.setattr(upload_service, name, record)
+    rmtree = upload_service.shutil.rmtree
+
+    def record_rmtree(*args, **kwargs):
+        threads["rmtree"] = threading.get_ident()
+        return rmtree(*args, **kwargs)
+
+    monkeypatch.setattr(upload_service.shutil, "rmtree", record_rmtree)
+
+    async def complete():
+        return threading.get_ident(), await upload_service.complete_session(session.upload_id)
+
+    loop_thread, response = asyncio.run(complete())
+
+    assert response.rows == 6
+    assert set(threads) == {"_claim_session", "_assemble", "rmtree"}
+    assert loop_thread not in threads.values()
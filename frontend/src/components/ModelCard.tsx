@@ -35,6 +35,42 @@ export default function ModelCard() {
               </Stack>
             }
           />
+          <FormControlLabel
+            value="random_forest"
+            control={<Radio />}
+            label={
+              <Stack>
+                <Typography>Random Forest Classifier</Typography>
+                <Typography variant="caption" color="text.secondary">
+                  Ensemble of trees trained in parallel across CPU cores.
+                </Typography>
+              </Stack>
+            }
+          />
+          <FormControlLabel
+            value="hist_gradient_boosting"
+            control={<Radio />}
+            label={
+              <Stack>
+                <Typography>Histogram Gradient Boosting</Typography>
+                <Typography variant="caption" color="text.secondary">
+                  Fast boosted trees for large tables with native categorical support.
+                </Typography>
+              </Stack>
+            }
+          />
+          <FormControlLabel
+            value="sgd_classifier"
+            control={<Radio />}
+            label={
+              <Stack>
+                <Typography>SGD Classifier</Typography>
+                <Typography variant="caption" color="text.secondary">
+                  Linear model trained incrementally; supports out-of-core training.
+                </Typography>
+              </Stack>
+            }
+          />
         </RadioGroup>
       </CardContent>
     </Card>
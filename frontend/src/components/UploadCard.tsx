@@ -6,7 +6,11 @@ import api from "../api";
 import { DatasetUploadResponse } from "../types";
 import { usePipelineStore } from "../store/usePipelineStore";
 
-const ACCEPTED = ".csv,.xlsx";
+const EXTENSIONS = [".csv", ".csv.gz", ".csv.zst", ".xlsx", ".xls", ".parquet", ".feather", ".arrow"];
+const ACCEPTED = EXTENSIONS.join(", ");
+// File pickers match the last extension only, so compressed CSVs are let
+// through as .gz/.zst and checked in full before uploading.
+const PICKER_ACCEPT = ".csv,.gz,.zst,.xlsx,.xls,.parquet,.feather,.arrow";
 
 export default function UploadCard() {
   const setDataset = usePipelineStore((s) => s.setDataset);
@@ -17,6 +21,10 @@ export default function UploadCard() {
 
   const processFile = async (file: File) => {
     if (!file) return;
+    if (!EXTENSIONS.some((ext) => file.name.toLowerCase().endsWith(ext))) {
+      setError(`Unsupported file type. Accepted: ${ACCEPTED}`);
+      return;
+    }
     setError(null);
     setLoading(true);
     try {
@@ -50,7 +58,7 @@ export default function UploadCard() {
 
   return (
     <Card sx={{ height: "100%", minHeight: 320 }}>
-      <CardHeader title="1. Upload Dataset" subheader="Upload CSV or Excel to get started" />
+      <CardHeader title="1. Upload Dataset" subheader="Upload CSV, Excel, Parquet or Feather to get started" />
       <CardContent>
         <Box
           onDragOver={(e) => {
@@ -90,7 +98,7 @@ export default function UploadCard() {
           </Box>
           <Button component="label" variant="contained" disabled={loading}>
             Select File
-            <input hidden type="file" accept={ACCEPTED} onChange={handleFile} />
+            <input hidden type="file" accept={PICKER_ACCEPT} onChange={handleFile} />
           </Button>
           {loading && <LinearProgress sx={{ width: "100%", maxWidth: 300, mt: 1 }} />}
           {error && (
@@ -5,6 +5,37 @@ export type DatasetUploadResponse = {
   column_names: string[];
   dtypes: Record<string, string>;
   preview: Array<Record<string, unknown>>;
+  memory_usage_bytes?: number;
+  memory_saved_bytes?: number;
+};
+
+export type UploadSessionResponse = {
+  upload_id: string;
+  filename: string;
+  total_size: number;
+  chunk_size: number;
+  total_chunks: number;
+  received_chunks: number[];
+  expires_at: string;
+};
+
+export type ColumnProfile = {
+  name: string;
+  dtype: string;
+  is_numeric: boolean;
+  null_count: number;
+  cardinality: number;
+  mode?: unknown;
+  median?: number;
+  min?: number;
+  max?: number;
+  class_counts?: Record<string, number>;
+};
+
+export type DatasetProfileResponse = {
+  dataset_id: string;
+  rows: number;
+  columns: ColumnProfile[];
 };
 
 export type PreprocessStep = {
@@ -17,7 +48,12 @@ export type TrainTestConfig = {
   random_state?: number;
 };
 
-export type ModelType = "logistic_regression" | "decision_tree";
+export type ModelType =
+  | "logistic_regression"
+  | "decision_tree"
+  | "random_forest"
+  | "hist_gradient_boosting"
+  | "sgd_classifier";
 
 export type PipelineRunRequest = {
   dataset_id: string;
@@ -27,6 +63,76 @@ export type PipelineRunRequest = {
   split: TrainTestConfig;
   model: ModelType;
   drop_rare_classes?: boolean;
+  categorical_encoding?: "dense" | "sparse" | "native";
+  max_categories?: number;
+  memory_mode?: MemoryMode;
+  out_of_core?: OutOfCoreConfig;
+  collect_diagnostics?: boolean;
+  search?: SearchConfig;
+  preview?: PreviewConfig;
+};
+
+export type PreviewConfig = {
+  time_budget_seconds?: number;
+  sample_fraction?: number;
+  refine?: boolean;
+};
+
+export type PreviewResult = {
+  sample_rows: number;
+  training_rows: number;
+  sample_fraction: number;
+  test_rows: number;
+  confidence_level: number;
+  accuracy_low: number;
+  accuracy_high: number;
+  final: boolean;
+};
+
+export type ParamRange = {
+  low: number;
+  high: number;
+  num?: number;
+  log?: boolean;
+  integer?: boolean;
+};
+
+export type SearchConfig = {
+  param_grid: Record<string, unknown[] | ParamRange>;
+  cv?: number;
+  strategy?: "grid" | "halving";
+  factor?: number;
+};
+
+export type SearchCandidate = {
+  params: Record<string, unknown>;
+  mean_score?: number;
+  std_score?: number;
+  rank: number;
+  n_samples: number;
+  iteration: number;
+};
+
+export type SearchResult = {
+  strategy: "grid" | "halving";
+  best_params: Record<string, unknown>;
+  best_score: number;
+  n_candidates: number;
+  candidates: SearchCandidate[];
+};
+
+export type MemoryMode = "standard" | "lean" | "out_of_core";
+
+export type OutOfCoreConfig = {
+  chunk_rows?: number;
+  epochs?: number;
+};
+
+export type PipelineDiagnostics = {
+  memory_mode: MemoryMode;
+  input_bytes?: number;
+  peak_memory_bytes?: number;
+  peak_to_input_ratio?: number;
 };
 
 export type ConfusionMatrix = {
@@ -49,6 +155,9 @@ export type PipelineRunResponse = {
   model_type?: ModelType;
   model_id?: string;
   model_download_path?: string;
+  diagnostics?: PipelineDiagnostics;
+  search?: SearchResult;
+  preview?: PreviewResult;
 };
 
 export type PredictRequest = {
@@ -59,3 +168,27 @@ export type PredictRequest = {
 export type PredictResponse = {
   predictions: Array<string | number>;
 };
+
+export type JobStatus = "queued" | "running" | "succeeded" | "failed" | "cancelled";
+
+export type StageProgress = {
+  name: string;
+  status: "pending" | "running" | "done" | "skipped" | "failed";
+  duration_ms?: number;
+  rows?: number;
+  columns?: number;
+  peak_memory_bytes?: number;
+};
+
+export type PipelineJobResponse = {
+  job_id: string;
+  status: JobStatus;
+  created_at: string;
+  started_at?: string;
+  finished_at?: string;
+  current_stage?: string;
+  stages: StageProgress[];
+  cancel_requested: boolean;
+  result?: PipelineRunResponse;
+  error?: string;
+};